@@ -0,0 +1,129 @@
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional, Literal
+from datetime import datetime
+import logging
+import zlib
+from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+from app.core.streaming import STREAM_MEDIA_TYPES
+from app.core.uploads import NOTES_EXTENSIONS, UploadTooLarge, has_extension, iter_lines
+from app.schemas.admin import ContentBackfillResponse, ImportResponse, LexicalRebuildResponse
+from app.services.corpus_transfer import (
+    ExportFormatError,
+    encode_records,
+    get_corpus_transfer,
+    gzip_compressor
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+_IMPORT_EXTENSIONS = NOTES_EXTENSIONS + tuple(f"{extension}.gz" for extension in NOTES_EXTENSIONS)
+
+
+@router.get("/export")
+async def export_corpus(
+    project: Optional[str] = Query(None, description="프로젝트 필터 (미지정 시 전체)"),
+    include_chunks: bool = Query(True, description="청크 벡터 포함 여부"),
+    compress: Optional[Literal["gzip"]] = Query(None, description="gzip이면 .ndjson.gz로 압축")
+):
+    """
+    코퍼스 내보내기 (NDJSON 스트리밍)
+
+    - header → document(메타데이터 + 벡터 + 원문) / chunk(청크 벡터) → done
+    - 벡터 DB를 transfer_batch_size개씩 순회하므로 코퍼스 크기와 관계없이 일정한 메모리 사용
+    - 인코딩/압축은 공유 스레드 풀에서 실행
+    """
+    service = get_corpus_transfer()
+    compressor = gzip_compressor(get_settings().export_compression_level) if compress == "gzip" else None
+
+    async def body():
+        try:
+            async for records in service.export_batches(project, include_chunks):
+                data = await run_blocking(encode_records, records, compressor)
+                if data:
+                    yield data
+            if compressor is not None:
+                yield compressor.flush()
+        except Exception as e:
+            # 응답이 이미 시작되었으므로 로그만 남김 (마지막 done 줄이 없으면 불완전한 파일)
+            logger.error(f"Error exporting corpus: {e}")
+            raise
+
+    filename = f"recallmap-export-{datetime.utcnow():%Y%m%d-%H%M%S}.ndjson"
+    if compressor is not None:
+        filename += ".gz"
+    return StreamingResponse(
+        body(),
+        media_type="application/gzip" if compressor is not None else STREAM_MEDIA_TYPES["ndjson"],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/import", response_model=ImportResponse, responses={413: {"description": "파일 크기 제한 초과"}})
+async def import_corpus(file: UploadFile = File(...)):
+    """
+    코퍼스 가져오기 (/export 파일, .ndjson / .jsonl / .gz)
+
+    - 저장된 벡터를 그대로 배치 upsert (요약/키워드/임베딩 LLM 호출 없음)
+    - 원문 저장소, 어휘 색인, 중복 색인은 원문으로 다시 구성
+    - 같은 ID의 문서는 덮어씀 (다시 가져와도 안전)
+    - 임베딩 모델/차원이 현재 설정과 다르면 400
+    """
+    if not has_extension(file.filename, _IMPORT_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Only .ndjson, .jsonl (optionally .gz) files are supported")
+
+    settings = get_settings()
+    lines = iter_lines(
+        file,
+        settings.max_import_file_size,
+        # 문서 줄: 원문(max_file_size) + 벡터/메타데이터 여유분
+        settings.max_file_size * 2 + 1024 * 1024,
+        gzip=file.filename.lower().endswith(".gz")
+    )
+    try:
+        return await get_corpus_transfer().import_lines(lines)
+
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip data")
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error importing corpus: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/backfill-content", response_model=ContentBackfillResponse)
+async def backfill_content():
+    """
+    원문 저장소 이전 (일회성)
+
+    - 벡터 메타데이터에 full_text가 남아 있는 이전 버전 문서의 원문을 원문 저장소로 옮기고
+      full_text를 뺀 메타데이터로 다시 upsert
+    - 이미 이전된 문서는 건너뛰므로 다시 실행해도 안전
+    """
+    try:
+        return await get_corpus_transfer().backfill_content_store()
+    except Exception as e:
+        logger.error(f"Error backfilling content store: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/rebuild-lexical", response_model=LexicalRebuildResponse)
+async def rebuild_lexical():
+    """
+    BM25 어휘 색인 재구성
+
+    - 벡터 DB의 문서 메타데이터(요약)와 원문 저장소의 원문으로 다시 색인
+    - 색인 파일을 잃었거나 어휘 색인 도입 전에 저장된 문서가 있을 때 실행
+    - 벡터 DB에 없는 문서는 색인에서 제거
+    """
+    try:
+        return await get_corpus_transfer().rebuild_lexical_index()
+    except Exception as e:
+        logger.error(f"Error rebuilding lexical index: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
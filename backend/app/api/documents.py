@@ -1,41 +1,105 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
-from typing import Optional
+from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Optional, List, Dict, Any
+import json
 import logging
+from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+from app.core.streaming import STREAM_MEDIA_TYPES, encode_event
+from app.core.uploads import (
+    TEXT_EXTENSIONS,
+    NOTES_EXTENSIONS,
+    UploadTooLarge,
+    has_extension,
+    iter_lines,
+    read_text
+)
 from app.schemas.document import (
     DocumentUploadRequest,
     DocumentIngestResponse,
+    BatchUploadRequest,
+    BatchIngestItem,
+    BatchIngestResponse,
     SearchRequest,
     SearchResponse,
     AnswerRequest,
-    AnswerResponse
+    AnswerResponse,
+    AskRequest,
+    AskResponse
 )
+from app.schemas.job import JobStatus, JobBatchStatus
 from app.services.document_service import get_document_service
+from app.services.job_queue import get_job_queue
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/documents", tags=["documents"])
 
+# 백그라운드 ingest 시 응답 (202 + 작업 상태)
+_JOB_RESPONSES = {
+    202: {"model": JobStatus, "description": "백그라운드 작업 등록 (background=true)"},
+    413: {"description": "파일 크기 제한 초과"},
+}
+_TEXT_FILES_ERROR = "Only .txt and .md files are supported"
+
+
+def _use_background(background: Optional[bool]) -> bool:
+    """요청 파라미터가 없으면 설정값(ingest_background) 사용"""
+    return get_settings().ingest_background if background is None else background
+
+
+async def _submit_ingest(
+    documents: List[DocumentUploadRequest],
+    single: bool = False,
+    positions: Optional[List[int]] = None,
+    errors: Optional[List[BatchIngestItem]] = None
+) -> JSONResponse:
+    """ingest 작업을 큐에 등록하고 202 + 작업 상태 반환"""
+    job = await _enqueue_ingest(documents, single, positions, errors)
+    return JSONResponse(
+        status_code=202,
+        content=JobStatus(**job).model_dump(mode="json"),
+        headers={"Location": f"/api/jobs/{job['id']}"}
+    )
+
 
-@router.post("/upload", response_model=DocumentIngestResponse)
+async def _enqueue_ingest(
+    documents: List[DocumentUploadRequest],
+    single: bool = False,
+    positions: Optional[List[int]] = None,
+    errors: Optional[List[BatchIngestItem]] = None
+) -> Dict[str, Any]:
+    payload = {
+        "documents": [document.model_dump() for document in documents],
+        "single": single,
+        "positions": positions,
+        "errors": [item.model_dump(mode="json") for item in errors or []],
+    }
+    return await get_job_queue().submit("ingest", payload, total=len(documents))
+
+
+@router.post("/upload", response_model=DocumentIngestResponse, responses=_JOB_RESPONSES)
 async def upload_document(
     file: UploadFile = File(...),
     project: str = Form(...),
+    background: Optional[bool] = Query(None, description="true면 202 + job id 반환 (미지정 시 설정값)"),
 ):
     """
     파일을 업로드하고 기억으로 변환
 
-    - txt 파일만 지원
+    - txt, md 파일 지원 (UTF-8)
+    - 조각 단위로 읽으며 max_file_size를 넘으면 바로 413
     - 요약, 키워드 자동 생성
     - Pinecone에 임베딩 저장
+    - background=true: 검증 후 바로 202 + 작업 상태 반환 (/api/jobs/{id}로 조회)
     """
     try:
         # 파일 확장자 검증
-        if not file.filename.endswith('.txt'):
-            raise HTTPException(status_code=400, detail="Only .txt files are supported")
+        if not has_extension(file.filename, TEXT_EXTENSIONS):
+            raise HTTPException(status_code=400, detail=_TEXT_FILES_ERROR)
 
-        # 파일 읽기
-        content = await file.read()
-        text = content.decode('utf-8')
+        # 파일 읽기 (크기 제한 + 증분 UTF-8 디코딩)
+        text = await read_text(file)
 
         if not text.strip():
             raise HTTPException(status_code=400, detail="File is empty")
@@ -48,9 +112,16 @@ async def upload_document(
             filename=file.filename
         )
 
+        if _use_background(background):
+            return await _submit_ingest([request], single=True)
+
         result = await service.ingest_document(request)
         return result
 
+    except HTTPException:
+        raise
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except UnicodeDecodeError:
         raise HTTPException(status_code=400, detail="Invalid UTF-8 encoding")
     except Exception as e:
@@ -58,15 +129,22 @@ async def upload_document(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/upload-text", response_model=DocumentIngestResponse)
-async def upload_text(request: DocumentUploadRequest):
+@router.post("/upload-text", response_model=DocumentIngestResponse, responses=_JOB_RESPONSES)
+async def upload_text(
+    request: DocumentUploadRequest,
+    background: Optional[bool] = Query(None, description="true면 202 + job id 반환 (미지정 시 설정값)")
+):
     """
     텍스트를 직접 업로드하고 기억으로 변환
 
     - 프론트엔드에서 textarea로 입력한 텍스트 처리
     - 파일 없이 텍스트만으로 문서 생성
+    - background=true: 202 + 작업 상태 반환
     """
     try:
+        if _use_background(background):
+            return await _submit_ingest([request], single=True)
+
         service = get_document_service()
         result = await service.ingest_document(request)
         return result
@@ -76,6 +154,207 @@ async def upload_text(request: DocumentUploadRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _check_batch_size(count: int):
+    max_documents = get_settings().max_batch_documents
+    if count > max_documents:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many documents in one batch (max {max_documents})"
+        )
+
+
+@router.post("/upload-batch", response_model=BatchIngestResponse, responses=_JOB_RESPONSES)
+async def upload_batch(
+    request: BatchUploadRequest,
+    background: Optional[bool] = Query(None, description="true면 202 + job id 반환 (미지정 시 설정값)")
+):
+    """
+    여러 텍스트를 한 번에 업로드
+
+    - 요약/키워드는 동시에, 임베딩은 배치로 생성
+    - 벡터 DB에 크기 제한에 맞춘 배치로 저장
+    - 문서별 성공/실패 결과 반환
+    - background=true: 202 + 작업 상태 반환 (진행률은 완료한 문서 수)
+    """
+    _check_batch_size(len(request.documents))
+    try:
+        if _use_background(background):
+            return await _submit_ingest(request.documents)
+
+        service = get_document_service()
+        return await service.ingest_documents(request.documents)
+
+    except Exception as e:
+        logger.error(f"Error uploading batch: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/upload-batch-files", response_model=BatchIngestResponse, responses=_JOB_RESPONSES)
+async def upload_batch_files(
+    files: List[UploadFile] = File(...),
+    project: str = Form(...),
+    background: Optional[bool] = Query(None, description="true면 202 + job id 반환 (미지정 시 설정값)"),
+):
+    """
+    여러 파일을 한 번에 업로드
+
+    - txt, md 파일 지원 (검증 실패/크기 초과 파일은 개별 오류로 반환)
+    - /upload-batch와 동일한 배치 ingest 경로 사용
+    - background=true: 검증 후 202 + 작업 상태 반환 (검증 오류는 작업 결과에 포함)
+    """
+    _check_batch_size(len(files))
+    try:
+        errors = {}
+        requests = []
+        positions = []
+        for index, file in enumerate(files):
+            if not has_extension(file.filename, TEXT_EXTENSIONS):
+                errors[index] = _TEXT_FILES_ERROR
+                continue
+            try:
+                text = await read_text(file)
+            except UploadTooLarge as e:
+                errors[index] = str(e)
+                continue
+            except UnicodeDecodeError:
+                errors[index] = "Invalid UTF-8 encoding"
+                continue
+            if not text.strip():
+                errors[index] = "File is empty"
+                continue
+
+            requests.append(DocumentUploadRequest(
+                text=text,
+                project=project,
+                filename=file.filename
+            ))
+            positions.append(index)
+
+        # 검증 실패 파일은 개별 오류로 기록
+        failures = [
+            BatchIngestItem(
+                index=index,
+                filename=files[index].filename,
+                success=False,
+                error=error
+            )
+            for index, error in errors.items()
+        ]
+        if requests and _use_background(background):
+            return await _submit_ingest(requests, positions=positions, errors=failures)
+
+        # 파일 순서 기준으로 결과 병합
+        service = get_document_service()
+        results = list(failures)
+        if requests:
+            ingested = await service.ingest_documents(requests)
+            for item in ingested.results:
+                results.append(item.model_copy(update={"index": positions[item.index]}))
+
+        return service.merge_batch_items(results)
+
+    except Exception as e:
+        logger.error(f"Error uploading batch files: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+def _parse_note(line: Optional[bytes], project: str, max_bytes: int) -> DocumentUploadRequest:
+    """NDJSON 한 줄 → 업로드 요청 (잘못된 줄은 ValueError)"""
+    if line is None:
+        raise ValueError(f"Note exceeds the {max_bytes} byte limit")
+    try:
+        note = json.loads(line.decode("utf-8"))
+    except UnicodeDecodeError:
+        raise ValueError("Invalid UTF-8 encoding")
+    except json.JSONDecodeError:
+        raise ValueError("Invalid JSON")
+    if not isinstance(note, dict):
+        raise ValueError("Each line must be a JSON object")
+    if not isinstance(note.get("text"), str) or not note["text"].strip():
+        raise ValueError("Note text is empty")
+    return DocumentUploadRequest(
+        text=note["text"],
+        project=note.get("project") or project,
+        filename=note.get("filename")
+    )
+
+
+@router.post(
+    "/upload-notes",
+    response_model=BatchIngestResponse,
+    responses={**_JOB_RESPONSES, 202: {"model": JobBatchStatus, "description": "묶음별 백그라운드 작업 등록"}}
+)
+async def upload_notes(
+    file: UploadFile = File(...),
+    project: str = Form(...),
+    background: Optional[bool] = Query(None, description="true면 202 + 작업 목록 반환 (미지정 시 설정값)"),
+):
+    """
+    NDJSON 노트 파일 업로드 (한 줄에 노트 하나)
+
+    - 각 줄: {"text": "...", "filename": "...", "project": "..."} (filename, project 생략 가능)
+    - 파일을 줄 단위로 읽으며 notes_ingest_batch_size개씩 ingest (파일 전체를 메모리에 올리지 않음)
+    - 파일 전체는 max_notes_file_size, 한 줄은 max_file_size 제한
+      (파일 크기를 미리 알 수 없으면 제한을 넘는 시점에 413, 그 전에 처리한 묶음은 유지)
+    - 결과 index는 파일의 줄 번호 (0부터), 잘못된 줄은 개별 오류
+    - background=true: 묶음마다 작업을 등록하고 202 + 작업 목록 반환
+    """
+    if not has_extension(file.filename, NOTES_EXTENSIONS):
+        raise HTTPException(status_code=400, detail="Only .ndjson and .jsonl files are supported")
+
+    settings = get_settings()
+    service = get_document_service()
+    use_background = _use_background(background)
+    results: List[BatchIngestItem] = []
+    jobs: List[Dict[str, Any]] = []
+    requests: List[DocumentUploadRequest] = []
+    positions: List[int] = []
+    failures: List[BatchIngestItem] = []
+    total = 0
+
+    async def flush():
+        if use_background:
+            jobs.append(await _enqueue_ingest(requests, positions=positions, errors=failures))
+        else:
+            results.extend(failures)
+            if requests:
+                ingested = await service.ingest_documents(requests)
+                for item in ingested.results:
+                    results.append(item.model_copy(update={"index": positions[item.index]}))
+        requests.clear()
+        positions.clear()
+        failures.clear()
+
+    try:
+        async for number, line in iter_lines(file, settings.max_notes_file_size, settings.max_file_size):
+            total += 1
+            try:
+                requests.append(_parse_note(line, project, settings.max_file_size))
+                positions.append(number)
+            except ValueError as e:
+                failures.append(BatchIngestItem(index=number, success=False, error=str(e)))
+            if len(requests) >= settings.notes_ingest_batch_size:
+                await flush()
+        if requests or failures:
+            await flush()
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error uploading notes: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if total == 0:
+        raise HTTPException(status_code=400, detail="File is empty")
+    logger.info(f"Notes upload - {total} notes, {len(jobs)} jobs queued")
+
+    if use_background:
+        return JSONResponse(
+            status_code=202,
+            content=JobBatchStatus(jobs=[JobStatus(**job) for job in jobs], total=total).model_dump(mode="json")
+        )
+    return service.merge_batch_items(results)
+
+
 @router.post("/search", response_model=SearchResponse)
 async def search_documents(request: SearchRequest):
     """
@@ -115,35 +394,99 @@ async def compose_answer(request: AnswerRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/answer/stream")
+async def stream_answer(
+    request: AnswerRequest,
+    stream_format: str = Query("ndjson", alias="format", pattern="^(ndjson|sse)$", description="ndjson 또는 sse")
+):
+    """
+    검색 결과 기반 답변 스트리밍
+
+    - 토큰이 생성되는 대로 answer 이벤트 (텍스트 조각)
+    - 핵심 포인트 구간부터 highlight 이벤트 (한 줄씩)
+    - 마지막 done 이벤트: 전체 AnswerResponse + metrics (first_token_ms, duration_ms)
+    - 생성 중 오류는 error 이벤트로 전달
+    """
+    service = get_document_service()
+
+    async def events():
+        try:
+            async for event_type, data in service.stream_answer(request):
+                yield encode_event(event_type, data, stream_format)
+        except Exception as e:
+            logger.error(f"Error streaming answer: {e}")
+            yield encode_event("error", {"detail": str(e)}, stream_format)
+
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/ask", response_model=AskResponse)
+async def ask(
+    request: AskRequest,
+    stream_format: Optional[str] = Query(None, alias="format", pattern="^(ndjson|sse)$", description="지정 시 스트리밍: ndjson 또는 sse")
+):
+    """
+    검색 + 답변 생성 (한 요청)
+
+    - /search 후 /answer를 호출하는 흐름을 서버에서 한 번에 처리
+    - 상위 max_results_to_use개 결과가 확정되면 바로 답변 생성 시작
+    - format 지정 시 스트리밍: results 이벤트 (SearchResponse) → answer/highlight → done
+    """
+    service = get_document_service()
+
+    if stream_format is None:
+        try:
+            return await service.ask(request)
+
+        except Exception as e:
+            logger.error(f"Error answering question: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        try:
+            async for event_type, data in service.stream_ask(request):
+                yield encode_event(event_type, data, stream_format)
+        except Exception as e:
+            logger.error(f"Error streaming ask: {e}")
+            yield encode_event("error", {"detail": str(e)}, stream_format)
+
+    return StreamingResponse(
+        events(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/stats")
 async def get_stats():
     """
-    벡터 DB 통계
+    벡터 DB 통계 (+ 원문 저장소/어휘 색인/중복 색인 크기, 임베딩/검색 캐시 적중률,
+    외부 API 호출 대기 시간/재시도 횟수)
     """
     try:
+        from app.core.rate_limit import governor_stats
         from app.services.vector_db import get_vector_db
+        from app.services.embedding_cache import get_embedding_cache
+        from app.services.content_store import get_content_store
         vector_db = get_vector_db()
-        stats = vector_db.get_stats()
-
-        # Pinecone stats 객체에서 필요한 정보만 추출 (primitive types만 사용)
-        total_count = 0
-        if hasattr(stats, 'total_vector_count'):
-            total_count = int(stats.total_vector_count)
-
-        dimension = 0
-        if hasattr(stats, 'dimension'):
-            dimension = int(stats.dimension)
-
-        # namespaces는 복잡한 객체이므로 단순 카운트만 반환
-        namespace_count = 0
-        if hasattr(stats, 'namespaces') and stats.namespaces:
-            namespace_count = len(stats.namespaces)
-
-        return {
-            "total_vector_count": total_count,
-            "dimension": dimension,
-            "namespace_count": namespace_count,
-        }
+        stats = await vector_db.aget_stats()
+        stats["content_store"] = await run_blocking(get_content_store().stats)
+        stats["lexical_index"] = get_document_service().lexical_index.stats()
+        stats["dedup_index"] = get_document_service().dedup_index.stats()
+        stats["jobs"] = await run_blocking(get_job_queue().stats)
+
+        embedding_cache = get_embedding_cache()
+        if embedding_cache is not None:
+            stats["embedding_cache"] = embedding_cache.stats()
+        stats["search_cache"] = get_document_service().search_cache.stats()
+        stats["rerank_cache"] = get_document_service().llm_service.rerank_cache.stats()
+        stats["rate_limits"] = governor_stats()
+
+        return stats
 
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Query, HTTPException
+from fastapi.responses import StreamingResponse
 from typing import Optional
 import logging
 from app.services.graph_service import get_graph_service
@@ -20,7 +21,7 @@ async def get_graph_data(
 
     - 벡터 유사도 + 메타데이터 기반 하이브리드 연결
     - 프로젝트 필터 지원
-    - 메모리 캐싱 (프로젝트 필터 없을 때)
+    - (project, top_k)별 메모리 캐싱, 동시 요청은 빌드 1회 공유
     """
     try:
         service = get_graph_service()
@@ -36,30 +37,61 @@ async def get_graph_data(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/knn")
+async def get_knn_graph(
+    project: Optional[str] = Query(None, description="프로젝트 필터 (work, tech, personal 등)"),
+    k: int = Query(10, ge=1, le=100, description="노드당 최대 이웃 수"),
+    min_similarity: float = Query(0.5, ge=0.0, le=1.0, description="최소 엣지 가중치"),
+    limit: int = Query(10000, ge=1, le=200000, description="최대 노드 수")
+):
+    """
+    대규모 코퍼스용 희소 k-NN 그래프 (NDJSON 스트리밍)
+
+    - 노드마다 벡터 유사도 상위 k개 이웃만 연결 (N x N 행렬을 만들지 않음)
+    - 라인 형식: {"type": "node" | "edge" | "metadata", "data": {...}}
+    - 노드 → 엣지 → 메타데이터 순으로 스트리밍
+    """
+    try:
+        service = get_graph_service()
+        lines = await service.stream_knn_graph(
+            project=project,
+            limit=limit,
+            k=k,
+            min_similarity=min_similarity
+        )
+        return StreamingResponse(lines, media_type="application/x-ndjson")
+
+    except Exception as e:
+        logger.error(f"Error building k-NN graph: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/nodes/{node_id}")
 async def get_node(node_id: str):
     """
     특정 노드 상세 정보 조회
 
     - Pinecone에서 노드 메타데이터 조회
+    - 원문은 원문 저장소에서 조회
     """
     try:
         from app.services.vector_db import get_vector_db
+        from app.services.content_store import get_content_store
         vector_db = get_vector_db()
 
-        # Pinecone fetch로 개별 문서 조회
-        result = vector_db.index.fetch(ids=[node_id])
+        # 벡터 DB fetch로 개별 문서 조회
+        result = await vector_db.afetch_documents([node_id])
 
-        if not result.vectors or node_id not in result.vectors:
+        if node_id not in result:
             raise HTTPException(status_code=404, detail="Node not found")
 
-        vector_data = result.vectors[node_id]
-        metadata = vector_data.metadata
+        metadata = result[node_id]["metadata"]
+        text = await get_content_store().aget(node_id)
 
         return {
             "id": node_id,
             "summary": metadata.get("summary", ""),
-            "text": metadata.get("text", ""),
+            "text": text if text is not None else metadata.get("full_text", ""),
             "format": metadata.get("format", "memo"),
             "context": metadata.get("context", ""),
             "keywords": metadata.get("keywords", []),
@@ -79,19 +111,19 @@ async def delete_node(node_id: str):
     """
     노드 삭제
 
-    - Pinecone에서 노드 삭제
-    - 그래프 캐시 무효화
+    - Pinecone에서 노드(청크 포함) 삭제, 원문 저장소/어휘 색인에서 삭제
+    - 캐시된 그래프에서 노드와 연결 엣지만 제거 (전체 재계산 없음)
+    - 코퍼스 버전 증가 (검색 캐시 무효화)
     """
     try:
-        from app.services.vector_db import get_vector_db
-        vector_db = get_vector_db()
+        from app.services.document_service import get_document_service
 
-        # 노드 삭제
-        vector_db.delete_document(node_id)
+        # 노드 삭제 (코퍼스 버전도 증가)
+        await get_document_service().delete_document(node_id)
 
-        # 캐시 무효화
+        # 캐시된 그래프에서 노드/엣지만 제거
         service = get_graph_service()
-        service.invalidate_cache()
+        service.remove_document(node_id)
 
         return {"message": f"Node {node_id} deleted successfully"}
 
@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException
+import logging
+from app.schemas.job import JobStatus
+from app.services.job_queue import get_job_queue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+
+
+@router.get("/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str):
+    """
+    백그라운드 작업 상태 조회
+
+    - status: queued → running → succeeded | failed
+    - completed / total: 처리한 문서 수
+    - 완료 시 result에 ingest 결과
+    """
+    try:
+        job = await get_job_queue().aget(job_id)
+
+    except Exception as e:
+        logger.error(f"Error getting job {job_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
@@ -0,0 +1,140 @@
+"""
+인메모리 TTL + LRU 캐시와 코퍼스 버전 카운터
+
+코퍼스 버전은 문서가 추가/삭제될 때마다 증가합니다.
+검색 결과처럼 코퍼스 상태에 의존하는 캐시는 키에 버전을 포함시켜
+변경 이후의 조회가 이전 결과를 재사용하지 않도록 합니다.
+"""
+
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+import threading
+import time
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """크기 제한(LRU)과 만료 시간(TTL)을 가진 스레드 안전 캐시
+
+    max_bytes와 sizeof를 주면 항목 수 외에 추정 메모리 합계로도 제한합니다.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[V], int]] = None
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        # key -> (value, expires_at, size)
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at, _ = entry
+                if expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._pop(key)
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: V):
+        with self._lock:
+            self._pop(key)
+            size = self.sizeof(value) if self.sizeof else 0
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds, size)
+            self._total_bytes += size
+            self._evict()
+
+    def update_size(self, key: Hashable):
+        """값이 제자리에서 바뀐 뒤 크기 재계산 (TTL은 유지)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or not self.sizeof:
+                return
+            value, expires_at, old_size = entry
+            size = self.sizeof(value)
+            self._entries[key] = (value, expires_at, size)
+            self._total_bytes += size - old_size
+            self._evict()
+
+    def items(self) -> List[Tuple[Hashable, V]]:
+        """만료되지 않은 항목 스냅샷 (LRU 순서는 바꾸지 않음)"""
+        now = time.monotonic()
+        with self._lock:
+            return [
+                (key, value)
+                for key, (value, expires_at, _) in self._entries.items()
+                if expires_at > now
+            ]
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def _pop(self, key: Hashable):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[2]
+
+    def _evict(self):
+        """항목 수/메모리 상한을 넘으면 가장 오래 안 쓴 항목부터 제거 (최근 항목 1개는 유지)"""
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_entries
+            or (self.max_bytes is not None and self._total_bytes > self.max_bytes)
+        ):
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        stats = {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+        if self.sizeof:
+            stats["bytes"] = self._total_bytes
+        return stats
+
+
+_corpus_version = 0
+_corpus_lock = threading.Lock()
+
+
+def get_corpus_version() -> int:
+    """현재 코퍼스 버전"""
+    return _corpus_version
+
+
+def bump_corpus_version() -> int:
+    """문서 추가/삭제 후 호출하여 코퍼스 버전 증가"""
+    global _corpus_version
+    with _corpus_lock:
+        _corpus_version += 1
+        return _corpus_version
@@ -0,0 +1,49 @@
+"""
+블로킹 I/O 실행기
+
+Pinecone, Cohere 클라이언트처럼 동기 API만 제공하는 호출을
+이벤트 루프 밖의 공유 스레드 풀에서 실행합니다.
+풀 크기(blocking_io_max_workers)가 동시에 진행되는 블로킹 호출 수의 상한입니다.
+"""
+
+import asyncio
+import functools
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        max_workers = get_settings().blocking_io_max_workers
+        _executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="blocking-io"
+        )
+        logger.info(f"Blocking I/O executor started - max workers: {max_workers}")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """동기 함수를 공유 스레드 풀에서 실행하고 결과를 기다림"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_executor(),
+        functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_executor():
+    """앱 종료 시 스레드 풀 정리"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
@@ -8,9 +8,13 @@ class Settings(BaseSettings):
     openai_api_key: str
     cohere_api_key: str
 
-    # Pinecone
-    pinecone_api_key: str
-    pinecone_environment: str
+    # Vector DB ("pinecone" | "local")
+    vector_db_backend: str = "pinecone"
+    local_vector_db_path: str = "./data/vector_db"
+
+    # Pinecone (vector_db_backend=pinecone 일 때 필수)
+    pinecone_api_key: Optional[str] = None
+    pinecone_environment: Optional[str] = None
     pinecone_index_name: str = "recallmap"
 
     # LangSmith (Optional)
@@ -25,10 +29,107 @@ class Settings(BaseSettings):
     llm_model: str = "gpt-4-turbo-preview"
     rerank_model: str = "rerank-multilingual-v3.0"
 
+    # Rerank (cohere: Cohere API, local: 후보 벡터 기반 MMR, API 호출 없음)
+    rerank_mode: str = "cohere"
+    local_rerank_lambda: float = 0.7  # 1이면 관련도 순, 낮을수록 다양성 우선
+    local_rerank_keyword_weight: float = 0.1
+    # (쿼리, 문서) → Cohere 점수 캐시 (같은 쿼리 재실행/페이지 이동 시 새 문서만 rerank)
+    rerank_cache_enabled: bool = True
+    rerank_cache_size: int = 10000
+    rerank_cache_ttl_seconds: float = 600.0
+
+    # Embedding Cache (메모리 LRU + SQLite 디스크)
+    embedding_cache_enabled: bool = True
+    embedding_cache_memory_size: int = 10000  # 메모리 항목 수
+    embedding_cache_disk_size: int = 200000  # 디스크 항목 수 (0이면 메모리만)
+    embedding_cache_path: str = "./data/embedding_cache.db"
+
+    # Content Store (원문 압축 저장, zstandard 없으면 zlib)
+    content_store_path: str = "./data/content.db"
+    content_store_compression_level: int = 3
+
+    # Hybrid Search (BM25 + 벡터, reciprocal rank fusion)
+    hybrid_search_enabled: bool = True
+    rrf_k: int = 60  # RRF 점수 = Σ 1 / (rrf_k + rank)
+    lexical_index_path: str = "./data/lexical.db"
+
+    # Duplicate Detection (정규화 해시 + MinHash, 같은 프로젝트 안에서만 비교)
+    dedup_enabled: bool = True
+    dedup_index_path: str = "./data/dedup.db"
+    dedup_near_threshold: float = 0.8  # MinHash 추정 Jaccard 유사도
+    # 유사 중복 처리: flag (새 문서로 저장 + duplicate_of 표시) | merge (기존 문서를 새 원문으로 교체)
+    dedup_near_policy: str = "flag"
+    dedup_num_perm: int = 64
+    dedup_bands: int = 16  # LSH band 수 (num_perm의 약수)
+
+    # Search Result Cache (문서 추가/삭제 시 코퍼스 버전으로 무효화)
+    search_cache_enabled: bool = True
+    search_cache_size: int = 1000
+    search_cache_ttl_seconds: float = 60.0
+
+    # Graph
+    graph_cache_max_entries: int = 32  # (project, top_k) 키 수
+    graph_cache_max_bytes: int = 256 * 1024 * 1024
+    graph_cache_ttl_seconds: float = 600.0
+    graph_knn_max_block_bytes: int = 64 * 1024 * 1024  # k-NN 블록 유사도 행렬 상한
+    graph_fetch_batch_size: int = 100  # 벡터 DB 페이지 크기 (Pinecone list/fetch)
+
+    # Concurrency
+    blocking_io_max_workers: int = 32  # 동기 클라이언트(Pinecone, Cohere) 호출용 스레드 수
+
+    # HTTP Connection Pool (OpenAI/Cohere 공유 httpx 클라이언트, Pinecone urllib3 풀 크기)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 32  # blocking_io_max_workers 이상 권장
+    http_keepalive_expiry_seconds: float = 60.0
+    http_timeout_seconds: float = 60.0
+    http_connect_timeout_seconds: float = 10.0
+
+    # Outbound Rate Limits (공급자별 토큰 버킷 + 동시 호출 수, 0이면 제한 없음)
+    # 계정 한도보다 약간 낮게 두면 429 없이 한도 근처 처리량을 유지
+    openai_rpm: int = 3000
+    openai_tpm: int = 1000000  # 입력 토큰 추정치 기준 (2자당 1토큰)
+    openai_max_concurrency: int = 16
+    cohere_rpm: int = 1000
+    cohere_max_concurrency: int = 8
+    pinecone_rpm: int = 6000
+    pinecone_max_concurrency: int = 32
+    # 429/5xx/연결 오류 재시도 (지수 백오프 + jitter, Retry-After 우선)
+    outbound_max_retries: int = 5
+    outbound_backoff_base_seconds: float = 0.5
+    outbound_backoff_max_seconds: float = 30.0
+
     # App Settings
-    max_file_size: int = 10 * 1024 * 1024  # 10MB
-    chunk_size: int = 1000
-    chunk_overlap: int = 200
+    max_file_size: int = 10 * 1024 * 1024  # 10MB (파일 1개, NDJSON은 노트 1줄 기준)
+    max_notes_file_size: int = 200 * 1024 * 1024  # NDJSON 노트 파일 전체
+    upload_read_chunk_bytes: int = 64 * 1024  # 업로드 파일을 읽는 단위
+    notes_ingest_batch_size: int = 50  # NDJSON 노트를 몇 개씩 모아 ingest/작업 등록할지
+    chunk_size: int = 1000  # 청크 최대 길이 (문자)
+    chunk_overlap: int = 200  # 인접 청크가 공유하는 길이 (문자)
+    chunk_search_oversample: int = 3  # 청크 → 문서 집계 전 검색 배수
+    # True면 임베딩 입력에 요약을 포함 (요약 완료 후 임베딩 → ingest 지연 증가)
+    ingest_embed_with_summary: bool = False
+    # combined: 요약 + 키워드를 JSON 모드 LLM 호출 1회로 생성 (응답 검증 실패 시 개별 호출로 대체)
+    # separate: 요약/키워드 개별 호출 2회
+    ingest_enrichment_mode: str = "combined"
+
+    # Background Ingest Jobs (SQLite 영속 큐 + 워커 풀)
+    ingest_background: bool = False  # True면 업로드 API 기본값이 202 + job id (요청별 ?background= 로 변경 가능)
+    ingest_workers: int = 2  # 동시에 실행하는 ingest 작업 수
+    job_queue_path: str = "./data/jobs.db"
+    job_retention_seconds: float = 7 * 24 * 3600  # 끝난 작업 기록 보관 기간
+    job_lease_seconds: float = 60.0  # 실행 중 작업 lease (heartbeat로 갱신, 만료되면 다른 워커가 다시 실행)
+
+    # Export / Import (벡터 + 원문 NDJSON, 가져오기는 LLM 호출 없음)
+    transfer_batch_size: int = 100  # 내보내기 페이지 크기 / 가져오기 시 한 번에 저장하는 줄 수
+    max_import_file_size: int = 0  # 가져오기 파일 크기 제한 (0이면 제한 없음)
+    export_compression_level: int = 6  # gzip 압축 수준
+
+    # Batch Ingest
+    max_batch_documents: int = 1000
+    batch_enrichment_concurrency: int = 8  # 요약/키워드 동시 호출 수
+    embedding_batch_size: int = 100  # embed_documents 1회 호출당 텍스트 수
+    upsert_batch_size: int = 100  # 벡터 DB upsert 1회당 벡터 수
+    upsert_batch_max_bytes: int = 2 * 1024 * 1024  # Pinecone 요청 크기 제한 (2MB)
 
     class Config:
         env_file = ".env"
@@ -0,0 +1,65 @@
+"""
+공유 HTTP 연결 풀
+
+OpenAI(ChatOpenAI/OpenAIEmbeddings)와 Cohere 클라이언트가 같은 keep-alive
+httpx 클라이언트를 사용하므로, 호출마다 새 연결/TLS 핸드셰이크를 맺지 않습니다.
+(Pinecone은 자체 urllib3 풀을 쓰며 크기만 같은 설정값으로 맞춥니다.)
+
+연결 수 상한: http_max_connections / http_max_keepalive_connections
+"""
+
+import logging
+from typing import Optional
+import httpx
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_client: Optional[httpx.Client] = None
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds
+    )
+
+
+def _timeout() -> httpx.Timeout:
+    settings = get_settings()
+    return httpx.Timeout(settings.http_timeout_seconds, connect=settings.http_connect_timeout_seconds)
+
+
+def get_http_client() -> httpx.Client:
+    """동기 호출용 공유 클라이언트 (스레드 풀에서 실행되는 SDK 호출)"""
+    global _client
+    if _client is None:
+        limits = _limits()
+        _client = httpx.Client(limits=limits, timeout=_timeout())
+        logger.info(
+            f"HTTP client pool started - max connections: {limits.max_connections}, "
+            f"keep-alive: {limits.max_keepalive_connections}"
+        )
+    return _client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """비동기 호출용 공유 클라이언트"""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(limits=_limits(), timeout=_timeout())
+    return _async_client
+
+
+async def close_http_clients():
+    """앱 종료 시 연결 풀 정리"""
+    global _client, _async_client
+    if _client is not None:
+        _client.close()
+        _client = None
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
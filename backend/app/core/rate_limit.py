@@ -0,0 +1,359 @@
+"""
+외부 API 호출 조절기 (OpenAI, Cohere, Pinecone)
+
+공급자마다 하나의 ProviderGovernor가 모든 호출을 통과시킵니다.
+- 토큰 버킷: 분당 요청 수(rpm), 분당 토큰 수(tpm, 추정치)
+  예약 방식이라 먼저 온 호출부터 필요한 만큼만 기다립니다.
+- 동시 호출 수 상한 (스레드 풀의 동기 호출과 이벤트 루프의 비동기 호출이 하나의 상한을 공유)
+- 재시도: 429/5xx/연결 오류에 지수 백오프 + jitter, Retry-After(-ms) 헤더 우선
+- 적응: 429를 받으면 허용 속도를 절반으로 낮추고 Retry-After 동안 모든 호출을 멈춘 뒤,
+  성공할 때마다 조금씩 설정값까지 회복합니다 (AIMD)
+
+대기 시간(큐잉 지연)과 재시도/429 횟수는 stats()로 확인합니다.
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar, Union
+import asyncio
+import collections
+import logging
+import random
+import threading
+import time
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+_CONNECTION_ERRORS = {"APIConnectionError", "APITimeoutError", "ConnectError", "ReadTimeout",
+                      "ConnectTimeout", "RemoteProtocolError", "ProtocolError", "MaxRetryError"}
+# 이 시간 이상 기다린 호출은 로그로 남김
+_SLOW_WAIT_SECONDS = 1.0
+# 429 후 허용 속도 배율 하한 / 성공당 회복량
+_MIN_RATE_FACTOR = 0.1
+_RATE_RECOVERY = 0.02
+
+
+def estimate_tokens(*texts: str) -> int:
+    """토큰 수 추정 (한국어 위주 텍스트 기준으로 넉넉하게 2자당 1토큰)"""
+    return max(1, sum(len(text) for text in texts) // 2)
+
+
+class TokenBucket:
+    """분당 허용량 토큰 버킷 (스레드 안전, 부족분은 대기 시간으로 예약)"""
+
+    def __init__(self, per_minute: float, burst_seconds: float = 10.0):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self._level = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, amount: float, factor: float = 1.0) -> float:
+        """amount만큼 차감하고 기다려야 할 시간(초) 반환"""
+        rate = self.rate * factor
+        with self._lock:
+            now = time.monotonic()
+            self._level = min(self.capacity, self._level + (now - self._updated) * rate)
+            self._updated = now
+            self._level -= amount
+            return 0.0 if self._level >= 0 else -self._level / rate
+
+
+class ConcurrencyLimit:
+    """동기/비동기 호출이 함께 쓰는 동시 실행 수 상한 (스레드 안전, 먼저 기다린 호출부터)
+
+    스레드 대기자는 threading.Event, 코루틴 대기자는 자기 이벤트 루프의 future로 기다리고,
+    슬롯을 반납하면 다음 대기자에게 바로 넘겨줍니다.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._active = 0
+        self._waiters: Deque[Union[threading.Event, asyncio.Future]] = collections.deque()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            event = threading.Event()
+            self._waiters.append(event)
+        event.wait()
+
+    async def aacquire(self):
+        with self._lock:
+            if self._active < self.limit and not self._waiters:
+                self._active += 1
+                return
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                waiting = future in self._waiters
+                if waiting:
+                    self._waiters.remove(future)
+            if not waiting:  # 취소 전에 슬롯을 넘겨받음
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            if not self._waiters:
+                self._active -= 1
+                return
+            waiter = self._waiters.popleft()  # 슬롯을 그대로 넘김 (_active 유지)
+        if isinstance(waiter, threading.Event):
+            waiter.set()
+            return
+        try:
+            waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+        except RuntimeError:  # 대기자의 이벤트 루프가 닫힘
+            self.release()
+
+
+def _wake(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    for attribute in ("status_code", "status", "http_status"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Retry-After / retry-after-ms 헤더 (초)"""
+    headers = getattr(error, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+    if not headers:
+        return None
+
+    try:
+        milliseconds = headers.get("retry-after-ms")
+        if milliseconds is not None:
+            return float(milliseconds) / 1000.0
+        value = headers.get("retry-after")
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    status = _status_code(error)
+    if status is not None:
+        return status in _RETRYABLE_STATUS
+    return (
+        isinstance(error, (TimeoutError, ConnectionError))
+        or type(error).__name__ in _CONNECTION_ERRORS
+    )
+
+
+class ProviderGovernor:
+    """공급자별 호출 조절 (토큰 버킷 + 동시 호출 수 + 재시도)"""
+
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_concurrency: int = 0,
+        max_retries: int = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0
+    ):
+        self.name = name
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_concurrency = max_concurrency
+        # 0이면 제한 없음
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._slots = ConcurrencyLimit(max_concurrency) if max_concurrency > 0 else None
+
+        self._lock = threading.Lock()
+        self._rate_factor = 1.0
+        self._paused_until = 0.0
+        self._counters = {
+            "calls": 0, "throttled": 0, "retries": 0, "rate_limited": 0, "failures": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    # 예약 / 통계
+
+    def _reserve(self, tokens: int) -> float:
+        """요청/토큰 버킷 예약 + 429 일시정지 → 기다릴 시간(초)"""
+        with self._lock:
+            factor = self._rate_factor
+            pause = max(0.0, self._paused_until - time.monotonic())
+        delay = pause
+        if self._requests is not None:
+            delay = max(delay, self._requests.reserve(1, factor))
+        if self._tokens is not None and tokens:
+            delay = max(delay, self._tokens.reserve(tokens, factor))
+        return delay
+
+    def _record_wait(self, waited: float):
+        with self._lock:
+            self._counters["calls"] += 1
+            if waited > 0.001:
+                self._counters["throttled"] += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        if waited >= _SLOW_WAIT_SECONDS:
+            logger.info(f"{self.name} call queued for {waited:.2f}s (rate limit)")
+
+    def _on_success(self):
+        with self._lock:
+            self._rate_factor = min(1.0, self._rate_factor + _RATE_RECOVERY)
+
+    def _on_error(self, error: Exception, attempt: int) -> Optional[float]:
+        """재시도할 대기 시간(초), 재시도하지 않으면 None"""
+        retryable = is_retryable(error)
+        with self._lock:
+            if not retryable or attempt >= self.max_retries:
+                self._counters["failures"] += 1
+                return None
+            self._counters["retries"] += 1
+
+            retry_after = _retry_after(error)
+            backoff = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+            delay = retry_after if retry_after is not None else random.uniform(0, backoff)
+            if _status_code(error) == 429:
+                self._counters["rate_limited"] += 1
+                self._rate_factor = max(_MIN_RATE_FACTOR, self._rate_factor / 2)
+                self._paused_until = max(self._paused_until, time.monotonic() + delay)
+
+        logger.warning(
+            f"{self.name} call failed ({type(error).__name__}: {error}), "
+            f"retry {attempt + 1}/{self.max_retries} in {delay:.2f}s"
+        )
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = self._counters["calls"]
+            return {
+                **self._counters,
+                "avg_wait_ms": round(self._wait_total / calls * 1000, 1) if calls else 0.0,
+                "max_wait_ms": round(self._wait_max * 1000, 1),
+                "rate_factor": round(self._rate_factor, 2),
+            }
+
+    # 동기 호출 (스레드 풀에서 실행되는 SDK 호출)
+
+    @contextmanager
+    def slot(self, tokens: int = 0):
+        """속도 제한 대기 + 동시 호출 슬롯 (재시도 없음: 스트림/페이지 순회용)"""
+        started = time.monotonic()
+        delay = self._reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        if self._slots is not None:
+            self._slots.acquire()
+        self._record_wait(time.monotonic() - started)
+        try:
+            yield
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    def call(self, func: Callable[[], T], tokens: int = 0) -> T:
+        """func() 실행 (제한 대기 + 재시도)"""
+        attempt = 0
+        while True:
+            try:
+                with self.slot(tokens):
+                    result = func()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+                attempt += 1
+                continue
+            self._on_success()
+            return result
+
+    # 비동기 호출
+
+    @asynccontextmanager
+    async def aslot(self, tokens: int = 0):
+        """속도 제한 대기 + 동시 호출 슬롯 (비동기, 재시도 없음)"""
+        started = time.monotonic()
+        delay = self._reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self._slots is not None:
+            await self._slots.aacquire()
+        self._record_wait(time.monotonic() - started)
+        try:
+            yield
+        finally:
+            if self._slots is not None:
+                self._slots.release()
+
+    async def acall(self, func: Callable[[], Awaitable[T]], tokens: int = 0) -> T:
+        """await func() 실행 (제한 대기 + 재시도, 재시도마다 func를 다시 호출)"""
+        attempt = 0
+        while True:
+            try:
+                async with self.aslot(tokens):
+                    result = await func()
+            except Exception as e:
+                delay = self._on_error(e, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+            self._on_success()
+            return result
+
+
+# 공급자별 싱글톤
+_governors: Dict[str, ProviderGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def get_governor(provider: str) -> ProviderGovernor:
+    """provider: openai | cohere | pinecone"""
+    with _governors_lock:
+        governor = _governors.get(provider)
+        if governor is None:
+            settings = get_settings()
+            governor = ProviderGovernor(
+                name=provider,
+                requests_per_minute=getattr(settings, f"{provider}_rpm"),
+                tokens_per_minute=getattr(settings, f"{provider}_tpm", 0),
+                max_concurrency=getattr(settings, f"{provider}_max_concurrency"),
+                max_retries=settings.outbound_max_retries,
+                backoff_base=settings.outbound_backoff_base_seconds,
+                backoff_max=settings.outbound_backoff_max_seconds
+            )
+            _governors[provider] = governor
+        return governor
+
+
+def governor_stats() -> Dict[str, Dict[str, Any]]:
+    with _governors_lock:
+        return {provider: governor.stats() for provider, governor in _governors.items()}
@@ -0,0 +1,30 @@
+"""
+스트리밍 응답 인코딩
+
+모든 스트리밍 엔드포인트는 {"type": ..., "data": ...} 이벤트를 내보냅니다.
+- ndjson: 이벤트 하나당 JSON 한 줄 (application/x-ndjson)
+- sse: Server-Sent Events (`event: <type>` + `data: <json>`, text/event-stream)
+"""
+
+from typing import Any
+import json
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def ndjson_line(event_type: str, data: Any) -> str:
+    return json.dumps({"type": event_type, "data": data}, ensure_ascii=False) + "\n"
+
+
+def sse_event(event_type: str, data: Any) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def encode_event(event_type: str, data: Any, stream_format: str = "ndjson") -> str:
+    """이벤트를 지정한 스트림 형식의 문자열로 변환"""
+    if stream_format == "sse":
+        return sse_event(event_type, data)
+    return ndjson_line(event_type, data)
@@ -0,0 +1,129 @@
+"""
+업로드 파일 스트리밍 읽기
+
+UploadFile을 upload_read_chunk_bytes씩 읽으면서 크기 제한을 바로 검사합니다.
+- 텍스트(.txt, .md): 증분 UTF-8 디코더로 조각 단위 디코딩 (멀티바이트 문자가 조각 경계에 걸려도 안전)
+- 노트(.ndjson, .jsonl): 줄 단위로 잘라 한 줄씩 내보냄 (한 줄 크기도 제한, .gz는 스트리밍 압축 해제)
+
+파일 전체를 bytes로 한 번에 올리지 않으므로 업로드당 메모리는 제한 크기 이내로 유지됩니다.
+"""
+
+from typing import AsyncIterator, Optional, Tuple
+import codecs
+import zlib
+from fastapi import UploadFile
+from app.core.config import get_settings
+
+TEXT_EXTENSIONS = (".txt", ".md", ".markdown")
+NOTES_EXTENSIONS = (".ndjson", ".jsonl")
+
+
+class UploadTooLarge(Exception):
+    """업로드 크기 제한 초과 (API에서 413으로 변환)"""
+
+    def __init__(self, limit: int):
+        super().__init__(f"File exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+def has_extension(filename: Optional[str], extensions: Tuple[str, ...]) -> bool:
+    return bool(filename) and filename.lower().endswith(extensions)
+
+
+async def _iter_bytes(file: UploadFile, max_bytes: int) -> AsyncIterator[bytes]:
+    """크기 제한을 검사하며 파일을 조각 단위로 읽기 (max_bytes가 0이면 제한 없음)"""
+    # multipart 파싱 시 크기를 알면 읽기 전에 거절
+    size = getattr(file, "size", None)
+    if max_bytes and size is not None and size > max_bytes:
+        raise UploadTooLarge(max_bytes)
+
+    chunk_bytes = get_settings().upload_read_chunk_bytes
+    total = 0
+    while True:
+        data = await file.read(chunk_bytes)
+        if not data:
+            return
+        total += len(data)
+        if max_bytes and total > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        yield data
+
+
+async def iter_text(file: UploadFile, max_bytes: int) -> AsyncIterator[str]:
+    """UTF-8 텍스트 조각 순회 (BOM 제거, 잘못된 인코딩은 UnicodeDecodeError)"""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    async for data in _iter_bytes(file, max_bytes):
+        text = decoder.decode(data)
+        if text:
+            yield text
+    text = decoder.decode(b"", final=True)
+    if text:
+        yield text
+
+
+async def read_text(file: UploadFile, max_bytes: Optional[int] = None) -> str:
+    """텍스트 파일 읽기 (기본 제한: max_file_size)"""
+    max_bytes = max_bytes or get_settings().max_file_size
+    return "".join([text async for text in iter_text(file, max_bytes)])
+
+
+async def _gunzip(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """gzip 스트림 압축 해제 (출력도 upload_read_chunk_bytes 단위로 제한)"""
+    chunk_bytes = get_settings().upload_read_chunk_bytes
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    async for data in chunks:
+        while data:
+            output = decompressor.decompress(data, chunk_bytes)
+            if output:
+                yield output
+            data = decompressor.unconsumed_tail
+    output = decompressor.flush()
+    if output:
+        yield output
+
+
+async def iter_lines(
+    file: UploadFile,
+    max_bytes: int,
+    max_line_bytes: int,
+    gzip: bool = False
+) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """(줄 번호, 줄 bytes) 순회
+
+    UTF-8에서 줄바꿈 바이트는 멀티바이트 문자 안에 나타나지 않으므로 bytes 단위로 자르고,
+    디코딩은 호출자가 줄마다 합니다. max_line_bytes를 넘는 줄은 버리고 None을 내보냅니다.
+    빈 줄도 번호는 차지하지만 내보내지 않습니다.
+    gzip이면 압축을 풀면서 읽습니다 (max_bytes는 압축된 파일 크기 기준).
+    """
+    buffer = bytearray()
+    oversized = False
+    number = 0
+
+    chunks = _iter_bytes(file, max_bytes)
+    if gzip:
+        chunks = _gunzip(chunks)
+    async for data in chunks:
+        start = 0
+        while True:
+            end = data.find(b"\n", start)
+            piece = data[start:] if end < 0 else data[start:end]
+            if not oversized:
+                buffer += piece
+                if len(buffer) > max_line_bytes:
+                    buffer.clear()
+                    oversized = True
+            if end < 0:
+                break
+            if oversized:
+                yield number, None
+            elif buffer.strip():
+                yield number, bytes(buffer)
+            buffer.clear()
+            oversized = False
+            number += 1
+            start = end + 1
+
+    if oversized:
+        yield number, None
+    elif buffer.strip():
+        yield number, bytes(buffer)
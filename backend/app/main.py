@@ -1,8 +1,12 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import logging
-from app.api import documents, graphs
+from app.api import admin, documents, graphs, jobs
 from app.core.langsmith import init_langsmith
+from app.core.concurrency import shutdown_executor
+from app.core.http_clients import close_http_clients
+from app.services.corpus_transfer import get_corpus_transfer
+from app.services.job_queue import get_job_queue
 
 # 로깅 설정
 logging.basicConfig(
@@ -40,6 +44,28 @@ app.add_middleware(
 # 라우터 등록
 app.include_router(documents.router)
 app.include_router(graphs.router)
+app.include_router(jobs.router)
+app.include_router(admin.router)
+
+
+@app.on_event("startup")
+async def on_startup():
+    """백그라운드 ingest 워커 시작 (재시작 전 대기/실행 중이던 작업 재개)"""
+    await get_job_queue().start()
+
+    # 어휘 색인이 비어 있으면 경고만 남김 (재구성은 /api/admin/rebuild-lexical)
+    try:
+        await get_corpus_transfer().check_lexical_index()
+    except Exception as e:
+        logger.error(f"Error checking lexical index: {e}")
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    """ingest 워커 중지 + 블로킹 I/O 스레드 풀 + HTTP 연결 풀 정리"""
+    await get_job_queue().stop()
+    shutdown_executor()
+    await close_http_clients()
 
 
 @app.get("/")
@@ -0,0 +1,31 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+
+class ImportLineError(BaseModel):
+    """가져오기 실패한 줄"""
+    line: int = Field(..., description="줄 번호 (0부터, 헤더가 0)")
+    error: str = Field(..., description="오류 메시지")
+
+
+class ImportResponse(BaseModel):
+    """코퍼스 가져오기 결과"""
+    documents: int = Field(..., description="저장한 문서 수")
+    chunks: int = Field(..., description="저장한 청크 벡터 수")
+    failed: int = Field(..., description="실패한 줄 수")
+    errors: List[ImportLineError] = Field(default_factory=list, description="실패한 줄 (최대 20개)")
+    duration_ms: float = Field(..., description="처리 시간 (ms)")
+
+
+class ContentBackfillResponse(BaseModel):
+    """원문 저장소 이전 결과"""
+    scanned: int = Field(..., description="확인한 문서 수")
+    migrated: int = Field(..., description="메타데이터의 full_text를 옮긴 문서 수")
+    duration_ms: float = Field(..., description="처리 시간 (ms)")
+
+
+class LexicalRebuildResponse(BaseModel):
+    """어휘 색인 재구성 결과"""
+    documents: int = Field(..., description="색인한 문서 수")
+    removed: int = Field(..., description="벡터 DB에 없어 색인에서 제거한 문서 수")
+    duration_ms: float = Field(..., description="처리 시간 (ms)")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Literal
 from datetime import datetime
 
 
@@ -19,6 +19,31 @@ class DocumentIngestResponse(BaseModel):
     project: str = Field(..., description="프로젝트 이름")
     created_at: datetime = Field(..., description="생성 시각")
     embedding_stored: bool = Field(..., description="벡터 DB 저장 여부")
+    chunk_count: int = Field(1, description="인덱싱된 청크 수")
+    duplicate_of: Optional[str] = Field(None, description="중복/유사 문서 ID")
+    duplicate_type: Optional[Literal["exact", "near"]] = Field(None, description="exact: 같은 원문, near: 유사 원문")
+    similarity: Optional[float] = Field(None, description="유사 문서와의 추정 Jaccard 유사도")
+
+
+class BatchUploadRequest(BaseModel):
+    """여러 문서 일괄 업로드 요청"""
+    documents: List[DocumentUploadRequest] = Field(..., min_length=1, description="업로드할 문서 목록")
+
+
+class BatchIngestItem(BaseModel):
+    """일괄 ingest 개별 결과"""
+    index: int = Field(..., description="요청 내 문서 순서")
+    filename: Optional[str] = Field(None, description="파일명")
+    success: bool = Field(..., description="성공 여부")
+    document: Optional[DocumentIngestResponse] = Field(None, description="ingest 결과 (성공 시)")
+    error: Optional[str] = Field(None, description="오류 메시지 (실패 시)")
+
+
+class BatchIngestResponse(BaseModel):
+    """일괄 ingest 응답"""
+    results: List[BatchIngestItem]
+    succeeded: int = Field(..., description="성공한 문서 수")
+    failed: int = Field(..., description="실패한 문서 수")
 
 
 class SearchRequest(BaseModel):
@@ -28,6 +53,9 @@ class SearchRequest(BaseModel):
     search_scope: str = Field("both", description="검색 범위: summary/content/both")
     top_k: int = Field(10, ge=1, le=50, description="상위 결과 개수")
     use_rerank: bool = Field(True, description="재랭킹 사용 여부")
+    rerank_mode: Optional[Literal["cohere", "local"]] = Field(
+        None, description="재랭킹 방식: cohere/local (미지정 시 설정값)"
+    )
 
 
 class SearchResultItem(BaseModel):
@@ -39,7 +67,11 @@ class SearchResultItem(BaseModel):
     keywords: List[str]
     project: str
     filename: Optional[str]
+    rerank_score: Optional[float] = Field(None, description="재랭킹 점수 (rerank 시)")
     evidence: Optional[str] = Field(None, description="관련성 근거 (rerank 시)")
+    matched_chunk: Optional[str] = Field(None, description="가장 유사한 청크 (여러 청크로 나뉜 문서)")
+    chunk_index: Optional[int] = Field(None, description="가장 유사한 청크 번호")
+    fusion_score: Optional[float] = Field(None, description="하이브리드 검색 RRF 점수")
     created_at: datetime
 
 
@@ -63,3 +95,14 @@ class AnswerResponse(BaseModel):
     answer: str = Field(..., description="생성된 답변 (2-6문장)")
     highlights: List[str] = Field(..., description="핵심 포인트 3개")
     source_documents: List[SearchResultItem] = Field(..., description="근거 문서")
+
+
+class AskRequest(SearchRequest):
+    """검색 + 답변 생성 요청 (검색 결과를 서버에서 바로 답변에 사용)"""
+    max_results_to_use: int = Field(3, ge=1, le=10, description="답변에 사용할 결과 개수")
+
+
+class AskResponse(BaseModel):
+    """검색 + 답변 생성 응답"""
+    search: SearchResponse
+    answer: AnswerResponse
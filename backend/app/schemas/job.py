@@ -0,0 +1,26 @@
+from pydantic import BaseModel, Field
+from typing import Optional, Dict, Any, List, Literal
+from datetime import datetime
+
+
+class JobStatus(BaseModel):
+    """백그라운드 작업 상태"""
+    id: str = Field(..., description="작업 ID")
+    kind: str = Field(..., description="작업 종류 (ingest)")
+    status: Literal["queued", "running", "succeeded", "failed"]
+    total: int = Field(..., description="처리할 문서 수")
+    completed: int = Field(..., description="처리한 문서 수")
+    attempts: int = Field(0, description="실행 시도 횟수 (재시작으로 중단된 경우 증가)")
+    result: Optional[Dict[str, Any]] = Field(
+        None, description="결과 (단건: DocumentIngestResponse, 일괄: BatchIngestResponse)"
+    )
+    error: Optional[str] = Field(None, description="오류 메시지 (실패 시)")
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobBatchStatus(BaseModel):
+    """여러 작업으로 나눠 등록한 업로드 (NDJSON 노트 파일)"""
+    jobs: List[JobStatus] = Field(..., description="등록한 작업 목록 (각 작업 결과의 index는 파일의 줄 번호)")
+    total: int = Field(..., description="전체 노트 수 (잘못된 줄 포함)")
@@ -0,0 +1,109 @@
+"""
+문장 경계 기반 청킹
+
+- 문장 분리: 종결 부호(. ! ? 。 …)와 한국어 종결 어미(다/요/죠/음/함 + 공백·줄바꿈), 빈 줄
+- 청크 구성: chunk_size 이하가 되도록 연속한 문장을 묶고,
+  다음 청크는 직전 청크 끝의 문장들(chunk_overlap 이하)로 시작
+- 청크 텍스트는 원문을 문장 위치(span)로 잘라내므로 줄바꿈 등 원래 구분자가 유지됨
+- chunk_size보다 긴 문장은 글자 단위로 잘라 같은 overlap을 적용
+"""
+
+from typing import List, NamedTuple, Tuple
+import re
+
+# 종결 부호 뒤 공백, 또는 한국어 종결 어미 뒤 줄바꿈, 또는 빈 줄에서 분리
+_SENTENCE_BOUNDARY = re.compile(
+    r"(?<=[.!?。！？…])\s+"
+    r"|(?<=[다요죠음함])\s*\n+"
+    r"|\n\s*\n+"
+)
+
+
+class Chunk(NamedTuple):
+    index: int
+    text: str
+
+
+# 원문 내 [start, end) 위치
+Span = Tuple[int, int]
+
+
+def _sentence_spans(text: str) -> List[Span]:
+    """문장별 원문 위치 (앞뒤 공백 제외, 공백만 있는 조각 제거)"""
+    boundaries = [(m.start(), m.end()) for m in _SENTENCE_BOUNDARY.finditer(text)]
+    boundaries.append((len(text), len(text)))
+
+    spans: List[Span] = []
+    start = 0
+    for end, next_start in boundaries:
+        piece = text[start:end]
+        stripped = piece.strip()
+        if stripped:
+            offset = start + len(piece) - len(piece.lstrip())
+            spans.append((offset, offset + len(stripped)))
+        start = next_start
+    return spans
+
+
+def split_sentences(text: str) -> List[str]:
+    """문장 단위로 분리 (공백만 있는 조각 제거)"""
+    return [text[start:end] for start, end in _sentence_spans(text)]
+
+
+def _split_long(span: Span, chunk_size: int, chunk_overlap: int) -> List[Span]:
+    """chunk_size보다 긴 문장 위치를 글자 단위로 분할"""
+    start, end = span
+    step = max(chunk_size - chunk_overlap, 1)
+    return [
+        (offset, min(offset + chunk_size, end))
+        for offset in range(start, max(end - chunk_overlap, start + 1), step)
+    ]
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> List[Chunk]:
+    """문서를 overlap이 있는 청크 리스트로 분할
+
+    Args:
+        text: 원문
+        chunk_size: 청크 최대 길이 (문자)
+        chunk_overlap: 인접 청크가 공유하는 최대 길이 (문자)
+
+    Returns:
+        Chunk 리스트 (빈 텍스트면 빈 리스트)
+    """
+    chunk_overlap = min(chunk_overlap, chunk_size // 2)
+
+    spans: List[Span] = []
+    for span in _sentence_spans(text):
+        if span[1] - span[0] > chunk_size:
+            spans.extend(_split_long(span, chunk_size, chunk_overlap))
+        else:
+            spans.append(span)
+
+    chunks: List[Chunk] = []
+    current: List[Span] = []
+
+    def flush():
+        # 첫 문장 시작부터 마지막 문장 끝까지 원문 그대로 (문장 사이 구분자 포함)
+        chunks.append(Chunk(index=len(chunks), text=text[current[0][0]:current[-1][1]]))
+
+    for span in spans:
+        if current and span[1] - current[0][0] > chunk_size:
+            flush()
+
+            # 직전 청크 끝에서 overlap 이하 길이의 문장들을 다음 청크로 이어감
+            end = current[-1][1]
+            overlap = [previous for previous in current if end - previous[0] <= chunk_overlap]
+
+            # overlap을 붙이면 새 문장이 들어가지 않는 경우 overlap 생략
+            if overlap and span[1] - overlap[0][0] > chunk_size:
+                overlap = []
+
+            current = overlap
+
+        current.append(span)
+
+    if current:
+        flush()
+
+    return chunks
@@ -0,0 +1,158 @@
+"""
+문서 원문 저장소 (SQLite + 압축 BLOB)
+
+벡터 메타데이터에는 요약/미리보기 같은 작은 필드만 두고,
+전체 원문은 doc_id를 키로 여기에 압축해 저장합니다.
+검색/목록 조회 응답에 원문이 실리지 않으며, 원문이 필요한 경로
+(content 범위 필터, 노드 상세 조회)에서만 읽습니다.
+
+압축: zstandard가 설치되어 있으면 zstd, 없으면 표준 라이브러리 zlib.
+행마다 codec을 기록하므로 두 형식이 섞여 있어도 읽을 수 있습니다.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+
+try:
+    import zstandard
+except ImportError:  # 선택 의존성
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+
+class ContentStore:
+    """압축 원문 저장소"""
+
+    def __init__(self, path: str, compression_level: int = 3):
+        self.path = path
+        self.compression_level = compression_level
+        self.codec = "zstd" if zstandard is not None else "zlib"
+        self._lock = threading.Lock()
+        # zstd 압축/해제 컨텍스트는 스레드 안전하지 않으므로 스레드마다 생성
+        self._local = threading.local()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS contents ("
+            "doc_id TEXT PRIMARY KEY, codec TEXT NOT NULL, "
+            "data BLOB NOT NULL, length INTEGER NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"Content store opened: {path} (codec: {self.codec})")
+
+    def _compressor(self):
+        compressor = getattr(self._local, "compressor", None)
+        if compressor is None:
+            compressor = self._local.compressor = zstandard.ZstdCompressor(level=self.compression_level)
+        return compressor
+
+    def _decompressor(self):
+        decompressor = getattr(self._local, "decompressor", None)
+        if decompressor is None:
+            decompressor = self._local.decompressor = zstandard.ZstdDecompressor()
+        return decompressor
+
+    def _compress(self, text: str) -> bytes:
+        raw = text.encode("utf-8")
+        if self.codec == "zstd":
+            return self._compressor().compress(raw)
+        return zlib.compress(raw, self.compression_level)
+
+    def _decompress(self, codec: str, data: bytes) -> str:
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read zstd-compressed content")
+            return self._decompressor().decompress(data).decode("utf-8")
+        return zlib.decompress(data).decode("utf-8")
+
+    def put(self, doc_id: str, text: str):
+        self.put_many([(doc_id, text)])
+
+    def put_many(self, items: List[Tuple[str, str]]):
+        """(doc_id, text) 목록을 한 트랜잭션으로 저장"""
+        rows = [
+            (doc_id, self.codec, self._compress(text), len(text))
+            for doc_id, text in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO contents (doc_id, codec, data, length) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def get(self, doc_id: str) -> Optional[str]:
+        return self.get_many([doc_id]).get(doc_id)
+
+    def get_many(self, doc_ids: List[str]) -> Dict[str, str]:
+        """doc_id → 원문 (없는 ID는 제외)"""
+        contents: Dict[str, str] = {}
+        unique_ids = list(dict.fromkeys(doc_ids))
+        # SQLite 바인딩 변수 수 제한을 피하기 위해 나눠서 조회
+        for start in range(0, len(unique_ids), 500):
+            batch = unique_ids[start:start + 500]
+            placeholders = ",".join("?" * len(batch))
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT doc_id, codec, data FROM contents WHERE doc_id IN ({placeholders})",
+                    batch
+                ).fetchall()
+            for doc_id, codec, data in rows:
+                contents[doc_id] = self._decompress(codec, data)
+        return contents
+
+    def delete(self, doc_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM contents WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            count, text_chars, stored_bytes = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(length), 0), COALESCE(SUM(LENGTH(data)), 0) FROM contents"
+            ).fetchone()
+        return {
+            "documents": count,
+            "codec": self.codec,
+            "text_chars": text_chars,
+            "stored_bytes": stored_bytes,
+        }
+
+    # 비동기 API: SQLite 호출을 공유 스레드 풀에서 실행
+
+    async def aput_many(self, items: List[Tuple[str, str]]):
+        await run_blocking(self.put_many, items)
+
+    async def aget(self, doc_id: str) -> Optional[str]:
+        return await run_blocking(self.get, doc_id)
+
+    async def aget_many(self, doc_ids: List[str]) -> Dict[str, str]:
+        return await run_blocking(self.get_many, doc_ids)
+
+    async def adelete(self, doc_id: str):
+        await run_blocking(self.delete, doc_id)
+
+
+# 싱글톤 인스턴스
+_content_store = None
+
+
+def get_content_store() -> ContentStore:
+    global _content_store
+    if _content_store is None:
+        settings = get_settings()
+        _content_store = ContentStore(
+            path=settings.content_store_path,
+            compression_level=settings.content_store_compression_level
+        )
+    return _content_store
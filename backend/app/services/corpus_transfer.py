@@ -0,0 +1,421 @@
+"""
+코퍼스 내보내기 / 가져오기 (NDJSON, 벡터 포함)
+
+한 줄에 레코드 하나 ({"type": ..., "data": ...}, 스트리밍 API와 같은 형식):
+- header: 형식/버전, 임베딩 모델과 차원 (첫 줄)
+- document: 문서 벡터 (id, metadata, values) + 원문 text
+- chunk: 청크 벡터 (id, metadata, values)
+- done: 내보낸 문서/청크 수 (마지막 줄)
+
+청크 벡터를 문서와 별도 줄로 두어 한 줄 크기가 원문 하나 정도로 제한됩니다.
+가져오기는 저장된 벡터를 그대로 upsert하고 원문 저장소/어휘 색인/중복 색인만 다시 만들므로
+요약, 키워드, 임베딩 생성(LLM 호출)이 전혀 없습니다.
+"""
+
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+import asyncio
+import json
+import logging
+import time
+import zlib
+from app.core.cache import bump_corpus_version
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+from app.core.streaming import ndjson_line
+from app.services.content_store import get_content_store
+from app.services.dedup_index import get_dedup_index
+from app.services.graph_service import get_graph_service
+from app.services.lexical_index import get_lexical_index
+from app.services.vector_db import get_vector_db, batch_vectors, chunk_vector_id
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMAT = "recallmap-export"
+EXPORT_VERSION = 1
+
+# 가져오기: 줄 수(transfer_batch_size)와 별개로 모아 두는 원본 크기 상한
+_IMPORT_FLUSH_BYTES = 16 * 1024 * 1024
+# 응답에 담는 줄 단위 오류 수
+_MAX_REPORTED_ERRORS = 20
+
+Record = Tuple[str, Dict[str, Any]]
+
+
+class ExportFormatError(ValueError):
+    """가져올 수 없는 파일 (헤더 없음, 다른 형식/버전, 임베딩 모델/차원 불일치)"""
+
+
+def encode_records(records: List[Record], compressor=None) -> bytes:
+    """레코드 목록 → NDJSON bytes (compressor가 있으면 gzip 스트림 조각)"""
+    data = "".join(ndjson_line(record_type, record) for record_type, record in records).encode("utf-8")
+    return compressor.compress(data) if compressor is not None else data
+
+
+def gzip_compressor(level: int):
+    return zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+
+class CorpusTransfer:
+    """코퍼스 내보내기/가져오기"""
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.vector_db = get_vector_db()
+        self.content_store = get_content_store()
+        self.lexical_index = get_lexical_index()
+        self.dedup_index = get_dedup_index()
+
+    def _header(self, project: Optional[str]) -> Dict[str, Any]:
+        return {
+            "format": EXPORT_FORMAT,
+            "version": EXPORT_VERSION,
+            "embedding_model": self.settings.embedding_model,
+            "dimension": self.settings.embedding_dimension,
+            "project": project,
+            "exported_at": datetime.utcnow().isoformat(),
+        }
+
+    # 내보내기
+
+    async def export_batches(
+        self,
+        project: Optional[str] = None,
+        include_chunks: bool = True
+    ) -> AsyncIterator[List[Record]]:
+        """레코드를 transfer_batch_size개 문서 단위로 순회
+
+        문서 벡터는 벡터 DB 배치 순회로 읽고, 원문은 원문 저장소에서 배치로 조회합니다.
+        청크 벡터는 문서의 chunk_count로 ID를 만들어 fetch합니다.
+        """
+        batch_size = self.settings.transfer_batch_size
+        documents = chunks = 0
+        started = time.perf_counter()
+        yield [("header", self._header(project))]
+
+        async for batch in self.vector_db.aiter_document_batches(
+            project=project,
+            batch_size=batch_size,
+            include_values=True
+        ):
+            texts = await self.content_store.aget_many([document["id"] for document in batch])
+            records: List[Record] = []
+            for document in batch:
+                metadata = document["metadata"]
+                records.append(("document", {
+                    "id": document["id"],
+                    "metadata": metadata,
+                    "values": document["values"],
+                    # 원문 저장소 이전 문서는 메타데이터의 full_text
+                    "text": texts.get(document["id"]) or metadata.get("full_text"),
+                }))
+            documents += len(batch)
+            yield records
+
+            if not include_chunks:
+                continue
+            chunk_ids = [
+                chunk_vector_id(document["id"], index)
+                for document in batch
+                if int(document["metadata"].get("chunk_count") or 1) > 1
+                for index in range(int(document["metadata"]["chunk_count"]))
+            ]
+            for start in range(0, len(chunk_ids), batch_size):
+                ids = chunk_ids[start:start + batch_size]
+                fetched = await self.vector_db.afetch_documents(ids, include_values=True)
+                records = [("chunk", fetched[vector_id]) for vector_id in ids if vector_id in fetched]
+                chunks += len(records)
+                if records:
+                    yield records
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Corpus exported - documents: {documents}, chunks: {chunks}, {duration_ms:.0f}ms")
+        yield [("done", {"documents": documents, "chunks": chunks})]
+
+    # 가져오기
+
+    def _check_header(self, line: Optional[bytes]):
+        try:
+            record = json.loads(line) if line else None
+        except ValueError:
+            record = None
+        if not isinstance(record, dict) or record.get("type") != "header":
+            raise ExportFormatError("Missing export header (first line)")
+
+        header = record.get("data") or {}
+        if header.get("format") != EXPORT_FORMAT or header.get("version") != EXPORT_VERSION:
+            raise ExportFormatError(
+                f"Unsupported export format: {header.get('format')} v{header.get('version')}"
+            )
+        if (
+            header.get("embedding_model") != self.settings.embedding_model
+            or header.get("dimension") != self.settings.embedding_dimension
+        ):
+            raise ExportFormatError(
+                f"Export uses {header.get('embedding_model')} ({header.get('dimension')}d), "
+                f"this index uses {self.settings.embedding_model} ({self.settings.embedding_dimension}d)"
+            )
+
+    def _parse_lines(
+        self,
+        lines: List[Tuple[int, Optional[bytes]]]
+    ) -> Tuple[List[Tuple[int, str, Dict[str, Any]]], List[Dict[str, Any]]]:
+        """줄 목록 → (줄 번호, 종류, 벡터 레코드) 목록과 줄 단위 오류 (스레드 풀에서 실행)"""
+        records = []
+        errors = []
+        for number, line in lines:
+            try:
+                if line is None:
+                    raise ValueError("Line too long")
+                record = json.loads(line)
+                record_type = record.get("type") if isinstance(record, dict) else None
+                if record_type == "done":
+                    continue
+                if record_type not in ("document", "chunk"):
+                    raise ValueError(f"Unknown record type: {record_type}")
+
+                data = record.get("data")
+                if (
+                    not isinstance(data, dict)
+                    or not isinstance(data.get("id"), str)
+                    or not isinstance(data.get("metadata"), dict)
+                ):
+                    raise ValueError("Record needs id and metadata")
+                values = data.get("values")
+                if not isinstance(values, list) or len(values) != self.settings.embedding_dimension:
+                    raise ValueError("Vector dimension does not match embedding_dimension")
+                if record_type == "document":
+                    data["metadata"] = {**data["metadata"], "doc_id": data["id"]}
+                    data["metadata"].pop("full_text", None)
+                records.append((number, record_type, data))
+            except ValueError as e:  # JSON 오류 포함
+                errors.append({"line": number, "error": str(e)})
+        return records, errors
+
+    def _signatures(self, documents: List[Tuple[str, Optional[str], str]]):
+        return [
+            (doc_id, project, self.dedup_index.signature(text))
+            for doc_id, project, text in documents
+        ]
+
+    async def _store(self, records: List[Tuple[int, str, Dict[str, Any]]]) -> Tuple[int, int, List[Dict[str, Any]]]:
+        """벡터 배치 upsert + 원문/어휘 색인/중복 색인 기록 → (문서 수, 청크 수, 오류)"""
+        vectors = [
+            {"id": data["id"], "values": data["values"], "metadata": data["metadata"]}
+            for _, _, data in records
+        ]
+        batches = list(batch_vectors(
+            vectors,
+            max_count=self.settings.upsert_batch_size,
+            max_bytes=self.settings.upsert_batch_max_bytes
+        ))
+        # 동시 요청 수는 Pinecone 호출 조절기가 제한
+        outcomes = await asyncio.gather(
+            *(self.vector_db.aupsert_documents(batch) for batch in batches),
+            return_exceptions=True
+        )
+        failed: Dict[str, str] = {}
+        for batch, outcome in zip(batches, outcomes):
+            if isinstance(outcome, Exception):
+                for vector in batch:
+                    failed[vector["id"]] = str(outcome)
+
+        errors = []
+        documents = []
+        chunks = 0
+        for number, record_type, data in records:
+            if data["id"] in failed:
+                errors.append({"line": number, "error": failed[data["id"]]})
+            elif record_type == "document":
+                documents.append(data)
+            else:
+                chunks += 1
+
+        with_text = [data for data in documents if data.get("text")]
+        await self.content_store.aput_many([(data["id"], data["text"]) for data in with_text])
+        await self.lexical_index.aadd_documents([
+            (
+                data["id"],
+                data["metadata"].get("project"),
+                data["metadata"].get("summary", ""),
+                data.get("text") or data["metadata"].get("preview", "")
+            )
+            for data in documents
+        ])
+        if self.settings.dedup_enabled and with_text:
+            signatures = await run_blocking(self._signatures, [
+                (data["id"], data["metadata"].get("project"), data["text"]) for data in with_text
+            ])
+            await self.dedup_index.aadd_many(signatures)
+
+        return len(documents), chunks, errors
+
+    async def import_lines(self, lines: AsyncIterator[Tuple[int, Optional[bytes]]]) -> Dict[str, Any]:
+        """내보내기 파일 가져오기 (같은 ID는 덮어씀)
+
+        transfer_batch_size줄(또는 _IMPORT_FLUSH_BYTES)씩 모아 파싱/저장하므로
+        파일 크기와 관계없이 한 묶음만 메모리에 둡니다.
+        """
+        started = time.perf_counter()
+        documents = chunks = 0
+        errors: List[Dict[str, Any]] = []
+        pending: List[Tuple[int, Optional[bytes]]] = []
+        pending_bytes = 0
+        header_checked = False
+
+        async def flush():
+            nonlocal documents, chunks, pending_bytes
+            records, parse_errors = await run_blocking(self._parse_lines, list(pending))
+            pending.clear()
+            pending_bytes = 0
+            stored_documents, stored_chunks, store_errors = await self._store(records)
+            documents += stored_documents
+            chunks += stored_chunks
+            errors.extend(parse_errors + store_errors)
+            bump_corpus_version()
+
+        async for number, line in lines:
+            if not header_checked:
+                self._check_header(line)
+                header_checked = True
+                continue
+            pending.append((number, line))
+            pending_bytes += len(line or b"")
+            if len(pending) >= self.settings.transfer_batch_size or pending_bytes >= _IMPORT_FLUSH_BYTES:
+                await flush()
+
+        if not header_checked:
+            raise ExportFormatError("File is empty")
+        if pending:
+            await flush()
+
+        # 그래프는 다음 요청 시 새로 계산
+        get_graph_service().invalidate_cache()
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Corpus imported - documents: {documents}, chunks: {chunks}, "
+            f"failed: {len(errors)}, {duration_ms:.0f}ms"
+        )
+        return {
+            "documents": documents,
+            "chunks": chunks,
+            "failed": len(errors),
+            "errors": errors[:_MAX_REPORTED_ERRORS],
+            "duration_ms": round(duration_ms, 1),
+        }
+
+    # 원문 저장소 이전
+
+    async def backfill_content_store(self) -> Dict[str, Any]:
+        """메타데이터에 full_text가 남은 이전 버전 문서를 원문 저장소로 옮김
+
+        원문을 원문 저장소에 저장한 뒤 full_text를 뺀 메타데이터로 벡터를 다시 upsert합니다.
+        원문 저장소에 이미 원문이 있으면 그대로 두고 메타데이터만 정리하므로 다시 실행해도 안전합니다.
+        """
+        started = time.perf_counter()
+        scanned = migrated = 0
+
+        async for batch in self.vector_db.aiter_document_batches(
+            batch_size=self.settings.transfer_batch_size,
+            include_values=True
+        ):
+            scanned += len(batch)
+            legacy = [document for document in batch if "full_text" in document["metadata"]]
+            if not legacy:
+                continue
+
+            stored = await self.content_store.aget_many([document["id"] for document in legacy])
+            await self.content_store.aput_many([
+                (document["id"], document["metadata"]["full_text"])
+                for document in legacy
+                if document["id"] not in stored and document["metadata"]["full_text"]
+            ])
+            for document in legacy:
+                document["metadata"].pop("full_text")
+            for vectors in batch_vectors(
+                legacy,
+                max_count=self.settings.upsert_batch_size,
+                max_bytes=self.settings.upsert_batch_max_bytes
+            ):
+                await self.vector_db.aupsert_documents(vectors)
+            migrated += len(legacy)
+
+        if migrated:
+            # 캐시된 그래프가 full_text가 든 메타데이터를 들고 있지 않도록 비움
+            get_graph_service().invalidate_cache()
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Content store backfill - scanned: {scanned}, migrated: {migrated}, {duration_ms:.0f}ms")
+        return {
+            "scanned": scanned,
+            "migrated": migrated,
+            "duration_ms": round(duration_ms, 1),
+        }
+
+    # 어휘 색인 재구성
+
+    async def rebuild_lexical_index(self) -> Dict[str, Any]:
+        """벡터 DB 문서와 원문 저장소로 BM25 어휘 색인을 다시 구성
+
+        문서 벡터를 배치로 순회하며 요약(메타데이터)과 원문(원문 저장소, 없으면 메타데이터의
+        full_text 또는 preview)을 색인합니다. 기존 색인을 비우지 않고 덮어쓰므로 재구성 중에도
+        검색할 수 있고, 끝난 뒤 벡터 DB에 없는 문서만 색인에서 제거합니다.
+        """
+        started = time.perf_counter()
+        indexed = 0
+        seen = set()
+
+        async for batch in self.vector_db.aiter_document_batches(
+            batch_size=self.settings.transfer_batch_size
+        ):
+            texts = await self.content_store.aget_many([document["id"] for document in batch])
+            await self.lexical_index.aadd_documents([
+                (
+                    document["id"],
+                    document["metadata"].get("project"),
+                    document["metadata"].get("summary", ""),
+                    texts.get(document["id"])
+                    or document["metadata"].get("full_text")
+                    or document["metadata"].get("preview", "")
+                )
+                for document in batch
+            ])
+            seen.update(document["id"] for document in batch)
+            indexed += len(batch)
+
+        stale = [doc_id for doc_id in self.lexical_index.doc_ids() if doc_id not in seen]
+        for doc_id in stale:
+            await self.lexical_index.aremove_document(doc_id)
+
+        bump_corpus_version()
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Lexical index rebuilt - documents: {indexed}, removed: {len(stale)}, {duration_ms:.0f}ms")
+        return {
+            "documents": indexed,
+            "removed": len(stale),
+            "duration_ms": round(duration_ms, 1),
+        }
+
+    async def check_lexical_index(self) -> bool:
+        """어휘 색인이 비어 있는데 벡터 DB에는 문서가 있으면 경고 (True면 재구성 필요)"""
+        lexical_stats = await self.lexical_index.astats()
+        if lexical_stats["documents"]:
+            return False
+        vector_stats = await self.vector_db.aget_stats()
+        if not vector_stats["total_vector_count"]:
+            return False
+        logger.warning(
+            f"Lexical index is empty but the vector index has {vector_stats['total_vector_count']} vectors; "
+            "hybrid search falls back to vector results only. Run POST /api/admin/rebuild-lexical to rebuild it."
+        )
+        return True
+
+
+# 싱글톤 인스턴스
+_corpus_transfer = None
+
+
+def get_corpus_transfer() -> CorpusTransfer:
+    global _corpus_transfer
+    if _corpus_transfer is None:
+        _corpus_transfer = CorpusTransfer()
+    return _corpus_transfer
@@ -0,0 +1,233 @@
+"""
+중복 문서 색인 (정규화 해시 + MinHash)
+
+- 정확한 중복: 정규화(NFKC, 소문자, 공백 정리)한 원문의 SHA-256이 같은 문서
+- 유사 중복: 글자 5-gram shingle의 MinHash 서명으로 추정한 Jaccard 유사도가
+  near_threshold 이상인 문서 (LSH band 버킷으로 후보만 비교)
+
+같은 프로젝트 안에서만 비교합니다.
+서명은 SQLite에 기록하고, 시작 시 메모리 색인으로 복원합니다.
+"""
+
+from typing import List, Dict, Any, Optional, Set, Tuple, NamedTuple
+import hashlib
+import itertools
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import zlib
+import numpy as np
+from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_SHINGLE_SIZE = 5
+# 한 번에 순열을 계산하는 shingle 수 (16384 × 64 × 8B = 8MB)
+_HASH_BLOCK = 16384
+
+
+class DocumentSignature(NamedTuple):
+    content_hash: str
+    minhash: np.ndarray  # uint32 (num_perm,)
+
+
+class DuplicateMatch(NamedTuple):
+    doc_id: str
+    kind: str  # "exact" | "near"
+    similarity: float
+
+
+def normalize_text(text: str) -> str:
+    """중복 비교용 정규화 (NFKC, 소문자, 연속 공백 → 공백 하나)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text).lower()).strip()
+
+
+class DedupIndex:
+    """문서 서명 색인"""
+
+    def __init__(
+        self,
+        path: str,
+        num_perm: int = 64,
+        bands: int = 16,
+        near_threshold: float = 0.8
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path
+        self.num_perm = num_perm
+        self.bands = bands
+        self.near_threshold = near_threshold
+        self._rows = num_perm // bands
+        self._lock = threading.RLock()
+
+        # 고정 시드 순열 (서명이 재시작 후에도 같아야 함)
+        generator = np.random.RandomState(1)
+        self._a = generator.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+        self._signatures: Dict[str, Tuple[Optional[str], DocumentSignature]] = {}
+        self._hashes: Dict[Tuple[Optional[str], str], Set[str]] = {}
+        self._buckets: Dict[Tuple[Optional[str], int, bytes], Set[str]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS signatures ("
+            "doc_id TEXT PRIMARY KEY, project TEXT, content_hash TEXT NOT NULL, minhash BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    def _load(self):
+        rows = self._conn.execute("SELECT doc_id, project, content_hash, minhash FROM signatures").fetchall()
+        for doc_id, project, content_hash, minhash in rows:
+            values = np.frombuffer(minhash, dtype=np.uint32)
+            if len(values) != self.num_perm:
+                continue  # 순열 수가 바뀐 이전 서명
+            self._index(doc_id, project, DocumentSignature(content_hash, values))
+        logger.info(f"Dedup index loaded: {len(self._signatures)} documents ({self.path})")
+
+    def signature(self, text: str) -> DocumentSignature:
+        """정규화 해시 + MinHash 서명"""
+        normalized = normalize_text(text)
+        content_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+        if len(normalized) <= _SHINGLE_SIZE:
+            shingles = [normalized]
+        else:
+            shingles = (
+                normalized[i:i + _SHINGLE_SIZE]
+                for i in range(len(normalized) - _SHINGLE_SIZE + 1)
+            )
+        hashes = (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles)
+
+        # (a * h + b) mod p 의 shingle별 최솟값
+        # shingle 해시와 shingle × 순열 행렬을 블록 단위로 계산해 메모리를 _HASH_BLOCK × num_perm 이내로 유지
+        # (반복 shingle은 최솟값에 영향 없으므로 집합을 만들지 않음)
+        minhash = np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        while True:
+            block = np.fromiter(itertools.islice(hashes, _HASH_BLOCK), dtype=np.uint64)
+            if not len(block):
+                break
+            permuted = (np.outer(block, self._a) + self._b) % _MERSENNE_PRIME & _MAX_HASH
+            np.minimum(minhash, permuted.min(axis=0), out=minhash)
+        minhash = minhash.astype(np.uint32)
+        return DocumentSignature(content_hash, minhash)
+
+    def _band_keys(self, project: Optional[str], minhash: np.ndarray) -> List[Tuple[Optional[str], int, bytes]]:
+        return [
+            (project, band, minhash[band * self._rows:(band + 1) * self._rows].tobytes())
+            for band in range(self.bands)
+        ]
+
+    def _index(self, doc_id: str, project: Optional[str], signature: DocumentSignature):
+        self._unindex(doc_id)
+        self._signatures[doc_id] = (project, signature)
+        self._hashes.setdefault((project, signature.content_hash), set()).add(doc_id)
+        for key in self._band_keys(project, signature.minhash):
+            self._buckets.setdefault(key, set()).add(doc_id)
+
+    def _unindex(self, doc_id: str):
+        entry = self._signatures.pop(doc_id, None)
+        if entry is None:
+            return
+        project, signature = entry
+        keys = [(self._hashes, (project, signature.content_hash))]
+        keys.extend((self._buckets, key) for key in self._band_keys(project, signature.minhash))
+        for table, key in keys:
+            members = table.get(key)
+            if members is not None:
+                members.discard(doc_id)
+                if not members:
+                    del table[key]
+
+    def find(
+        self,
+        project: Optional[str],
+        signature: DocumentSignature,
+        exact_only: bool = False
+    ) -> Optional[DuplicateMatch]:
+        """같은 프로젝트의 정확한 중복, 없으면 가장 유사한 유사 중복"""
+        with self._lock:
+            exact = self._hashes.get((project, signature.content_hash))
+            if exact:
+                return DuplicateMatch(min(exact), "exact", 1.0)
+            if exact_only:
+                return None
+
+            candidates: Set[str] = set()
+            for key in self._band_keys(project, signature.minhash):
+                candidates.update(self._buckets.get(key, ()))
+
+            best: Optional[DuplicateMatch] = None
+            for doc_id in candidates:
+                similarity = float(np.mean(self._signatures[doc_id][1].minhash == signature.minhash))
+                if similarity >= self.near_threshold and (best is None or similarity > best.similarity):
+                    best = DuplicateMatch(doc_id, "near", similarity)
+            return best
+
+    def add_many(self, documents: List[Tuple[str, Optional[str], DocumentSignature]]):
+        """(doc_id, project, 서명) 목록을 색인하고 한 트랜잭션으로 저장"""
+        with self._lock:
+            for doc_id, project, signature in documents:
+                self._index(doc_id, project, signature)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO signatures (doc_id, project, content_hash, minhash) VALUES (?, ?, ?, ?)",
+                [
+                    (doc_id, project, signature.content_hash, signature.minhash.tobytes())
+                    for doc_id, project, signature in documents
+                ]
+            )
+            self._conn.commit()
+
+    def remove(self, doc_id: str):
+        with self._lock:
+            self._unindex(doc_id)
+            self._conn.execute("DELETE FROM signatures WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._signatures),
+                "distinct_contents": len(self._hashes),
+                "near_threshold": self.near_threshold,
+            }
+
+    # 비동기 API: 서명 계산(CPU)과 SQLite 기록은 공유 스레드 풀에서 실행
+
+    async def asignature(self, text: str) -> DocumentSignature:
+        return await run_blocking(self.signature, text)
+
+    async def aadd_many(self, documents: List[Tuple[str, Optional[str], DocumentSignature]]):
+        await run_blocking(self.add_many, documents)
+
+    async def aremove(self, doc_id: str):
+        await run_blocking(self.remove, doc_id)
+
+
+# 싱글톤 인스턴스
+_dedup_index = None
+
+
+def get_dedup_index() -> DedupIndex:
+    global _dedup_index
+    if _dedup_index is None:
+        settings = get_settings()
+        _dedup_index = DedupIndex(
+            path=settings.dedup_index_path,
+            num_perm=settings.dedup_num_perm,
+            bands=settings.dedup_bands,
+            near_threshold=settings.dedup_near_threshold
+        )
+    return _dedup_index
@@ -1,111 +1,587 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator, Awaitable, Callable
 from datetime import datetime
+import asyncio
+import time
 import uuid
 import logging
+import numpy as np
+from app.core.config import get_settings
+from app.core.cache import TTLCache, get_corpus_version, bump_corpus_version
+from app.services.chunking import Chunk, chunk_text
+from app.services.content_store import get_content_store
+from app.services.dedup_index import DocumentSignature, DuplicateMatch, get_dedup_index
+from app.services.lexical_index import FIELDS as LEXICAL_FIELDS, get_lexical_index
+from app.services.local_rerank import get_local_reranker
 from app.services.llm_service import get_llm_service
-from app.services.vector_db import get_vector_db
+from app.services.graph_service import get_graph_service
+from app.services.vector_db import get_vector_db, batch_vectors, chunk_vector_id
 from app.schemas.document import (
     DocumentUploadRequest,
     DocumentIngestResponse,
+    BatchIngestItem,
+    BatchIngestResponse,
     SearchRequest,
     SearchResponse,
     SearchResultItem,
     AnswerRequest,
-    AnswerResponse
+    AnswerResponse,
+    AskRequest,
+    AskResponse
 )
 
 logger = logging.getLogger(__name__)
 
+# 청크 벡터에 복사하는 문서 메타데이터 (검색 결과 표시/필터용, 원문 제외)
+_CHUNK_METADATA_FIELDS = ("doc_id", "summary", "preview", "keywords", "project", "filename", "created_at")
+
+# 백그라운드 일괄 ingest 작업의 진행률 보고 단위 (문서 수)
+_JOB_PROGRESS_BATCH = 50
+
 
 class DocumentService:
     """문서 관리 서비스"""
 
     def __init__(self):
+        self.settings = get_settings()
         self.llm_service = get_llm_service()
         self.vector_db = get_vector_db()
+        self.content_store = get_content_store()
+        self.lexical_index = get_lexical_index()
+        self.local_reranker = get_local_reranker()
+        self.dedup_index = get_dedup_index()
+        self.search_cache: TTLCache[SearchResponse] = TTLCache(
+            max_entries=self.settings.search_cache_size,
+            ttl_seconds=self.settings.search_cache_ttl_seconds
+        )
 
     async def ingest_document(self, request: DocumentUploadRequest) -> DocumentIngestResponse:
-        """파일을 기억으로 변환하여 저장"""
+        """파일을 기억으로 변환하여 저장
+
+        중복 검사(dedup_enabled)를 먼저 수행합니다.
+        - 정확한 중복: API 호출 없이 기존 문서를 반환
+        - 유사 중복: 기존 문서의 요약/키워드를 재사용하고 임베딩만 생성
+          (변경되지 않은 청크는 임베딩 캐시에 적중), dedup_near_policy에 따라
+          새 문서로 저장(flag)하거나 기존 문서를 교체(merge)
+        """
         try:
-            doc_id = str(uuid.uuid4())
             text = request.text
+            signature = None
+            duplicate = None
+            if self.settings.dedup_enabled:
+                signature = await self.dedup_index.asignature(text)
+                duplicate = await self._find_duplicate(request.project, signature)
+                if duplicate is not None and duplicate[0].kind == "exact":
+                    match, existing = duplicate
+                    logger.info(f"Exact duplicate of doc {match.doc_id}, skipping ingest")
+                    return self._to_ingest_response(existing, match)
+
+            match, existing = duplicate or (None, None)
+            merge = match is not None and self.settings.dedup_near_policy == "merge"
+            doc_id = match.doc_id if merge else str(uuid.uuid4())
+
+            # 1~3. 청킹 후 요약 / 키워드 / 청크 임베딩 (동시 실행)
+            chunks = self._chunks(text)
+            if match is not None:
+                logger.info(
+                    f"Near duplicate of doc {match.doc_id} (similarity {match.similarity:.2f}), "
+                    f"reusing enrichment ({len(chunks)} chunks)"
+                )
+                summary, keywords = existing["summary"], existing["keywords"]
+                embeddings = await self.llm_service.agenerate_embeddings(
+                    [self._embedding_text(chunk.text, summary) for chunk in chunks]
+                )
+            else:
+                logger.info(f"Enriching doc {doc_id} ({len(chunks)} chunks)")
+                summary, keywords, embeddings = await self._enrich(text, chunks)
+
+            # 4. 메타데이터 구성 (미리보기 포함)
+            metadata = self._build_metadata(doc_id, request, summary, keywords)
+            vectors = self._build_vectors(metadata, chunks, embeddings)
+
+            # 5. 원문은 로컬 원문 저장소에, 벡터(문서 + 청크)는 벡터 DB에 저장
+            logger.info(f"Storing doc {doc_id} to vector DB")
+            if merge:
+                await self._replace_vectors(vectors, existing)
+                await self.content_store.aput_many([(doc_id, text)])
+                get_graph_service().remove_document(doc_id)
+            else:
+                await self.content_store.aput_many([(doc_id, text)])
+                try:
+                    await self._upsert_vectors(vectors)
+                except Exception:
+                    await self._discard_partial(doc_id)
+                    raise
+            await self.lexical_index.aadd_documents([(doc_id, request.project, summary, text)])
+            if signature is not None:
+                await self.dedup_index.aadd_many([(doc_id, request.project, signature)])
+            bump_corpus_version()
+            get_graph_service().add_document(doc_id, vectors[0]["values"], metadata)
+
+            return self._to_ingest_response(metadata, match)
 
-            # 1. 한 줄 요약 생성
-            logger.info(f"Generating summary for doc {doc_id}")
-            summary = self.llm_service.generate_summary(text)
-
-            # 2. 키워드 추출
-            logger.info(f"Extracting keywords for doc {doc_id}")
-            keywords = self.llm_service.extract_keywords(text)
-
-            # 3. 미리보기 생성 (첫 200자)
-            preview = text[:200] + "..." if len(text) > 200 else text
-
-            # 4. 임베딩 생성 (요약 + 원문 일부)
-            logger.info(f"Generating embedding for doc {doc_id}")
-            embedding_text = f"{summary}\n{text[:1000]}"
-            embedding = self.llm_service.generate_embedding(embedding_text)
-
-            # 5. 메타데이터 구성
-            created_at = datetime.utcnow()
-            metadata = {
-                "doc_id": doc_id,
-                "summary": summary,
-                "preview": preview,
-                "keywords": keywords,
-                "project": request.project,
-                "filename": request.filename or "untitled.txt",
-                "full_text": text,  # 전체 원문 저장
-                "created_at": created_at.isoformat()
-            }
-
-            # 6. Pinecone에 저장
-            logger.info(f"Storing doc {doc_id} to Pinecone")
-            self.vector_db.upsert_document(
-                doc_id=doc_id,
-                embedding=embedding,
-                metadata=metadata
-            )
+        except Exception as e:
+            logger.error(f"Error ingesting document: {e}")
+            raise
 
-            return DocumentIngestResponse(
-                id=doc_id,
-                summary=summary,
-                keywords=keywords,
-                preview=preview,
-                project=request.project,
-                created_at=created_at,
-                embedding_stored=True
+    async def _upsert_vectors(self, vectors: List[Dict[str, Any]]):
+        for batch in batch_vectors(
+            vectors,
+            max_count=self.settings.upsert_batch_size,
+            max_bytes=self.settings.upsert_batch_max_bytes
+        ):
+            await self.vector_db.aupsert_documents(batch)
+
+    async def _replace_vectors(self, vectors: List[Dict[str, Any]], existing: Dict[str, Any]):
+        """기존 문서 벡터를 같은 ID로 덮어쓰고, 새 버전에 없는 청크 벡터만 삭제
+
+        삭제 후 저장이 아니라 저장 후 정리이므로 저장이 실패해도 기존 문서가 남습니다.
+        """
+        doc_id = vectors[0]["id"]
+        await self._upsert_vectors(vectors)
+
+        old_count = existing.get("chunk_count", 1)
+        old_chunks = old_count if old_count > 1 else 0
+        new_chunks = len(vectors) - 1
+        stale = [chunk_vector_id(doc_id, i) for i in range(new_chunks, old_chunks)]
+        if stale:
+            await self.vector_db.adelete_vectors(stale)
+
+    async def _find_duplicate(
+        self,
+        project: Optional[str],
+        signature: DocumentSignature,
+        exact_only: bool = False
+    ) -> Optional[Tuple[DuplicateMatch, Dict[str, Any]]]:
+        """중복 문서와 그 메타데이터 (벡터 DB에서 사라진 문서는 색인에서 정리)"""
+        while True:
+            match = self.dedup_index.find(project, signature, exact_only=exact_only)
+            if match is None:
+                return None
+
+            fetched = await self.vector_db.afetch_documents([match.doc_id])
+            if match.doc_id in fetched:
+                return match, fetched[match.doc_id]["metadata"]
+            await self.dedup_index.aremove(match.doc_id)
+
+    async def ingest_documents(
+        self,
+        requests: List[DocumentUploadRequest]
+    ) -> BatchIngestResponse:
+        """여러 문서를 일괄 ingest
+
+        - 요약/키워드: 문서별 LLM 호출을 동시에 실행 (batch_enrichment_concurrency)
+        - 임베딩: embed_documents 배치 호출 (embedding_batch_size)
+        - 저장: 개수/크기 제한에 맞춘 배치 upsert (upsert_batch_size, upsert_batch_max_bytes)
+        - 중복: 기존 문서와 원문이 같은 문서만 건너뜀 (유사 중복 처리는 단건 ingest에서만)
+
+        한 문서나 한 배치의 실패는 해당 문서들의 오류로만 기록됩니다.
+        """
+        logger.info(f"Batch ingest - {len(requests)} documents")
+        results: Dict[int, BatchIngestItem] = {}
+
+        # 0. 이미 저장된 문서와 원문이 같은 문서는 API 호출 없이 기존 문서로 응답
+        signatures: Dict[int, DocumentSignature] = {}
+        if self.settings.dedup_enabled:
+            for index, request in enumerate(requests):
+                signature = await self.dedup_index.asignature(request.text)
+                duplicate = await self._find_duplicate(request.project, signature, exact_only=True)
+                if duplicate is None:
+                    signatures[index] = signature
+                    continue
+                match, existing = duplicate
+                results[index] = BatchIngestItem(
+                    index=index,
+                    filename=request.filename,
+                    success=True,
+                    document=self._to_ingest_response(existing, match)
+                )
+        remaining = [index for index in range(len(requests)) if index not in results]
+
+        # 1. 요약 + 키워드 (동시 실행)
+        semaphore = asyncio.Semaphore(self.settings.batch_enrichment_concurrency)
+
+        async def enrich(request: DocumentUploadRequest) -> Tuple[str, List[str]]:
+            async with semaphore:
+                return await self.llm_service.aenrich_document(request.text)
+
+        enriched = await asyncio.gather(
+            *(enrich(requests[index]) for index in remaining),
+            return_exceptions=True
+        )
+
+        pending: List[Tuple[int, Dict[str, Any], List[Chunk]]] = []
+        for index, outcome in zip(remaining, enriched):
+            request = requests[index]
+            if isinstance(outcome, Exception):
+                results[index] = self._batch_failure(index, request, outcome)
+                continue
+            summary, keywords = outcome
+            metadata = self._build_metadata(str(uuid.uuid4()), request, summary, keywords)
+            pending.append((index, metadata, self._chunks(request.text)))
+
+        # 2. 배치 임베딩 (모든 문서의 청크를 이어서 embedding_batch_size씩)
+        entries = [
+            (position, chunk)
+            for position, (_, _, chunks) in enumerate(pending)
+            for chunk in chunks
+        ]
+        chunk_embeddings: Dict[int, List[List[float]]] = {position: [] for position in range(len(pending))}
+        errors: Dict[int, Exception] = {}
+        batch_size = self.settings.embedding_batch_size
+        for start in range(0, len(entries), batch_size):
+            batch = entries[start:start + batch_size]
+            texts = [
+                self._embedding_text(chunk.text, pending[position][1]["summary"])
+                for position, chunk in batch
+            ]
+            try:
+                embeddings = await self.llm_service.agenerate_embeddings(texts, batch_size=len(texts))
+            except Exception as e:
+                for position, _ in batch:
+                    errors.setdefault(position, e)
+                continue
+
+            for (position, _), embedding in zip(batch, embeddings):
+                chunk_embeddings[position].append(embedding)
+
+        vectors: List[Dict[str, Any]] = []
+        vector_position: Dict[str, int] = {}
+        contents: Dict[int, Tuple[str, str]] = {}
+        for position, (index, metadata, chunks) in enumerate(pending):
+            if position in errors:
+                continue
+            contents[position] = (metadata["doc_id"], requests[index].text)
+            for vector in self._build_vectors(metadata, chunks, chunk_embeddings[position]):
+                vectors.append(vector)
+                vector_position[vector["id"]] = position
+
+        # 3. 원문 저장 (로컬 원문 저장소, 한 트랜잭션)
+        await self.content_store.aput_many(list(contents.values()))
+
+        # 4. 배치 upsert (한 문서의 벡터가 여러 배치에 걸칠 수 있음)
+        stored: Dict[int, Dict[str, Any]] = {}
+        for batch in batch_vectors(
+            vectors,
+            max_count=self.settings.upsert_batch_size,
+            max_bytes=self.settings.upsert_batch_max_bytes
+        ):
+            try:
+                await self.vector_db.aupsert_documents(batch)
+            except Exception as e:
+                for vector in batch:
+                    errors.setdefault(vector_position[vector["id"]], e)
+                continue
+
+            bump_corpus_version()
+            for vector in batch:
+                position = vector_position[vector["id"]]
+                if vector["id"] == pending[position][1]["doc_id"]:
+                    stored[position] = vector
+
+        lexical_documents: List[Tuple[str, str, str, str]] = []
+        stored_signatures: List[Tuple[str, Optional[str], DocumentSignature]] = []
+        for position, (index, metadata, _) in enumerate(pending):
+            if position in errors:
+                results[index] = self._batch_failure(index, requests[index], errors[position])
+                if position in contents:
+                    # 원문/일부 벡터만 저장된 문서는 정리
+                    await self._discard_partial(metadata["doc_id"])
+                continue
+
+            vector = stored[position]
+            get_graph_service().add_document(vector["id"], vector["values"], metadata)
+            lexical_documents.append(
+                (metadata["doc_id"], metadata["project"], metadata["summary"], requests[index].text)
             )
+            if index in signatures:
+                stored_signatures.append((metadata["doc_id"], metadata["project"], signatures[index]))
+            results[index] = BatchIngestItem(
+                index=index,
+                filename=requests[index].filename,
+                success=True,
+                document=self._to_ingest_response(metadata)
+            )
+
+        if lexical_documents:
+            await self.lexical_index.aadd_documents(lexical_documents)
+        if stored_signatures:
+            await self.dedup_index.aadd_many(stored_signatures)
+
+        ordered = [results[index] for index in sorted(results)]
+        succeeded = sum(1 for item in ordered if item.success)
+        logger.info(f"Batch ingest done - succeeded: {succeeded}, failed: {len(ordered) - succeeded}")
+
+        return BatchIngestResponse(
+            results=ordered,
+            succeeded=succeeded,
+            failed=len(ordered) - succeeded
+        )
 
+    async def run_ingest_job(
+        self,
+        payload: Dict[str, Any],
+        report_progress: Callable[[int, Optional[Dict[str, Any]]], Awaitable[None]],
+        checkpoint: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """백그라운드 ingest 작업 실행 (job_queue 워커에서 호출)
+
+        payload:
+            documents: DocumentUploadRequest dict 목록
+            single: True면 단건 ingest (결과는 DocumentIngestResponse)
+            positions: 원래 요청 내 순서 (파일 업로드에서 검증 실패 파일을 건너뛴 경우)
+            errors: 검증 단계에서 실패한 BatchIngestItem dict 목록
+
+        일괄 작업은 _JOB_PROGRESS_BATCH개씩 ingest하며 배치마다 완료한 문서 수와
+        체크포인트(offset: 다음 배치 위치, items: 지금까지의 결과)를 보고합니다.
+        checkpoint가 있으면(중단 후 재실행) offset부터 이어서 처리합니다.
+        """
+        requests = [DocumentUploadRequest(**document) for document in payload["documents"]]
+        if payload.get("single"):
+            response = await self.ingest_document(requests[0])
+            return response.model_dump(mode="json")
+
+        positions = payload.get("positions") or list(range(len(requests)))
+        errors = [BatchIngestItem(**item) for item in payload.get("errors", [])]
+        offset = (checkpoint or {}).get("offset", 0)
+        ingested = [BatchIngestItem(**item) for item in (checkpoint or {}).get("items", [])]
+        if offset:
+            logger.info(f"Resuming ingest job at document {offset}/{len(requests)}")
+
+        for start in range(offset, len(requests), _JOB_PROGRESS_BATCH):
+            batch = requests[start:start + _JOB_PROGRESS_BATCH]
+            response = await self.ingest_documents(batch)
+            for item in response.results:
+                ingested.append(item.model_copy(update={"index": positions[start + item.index]}))
+            await report_progress(start + len(batch), {
+                "offset": start + len(batch),
+                "items": [item.model_dump(mode="json") for item in ingested],
+            })
+
+        return self.merge_batch_items(errors + ingested).model_dump(mode="json")
+
+    def merge_batch_items(self, items: List[BatchIngestItem]) -> BatchIngestResponse:
+        """요청 순서로 정렬한 일괄 ingest 응답"""
+        items = sorted(items, key=lambda item: item.index)
+        succeeded = sum(1 for item in items if item.success)
+        return BatchIngestResponse(
+            results=items,
+            succeeded=succeeded,
+            failed=len(items) - succeeded
+        )
+
+    async def _enrich(
+        self,
+        text: str,
+        chunks: List[Chunk]
+    ) -> Tuple[str, List[str], List[List[float]]]:
+        """요약, 키워드, 청크 임베딩을 동시에 생성
+
+        요약/키워드(ingest_enrichment_mode=combined면 LLM 호출 1회)와 임베딩은
+        서로 독립적이므로 느린 쪽만큼만 걸립니다.
+        청크 임베딩은 embed_documents 배치 호출로 한 번에 생성합니다.
+        ingest_embed_with_summary가 켜져 있으면 임베딩은 요약이 끝난 뒤
+        요약 + 청크로 생성합니다.
+        """
+        if self.settings.ingest_embed_with_summary:
+            summary, keywords = await self.llm_service.aenrich_document(text)
+            embeddings = await self.llm_service.agenerate_embeddings(
+                [self._embedding_text(chunk.text, summary) for chunk in chunks]
+            )
+        else:
+            (summary, keywords), embeddings = await asyncio.gather(
+                self.llm_service.aenrich_document(text),
+                self.llm_service.agenerate_embeddings(
+                    [self._embedding_text(chunk.text) for chunk in chunks]
+                )
+            )
+        return summary, keywords, embeddings
+
+    def _chunks(self, text: str) -> List[Chunk]:
+        """설정된 chunk_size/chunk_overlap으로 청킹 (빈 문서는 원문 그대로 1개)"""
+        return chunk_text(
+            text,
+            self.settings.chunk_size,
+            self.settings.chunk_overlap
+        ) or [Chunk(index=0, text=text)]
+
+    def _embedding_text(self, chunk: str, summary: Optional[str] = None) -> str:
+        """청크 임베딩 입력 텍스트 (설정 시 요약 포함)"""
+        if summary and self.settings.ingest_embed_with_summary:
+            return f"{summary}\n{chunk}"
+        return chunk
+
+    def _build_vectors(
+        self,
+        metadata: Dict[str, Any],
+        chunks: List[Chunk],
+        embeddings: List[List[float]]
+    ) -> List[Dict[str, Any]]:
+        """문서 벡터 + 청크 벡터 구성
+
+        - 문서 벡터 (ID = doc_id): 전체 메타데이터, 값은 청크 임베딩 평균.
+          그래프/노드 조회/문서 순회는 이 벡터만 사용합니다.
+        - 청크 벡터 (ID = "{doc_id}#chunk-{i}"): 청크가 2개 이상일 때만 생성,
+          검색 결과 표시에 필요한 메타데이터 + chunk_index/chunk_text
+        """
+        doc_id = metadata["doc_id"]
+        metadata["chunk_count"] = len(chunks)
+
+        if len(chunks) == 1:
+            return [{"id": doc_id, "values": embeddings[0], "metadata": metadata}]
+
+        document_vector = np.mean(np.asarray(embeddings, dtype=np.float32), axis=0)
+        vectors = [{"id": doc_id, "values": document_vector.tolist(), "metadata": metadata}]
+
+        shared = {field: metadata[field] for field in _CHUNK_METADATA_FIELDS}
+        for chunk, embedding in zip(chunks, embeddings):
+            vectors.append({
+                "id": chunk_vector_id(doc_id, chunk.index),
+                "values": embedding,
+                "metadata": {
+                    **shared,
+                    "chunk_index": chunk.index,
+                    "chunk_text": chunk.text
+                }
+            })
+        return vectors
+
+    async def delete_document(self, doc_id: str):
+        """문서 삭제 (문서/청크 벡터, 원문, 어휘 색인, 중복 서명)"""
+        await self.vector_db.adelete_document(doc_id)
+        await self.content_store.adelete(doc_id)
+        await self.lexical_index.aremove_document(doc_id)
+        await self.dedup_index.aremove(doc_id)
+        bump_corpus_version()
+
+    async def _discard_partial(self, doc_id: str):
+        """일부만 저장된 문서 정리 (실패해도 ingest 결과에는 영향 없음)"""
+        try:
+            await self.delete_document(doc_id)
         except Exception as e:
-            logger.error(f"Error ingesting document: {e}")
-            raise
+            logger.error(f"Error discarding partially stored doc {doc_id}: {e}")
+
+    def _build_metadata(
+        self,
+        doc_id: str,
+        request: DocumentUploadRequest,
+        summary: str,
+        keywords: List[str]
+    ) -> Dict[str, Any]:
+        """벡터 DB 메타데이터 구성"""
+        text = request.text
+        # 미리보기 (첫 200자)
+        preview = text[:200] + "..." if len(text) > 200 else text
+
+        return {
+            "doc_id": doc_id,
+            "summary": summary,
+            "preview": preview,
+            "keywords": keywords,
+            "project": request.project,
+            "filename": request.filename or "untitled.txt",
+            "created_at": datetime.utcnow().isoformat()
+        }
+
+    def _to_ingest_response(
+        self,
+        metadata: Dict[str, Any],
+        duplicate: Optional[DuplicateMatch] = None
+    ) -> DocumentIngestResponse:
+        """메타데이터를 ingest 응답으로 변환 (중복 검사 결과 포함)"""
+        return DocumentIngestResponse(
+            id=metadata["doc_id"],
+            summary=metadata["summary"],
+            keywords=metadata["keywords"],
+            preview=metadata["preview"],
+            project=metadata["project"],
+            created_at=datetime.fromisoformat(metadata["created_at"]),
+            embedding_stored=True,
+            chunk_count=metadata.get("chunk_count", 1),
+            duplicate_of=duplicate.doc_id if duplicate else None,
+            duplicate_type=duplicate.kind if duplicate else None,
+            similarity=duplicate.similarity if duplicate else None
+        )
+
+    def _batch_failure(
+        self,
+        index: int,
+        request: DocumentUploadRequest,
+        error: Exception
+    ) -> BatchIngestItem:
+        logger.error(f"Batch ingest failed for item {index}: {error}")
+        return BatchIngestItem(
+            index=index,
+            filename=request.filename,
+            success=False,
+            error=str(error)
+        )
 
     async def search_documents(self, request: SearchRequest) -> SearchResponse:
-        """문서 검색 (벡터 검색 + 선택적 rerank)"""
-        try:
-            # 1. 쿼리 임베딩 생성
-            logger.info(f"Searching for: {request.query}")
-            query_embedding = self.llm_service.generate_embedding(request.query)
+        """문서 검색 (벡터 검색 + BM25 하이브리드 + 선택적 rerank)
 
-            # 2. 프로젝트 필터 구성
-            filter_dict = None
-            if request.project:
-                filter_dict = {"project": {"$eq": request.project}}
+        동일한 (정규화된 쿼리, 프로젝트, 범위, top_k, rerank) 요청은
+        코퍼스 버전이 바뀌기 전까지 캐시된 응답을 그대로 반환합니다.
+        """
+        try:
+            cache_key = self._search_cache_key(request)
+            if self.settings.search_cache_enabled:
+                cached = self.search_cache.get(cache_key)
+                if cached is not None:
+                    logger.info(f"Search cache hit: {request.query}")
+                    return cached.model_copy(update={"query": request.query})
 
-            # 3. Pinecone 검색 (top_k * 2 정도로 더 많이 가져옴)
+            logger.info(f"Searching for: {request.query}")
             search_k = request.top_k * 2 if request.use_rerank else request.top_k
-            raw_results = self.vector_db.search(
-                query_embedding=query_embedding,
-                top_k=search_k,
-                filter_dict=filter_dict
-            )
-
-            # 4. 검색 범위에 따른 필터링
+            # 로컬 rerank는 후보 벡터가 필요하므로 검색 결과에 벡터 포함
+            local_rerank = request.use_rerank and self._rerank_mode(request) == "local"
+
+            async def vector_search() -> Tuple[List[float], List[Dict[str, Any]]]:
+                # 1. 쿼리 임베딩 생성
+                query_embedding = await self.llm_service.agenerate_embedding(request.query)
+
+                # 2. 프로젝트 필터 구성
+                filter_dict = None
+                if request.project:
+                    filter_dict = {"project": {"$eq": request.project}}
+
+                # 3. Pinecone 검색 (top_k * 2 정도로 더 많이 가져옴)
+                # 한 문서의 여러 청크가 함께 걸리므로 청크 단위로 더 넉넉히 가져온 뒤 문서별로 집계
+                raw_results = await self.vector_db.asearch(
+                    query_embedding=query_embedding,
+                    top_k=search_k * self.settings.chunk_search_oversample,
+                    filter_dict=filter_dict,
+                    include_values=local_rerank
+                )
+                return query_embedding, self._aggregate_chunks(raw_results)
+
+            if self.settings.hybrid_search_enabled:
+                # 벡터 검색과 BM25 검색을 동시에 실행한 뒤 RRF로 결합
+                lexical_scope = request.search_scope if request.search_scope in LEXICAL_FIELDS else "both"
+                (query_embedding, vector_results), lexical_hits = await asyncio.gather(
+                    vector_search(),
+                    self.lexical_index.asearch(
+                        request.query,
+                        top_k=search_k,
+                        project=request.project,
+                        scope=lexical_scope
+                    )
+                )
+                document_results = await self._fuse_results(vector_results, lexical_hits, query_embedding)
+            else:
+                query_embedding, document_results = await vector_search()
+
+            # 4. 검색 범위에 따른 필터링 (content 범위일 때만 원문 로드)
+            full_texts = None
+            if request.search_scope == "content":
+                full_texts = await self.content_store.aget_many([
+                    result["metadata"].get("doc_id", result["id"])
+                    for result in document_results
+                ])
             filtered_results = self._filter_by_scope(
-                raw_results,
+                document_results,
                 request.query,
-                request.search_scope
+                request.search_scope,
+                full_texts
             )
 
             # 5. SearchResultItem으로 변환
@@ -120,14 +596,28 @@ class DocumentService:
                     "keywords": metadata.get("keywords", []),
                     "project": metadata["project"],
                     "filename": metadata.get("filename"),
-                    "created_at": metadata["created_at"]
+                    "created_at": metadata["created_at"],
+                    "matched_chunk": metadata.get("chunk_text"),
+                    "chunk_index": metadata.get("chunk_index"),
+                    "fusion_score": result.get("fusion_score")
                 })
+                if local_rerank:
+                    result_items[-1]["values"] = result.get("values")
 
             # 6. Rerank (옵션)
             reranked = False
-            if request.use_rerank and len(result_items) > 0:
+            if local_rerank and len(result_items) > 0:
+                logger.info("Applying local rerank (MMR)")
+                result_items = self.local_reranker.rerank(
+                    query=request.query,
+                    query_embedding=query_embedding,
+                    documents=result_items,
+                    top_k=request.top_k
+                )
+                reranked = True
+            elif request.use_rerank and len(result_items) > 0:
                 logger.info("Applying rerank")
-                result_items = self.llm_service.rerank_results(
+                result_items = await self.llm_service.arerank_results(
                     query=request.query,
                     documents=result_items,
                     top_k=request.top_k
@@ -142,24 +632,103 @@ class DocumentService:
                 for item in result_items
             ]
 
-            return SearchResponse(
+            response = SearchResponse(
                 query=request.query,
                 results=final_results,
                 reranked=reranked,
                 total_found=len(filtered_results)
             )
 
+            if self.settings.search_cache_enabled:
+                self.search_cache.set(cache_key, response)
+
+            return response
+
         except Exception as e:
             logger.error(f"Error searching documents: {e}")
             raise
 
+    def _search_cache_key(self, request: SearchRequest) -> Tuple:
+        """검색 캐시 키 (공백/대소문자 정규화 + 코퍼스 버전)"""
+        normalized_query = " ".join(request.query.lower().split())
+        return (
+            normalized_query,
+            request.project,
+            request.search_scope,
+            request.top_k,
+            request.use_rerank,
+            self._rerank_mode(request),
+            get_corpus_version()
+        )
+
+    def _rerank_mode(self, request: SearchRequest) -> str:
+        """요청에 지정된 rerank 방식 (없으면 설정값)"""
+        return request.rerank_mode or self.settings.rerank_mode
+
+    def _aggregate_chunks(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """청크/문서 벡터 결과를 문서별 최고 점수 하나로 집계 (점수 순서 유지)
+
+        남는 결과의 metadata는 가장 유사한 벡터의 것이므로,
+        청크 벡터가 이겼다면 chunk_index/chunk_text가 함께 전달됩니다.
+        """
+        best: Dict[str, Dict[str, Any]] = {}
+        for result in results:
+            doc_id = result["metadata"].get("doc_id", result["id"])
+            current = best.get(doc_id)
+            if current is None or result["score"] > current["score"]:
+                best[doc_id] = result
+        return sorted(best.values(), key=lambda result: result["score"], reverse=True)
+
+    async def _fuse_results(
+        self,
+        vector_results: List[Dict[str, Any]],
+        lexical_hits: List[Tuple[str, float]],
+        query_embedding: List[float]
+    ) -> List[Dict[str, Any]]:
+        """벡터/BM25 순위를 reciprocal rank fusion으로 결합
+
+        순서는 RRF 점수(fusion_score)로 정하고, score는 계속 코사인 유사도를 유지합니다.
+        BM25에서만 찾은 문서는 문서 벡터를 조회해 쿼리와의 유사도를 계산합니다.
+        """
+        rrf_k = self.settings.rrf_k
+        fused: Dict[str, float] = {}
+        by_id: Dict[str, Dict[str, Any]] = {}
+
+        for rank, result in enumerate(vector_results):
+            doc_id = result["metadata"].get("doc_id", result["id"])
+            by_id[doc_id] = result
+            fused[doc_id] = 1.0 / (rrf_k + rank + 1)
+
+        for rank, (doc_id, _) in enumerate(lexical_hits):
+            fused[doc_id] = fused.get(doc_id, 0.0) + 1.0 / (rrf_k + rank + 1)
+
+        missing = [doc_id for doc_id, _ in lexical_hits if doc_id not in by_id]
+        if missing:
+            fetched = await self.vector_db.afetch_documents(missing, include_values=True)
+            query = np.asarray(query_embedding, dtype=np.float32)
+            query_norm = float(np.linalg.norm(query))
+            for doc_id, document in fetched.items():
+                values = np.asarray(document["values"], dtype=np.float32)
+                norm = float(np.linalg.norm(values)) * query_norm
+                by_id[doc_id] = {
+                    "id": doc_id,
+                    "score": float(values @ query) / norm if norm else 0.0,
+                    "metadata": document["metadata"],
+                    "values": document["values"]
+                }
+
+        # 벡터 DB에 없는 문서(색인만 남은 경우)는 제외
+        ranked = sorted((doc_id for doc_id in fused if doc_id in by_id), key=fused.get, reverse=True)
+        return [{**by_id[doc_id], "fusion_score": fused[doc_id]} for doc_id in ranked]
+
     def _filter_by_scope(
         self,
         results: List[Dict[str, Any]],
         query: str,
-        scope: str
+        scope: str,
+        full_texts: Optional[Dict[str, str]] = None
     ) -> List[Dict[str, Any]]:
-        """검색 범위에 따른 필터링"""
+        """검색 범위에 따른 필터링 (full_texts: 원문 저장소에서 읽은 doc_id → 원문)"""
         if scope == "both":
             return results
 
@@ -176,8 +745,12 @@ class DocumentService:
                     filtered.append(result)
 
             elif scope == "content":
-                # 원문에만 쿼리 단어가 있는지
-                full_text = metadata.get("full_text", "").lower()
+                # 원문에만 쿼리 단어가 있는지 (이전 버전 문서는 메타데이터의 full_text)
+                full_text = (
+                    (full_texts or {}).get(metadata.get("doc_id", result["id"]))
+                    or metadata.get("full_text")
+                    or metadata.get("chunk_text", "")
+                ).lower()
                 if any(word in full_text for word in query_lower.split()):
                     filtered.append(result)
 
@@ -192,28 +765,138 @@ class DocumentService:
                 for item in request.top_results
             ]
 
-            result = self.llm_service.compose_answer(
+            result = await self.llm_service.acompose_answer(
                 query=request.query,
                 source_documents=source_docs,
                 max_docs=request.max_results_to_use
             )
 
-            # source_documents를 SearchResultItem으로 변환
-            source_items = [
-                SearchResultItem(**doc) if isinstance(doc, dict) else doc
-                for doc in result["source_documents"]
-            ]
+            return self._to_answer_response(result)
+
+        except Exception as e:
+            logger.error(f"Error composing answer: {e}")
+            raise
 
-            return AnswerResponse(
-                answer=result["answer"],
-                highlights=result["highlights"],
-                source_documents=source_items
+    async def stream_answer(self, request: AnswerRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """검색 결과 기반 답변 스트리밍
+
+        Yields:
+            (이벤트 타입, 데이터): answer 조각 → highlight → done
+            (done 데이터는 AnswerResponse JSON + metrics)
+        """
+        source_docs = [
+            item.model_dump() if hasattr(item, 'model_dump') else item
+            for item in request.top_results
+        ]
+
+        async for event in self._answer_events(request.query, source_docs, request.max_results_to_use):
+            yield event
+
+    async def _answer_events(
+        self,
+        query: str,
+        source_docs: List[Dict[str, Any]],
+        max_docs: int,
+        extra_metrics: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """LLM 스트림 이벤트에서 done 결과를 AnswerResponse JSON으로 변환"""
+        async for event_type, data in self.llm_service.astream_answer(
+            query=query,
+            source_documents=source_docs,
+            max_docs=max_docs
+        ):
+            if event_type == "done":
+                response = self._to_answer_response(data)
+                metrics = {**(extra_metrics or {}), **data["metrics"]}
+                data = {**response.model_dump(mode="json"), "metrics": metrics}
+            yield event_type, data
+
+    async def ask(self, request: AskRequest) -> AskResponse:
+        """검색 + 답변 생성 (한 요청)
+
+        검색이 끝나 상위 max_results_to_use개 결과가 확정되면 바로 답변을 생성합니다.
+        /search → /answer 왕복과 검색 결과 재전송/재검증이 없습니다.
+        """
+        try:
+            search = await self.search_documents(request)
+            sources = search.results[:request.max_results_to_use]
+            if not sources:
+                return AskResponse(search=search, answer=self._empty_answer())
+
+            result = await self.llm_service.acompose_answer(
+                query=request.query,
+                source_documents=[item.model_dump() for item in sources],
+                max_docs=request.max_results_to_use
             )
+            # 근거 문서는 이미 검증된 검색 결과 객체를 그대로 사용
+            result["source_documents"] = sources
+            return AskResponse(search=search, answer=self._to_answer_response(result))
 
         except Exception as e:
-            logger.error(f"Error composing answer: {e}")
+            logger.error(f"Error answering question: {e}")
             raise
 
+    async def stream_ask(self, request: AskRequest) -> AsyncIterator[Tuple[str, Any]]:
+        """검색 + 답변 스트리밍
+
+        Yields:
+            ("results", SearchResponse JSON) → answer 조각 → highlight → done
+            (done metrics에 search_ms 포함)
+        """
+        started = time.perf_counter()
+        search = await self.search_documents(request)
+        search_ms = round((time.perf_counter() - started) * 1000, 1)
+        sources = search.results[:request.max_results_to_use]
+
+        if not sources:
+            yield "results", search.model_dump(mode="json")
+            yield "done", {**self._empty_answer().model_dump(mode="json"), "metrics": {"search_ms": search_ms}}
+            return
+
+        answer_events = self._answer_events(
+            request.query,
+            [item.model_dump() for item in sources],
+            request.max_results_to_use,
+            extra_metrics={"search_ms": search_ms}
+        )
+        # 결과 이벤트를 전송하는 동안 답변 생성(첫 토큰 대기)을 먼저 시작
+        first_event = asyncio.ensure_future(answer_events.__anext__())
+        try:
+            yield "results", search.model_dump(mode="json")
+            yield await first_event
+            async for event in answer_events:
+                yield event
+        finally:
+            # 클라이언트 연결 종료 등으로 중간에 닫히면 진행 중인 __anext__를 정리한 뒤 스트림을 닫음
+            if not first_event.done():
+                first_event.cancel()
+                await asyncio.wait([first_event])
+            if not first_event.cancelled():
+                first_event.exception()  # 결과를 받지 않은 오류도 소비 처리
+            await answer_events.aclose()
+
+    def _empty_answer(self) -> AnswerResponse:
+        """검색 결과가 없을 때의 답변 (LLM 호출 없음)"""
+        return AnswerResponse(
+            answer="관련 문서를 찾지 못했습니다.",
+            highlights=[],
+            source_documents=[]
+        )
+
+    def _to_answer_response(self, result: Dict[str, Any]) -> AnswerResponse:
+        """LLM 답변 결과를 AnswerResponse로 변환"""
+        # source_documents를 SearchResultItem으로 변환
+        source_items = [
+            SearchResultItem(**doc) if isinstance(doc, dict) else doc
+            for doc in result["source_documents"]
+        ]
+
+        return AnswerResponse(
+            answer=result["answer"],
+            highlights=result["highlights"],
+            source_documents=source_items
+        )
+
 
 # 싱글톤 인스턴스
 _document_service = None
@@ -0,0 +1,229 @@
+"""
+2단계 임베딩 캐시
+
+- 1단계: 프로세스 메모리 LRU
+- 2단계: SQLite 디스크 캐시 (재시작 후에도 유지)
+
+키는 (임베딩 모델, 차원, 텍스트)의 SHA-256 해시이므로
+모델이나 차원을 바꾸면 이전 캐시와 섞이지 않습니다.
+"""
+
+from array import array
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from app.core.concurrency import run_blocking
+from app.core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """임베딩 캐시 (메모리 LRU + SQLite)"""
+
+    def __init__(
+        self,
+        model: str,
+        dimension: int,
+        memory_size: int,
+        disk_size: int,
+        path: Optional[str] = None
+    ):
+        self.model = model
+        self.dimension = dimension
+        self.memory_size = memory_size
+        self.disk_size = disk_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_count = 0
+        if path and disk_size > 0:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)"
+            )
+            self._conn.commit()
+            self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+            logger.info(f"Embedding disk cache loaded: {self._disk_count} entries ({path})")
+
+    def key(self, text: str) -> str:
+        """(모델, 차원, 텍스트) 해시 키"""
+        raw = f"{self.model}\x00{self.dimension}\x00{text}".encode("utf-8")
+        return hashlib.sha256(raw).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        keys = [self.key(text) for text in texts]
+        embeddings = self._get_memory(keys)
+        self._fill_from_disk(keys, embeddings)
+        return embeddings
+
+    def _get_memory(self, keys: List[str]) -> List[Optional[List[float]]]:
+        """1단계 조회 (없는 자리는 None)"""
+        embeddings: List[Optional[List[float]]] = []
+        with self._lock:
+            for key in keys:
+                embedding = self._memory.get(key)
+                if embedding is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                embeddings.append(embedding)
+        return embeddings
+
+    def _fill_from_disk(self, keys: List[str], embeddings: List[Optional[List[float]]]):
+        """메모리 미스를 디스크에서 한 번에 조회해 채움 (IN 조회 + accessed_at 갱신 1트랜잭션)"""
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return
+
+        with self._lock:
+            if self._conn is not None:
+                unique_keys = list(dict.fromkeys(keys[i] for i in missing))
+                found: Dict[str, List[float]] = {}
+                # SQLite 바인딩 변수 수 제한을 피하기 위해 나눠서 조회
+                for start in range(0, len(unique_keys), 500):
+                    batch = unique_keys[start:start + 500]
+                    placeholders = ",".join("?" * len(batch))
+                    for key, vector in self._conn.execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                        batch
+                    ):
+                        found[key] = array("f", vector).tolist()
+
+                if found:
+                    now = time.time()
+                    self._conn.executemany(
+                        "UPDATE embeddings SET accessed_at = ? WHERE key = ?",
+                        [(now, key) for key in found]
+                    )
+                    self._conn.commit()
+                    for key, embedding in found.items():
+                        self._remember(key, embedding)
+                for i in missing:
+                    embeddings[i] = found.get(keys[i])
+
+            hits = sum(1 for i in missing if embeddings[i] is not None)
+            self.disk_hits += hits
+            self.misses += len(missing) - hits
+
+    def put(self, text: str, embedding: List[float]):
+        self.put_many([text], [embedding])
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]):
+        now = time.time()
+        with self._lock:
+            rows = []
+            for text, embedding in zip(texts, embeddings):
+                key = self.key(text)
+                self._remember(key, embedding)
+                rows.append((key, array("f", embedding).tobytes(), now))
+
+            if self._conn is not None and rows:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                    rows
+                )
+                self._disk_count += self._conn.total_changes - before
+                self._evict_disk()
+                self._conn.commit()
+
+    # 비동기 API: 메모리 조회는 바로, SQLite 조회/기록은 공유 스레드 풀에서 실행
+
+    async def aget(self, text: str) -> Optional[List[float]]:
+        return (await self.aget_many([text]))[0]
+
+    async def aget_many(self, texts: List[str]) -> List[Optional[List[float]]]:
+        keys = [self.key(text) for text in texts]
+        embeddings = self._get_memory(keys)
+        if any(embedding is None for embedding in embeddings):
+            if self._conn is not None:
+                await run_blocking(self._fill_from_disk, keys, embeddings)
+            else:
+                self._fill_from_disk(keys, embeddings)
+        return embeddings
+
+    async def aput(self, text: str, embedding: List[float]):
+        await self.aput_many([text], [embedding])
+
+    async def aput_many(self, texts: List[str], embeddings: List[List[float]]):
+        if self._conn is not None:
+            await run_blocking(self.put_many, texts, embeddings)
+        else:
+            self.put_many(texts, embeddings)
+
+    def _remember(self, key: str, embedding: List[float]):
+        """메모리 LRU에 저장 (초과분은 가장 오래 안 쓴 항목부터 제거)"""
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+            self.memory_evictions += 1
+
+    def _evict_disk(self):
+        """디스크 캐시가 상한을 넘으면 오래된 항목을 한 번에 10%씩 제거"""
+        if self._disk_count <= self.disk_size:
+            return
+        excess = self._disk_count - self.disk_size + max(self.disk_size // 10, 1)
+        self._conn.execute(
+            "DELETE FROM embeddings WHERE key IN ("
+            "SELECT key FROM embeddings ORDER BY accessed_at LIMIT ?)",
+            (excess,)
+        )
+        self._disk_count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        self.disk_evictions += excess
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "disk_entries": self._disk_count,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+# 싱글톤 인스턴스
+_embedding_cache = None
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """설정에 따라 임베딩 캐시 반환 (비활성화 시 None)"""
+    global _embedding_cache
+    settings = get_settings()
+    if not settings.embedding_cache_enabled:
+        return None
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            model=settings.embedding_model,
+            dimension=settings.embedding_dimension,
+            memory_size=settings.embedding_cache_memory_size,
+            disk_size=settings.embedding_cache_disk_size,
+            path=settings.embedding_cache_path or None
+        )
+    return _embedding_cache
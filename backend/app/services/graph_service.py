@@ -1,19 +1,159 @@
-from typing import List, Dict, Any, Optional, Tuple
-import logging
+from typing import List, Dict, Any, Optional, Tuple, Iterator
 import asyncio
+import logging
 from datetime import datetime
+import numpy as np
+from app.core.cache import TTLCache, get_corpus_version
+from app.core.config import get_settings
+from app.core.streaming import ndjson_line
 from app.services.vector_db import get_vector_db
 from app.schemas.graph import GraphNode, GraphEdge, GraphData
 
 logger = logging.getLogger(__name__)
 
 
+def iter_knn_pairs(
+    vectors: np.ndarray,
+    k: int,
+    max_block_bytes: int
+) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """행 블록 단위 top-k 코사인 이웃 탐색
+
+    N x N 유사도 행렬을 만들지 않고, 한 번에 (블록 행 수 x N) 만큼만
+    계산하여 각 행의 상위 k개 이웃을 뽑습니다. 블록 크기는
+    max_block_bytes에 맞춰 정해지므로 메모리 사용량이 N^2에 비례하지 않습니다.
+
+    Args:
+        vectors: L2 정규화된 (N, D) float32 행렬
+        k: 노드당 이웃 수
+        max_block_bytes: 블록 유사도 행렬의 최대 바이트 수
+
+    Yields:
+        (행 인덱스, 이웃 인덱스, 코사인 유사도) 1차원 배열 튜플 (블록당 1회)
+    """
+    n = len(vectors)
+    k = min(k, n - 1)
+    if k <= 0:
+        return
+
+    block_rows = max(1, min(n, max_block_bytes // (n * 4)))
+    for start in range(0, n, block_rows):
+        stop = min(start + block_rows, n)
+        similarity = vectors[start:stop] @ vectors.T
+
+        # 자기 자신 제외
+        local_rows = np.arange(stop - start)
+        similarity[local_rows, local_rows + start] = -np.inf
+
+        neighbors = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(similarity, neighbors, axis=1)
+
+        rows = np.repeat(np.arange(start, stop), k)
+        yield rows, neighbors.ravel(), scores.ravel()
+
+
+def _graph_metadata(total_nodes: int, total_edges: int) -> Dict[str, Any]:
+    """그래프 통계 메타데이터"""
+    avg_connections = (total_edges * 2) / total_nodes if total_nodes else 0.0
+    return {
+        "total_nodes": total_nodes,
+        "total_edges": total_edges,
+        "avg_connections_per_node": round(avg_connections, 2)
+    }
+
+
+# 캐시 메모리 추정용 객체당 평균 크기 (pydantic 모델 + dict/set 오버헤드)
+_NODE_BYTES = 1024
+_EDGE_BYTES = 320
+
+
+class GraphSnapshot:
+    """증분 갱신 가능한 캐시 그래프
+
+    노드별 정규화 벡터와 메타데이터, 엣지 인접 리스트를 함께 보관하여
+    문서 추가/삭제 시 전체 재계산 없이 해당 노드만 갱신할 수 있게 합니다.
+    """
+
+    def __init__(
+        self,
+        project: Optional[str],
+        top_k: int,
+        min_similarity: float,
+        documents: List[Dict[str, Any]],
+        vectors: np.ndarray,
+        nodes: List[GraphNode],
+        edges: List[GraphEdge]
+    ):
+        self.project = project
+        self.top_k = top_k
+        self.min_similarity = min_similarity  # 엣지를 계산한 최소 가중치
+        self.ids: List[str] = [doc["id"] for doc in documents]
+        self.metadatas: List[Dict[str, Any]] = [doc["metadata"] for doc in documents]
+        self.vectors = vectors
+        self.nodes: Dict[str, GraphNode] = {node.id: node for node in nodes}
+        self.edges: Dict[Tuple[str, str], GraphEdge] = {}
+        self.adjacency: Dict[str, set] = {doc_id: set() for doc_id in self.ids}
+        for edge in edges:
+            self.add_edge(edge)
+
+    def add_edge(self, edge: GraphEdge):
+        self.edges[(edge.source, edge.target)] = edge
+        self.adjacency[edge.source].add(edge.target)
+        self.adjacency[edge.target].add(edge.source)
+
+    def remove_node(self, doc_id: str) -> bool:
+        """노드와 연결된 엣지 제거"""
+        if doc_id not in self.nodes:
+            return False
+
+        for neighbor in self.adjacency.pop(doc_id):
+            self.adjacency[neighbor].discard(doc_id)
+            self.edges.pop(tuple(sorted((doc_id, neighbor))), None)
+
+        row = self.ids.index(doc_id)
+        del self.ids[row]
+        del self.metadatas[row]
+        self.vectors = np.delete(self.vectors, row, axis=0)
+        del self.nodes[doc_id]
+        return True
+
+    def nbytes(self) -> int:
+        """캐시 메모리 추정치 (벡터 행렬 + 노드/엣지 객체 평균 크기)"""
+        return (
+            self.vectors.nbytes
+            + len(self.nodes) * _NODE_BYTES
+            + len(self.edges) * _EDGE_BYTES
+        )
+
+    def to_graph_data(self, min_similarity: float) -> GraphData:
+        """min_similarity 이상 엣지만 포함한 GraphData (통계는 필터 결과 기준)"""
+        edges = [
+            edge for edge in self.edges.values()
+            if edge.weight >= min_similarity
+        ]
+        return GraphData(
+            nodes=list(self.nodes.values()),
+            edges=edges,
+            metadata=_graph_metadata(len(self.nodes), len(edges))
+        )
+
+
 class GraphService:
     """그래프 데이터 생성 서비스"""
 
     def __init__(self):
+        self.settings = get_settings()
         self.vector_db = get_vector_db()
-        self._cache: Optional[GraphData] = None  # 메모리 캐시
+        # (project, top_k) → GraphSnapshot (LRU + TTL + 메모리 상한)
+        self._cache: TTLCache[GraphSnapshot] = TTLCache(
+            max_entries=self.settings.graph_cache_max_entries,
+            ttl_seconds=self.settings.graph_cache_ttl_seconds,
+            max_bytes=self.settings.graph_cache_max_bytes,
+            sizeof=lambda snapshot: snapshot.nbytes()
+        )
+        # 진행 중인 빌드 (같은 키의 동시 요청은 하나의 빌드를 공유)
+        self._inflight: Dict[Tuple[Optional[str], int], asyncio.Future] = {}
+        self.builds = 0
 
     async def get_graph_data(
         self,
@@ -33,217 +173,406 @@ class GraphService:
         """
         logger.info(f"Getting graph data - project: {project}, min_similarity: {min_similarity}, top_k: {top_k}")
 
-        # 캐시 체크 (프로젝트 필터 없을 때만)
-        if self._cache and not project:
+        # 캐시 체크 ((project, top_k) 키)
+        # 캐시보다 낮은 min_similarity는 빠진 엣지가 있으므로 재계산
+        key = (project, top_k)
+        snapshot = self._cache.get(key)
+        if snapshot is not None and min_similarity >= snapshot.min_similarity:
             logger.info("Returning cached graph data")
             # min_similarity 필터링만 적용
-            return self._filter_by_similarity(self._cache, min_similarity)
+            return snapshot.to_graph_data(min_similarity)
+
+        snapshot = await self._build_single_flight(key, min_similarity)
+        return snapshot.to_graph_data(min_similarity)
 
-        # 1. Pinecone에서 모든 문서 가져오기
-        documents = self.vector_db.get_all_documents(project=project, limit=top_k)
+    async def _build_single_flight(
+        self,
+        key: Tuple[Optional[str], int],
+        min_similarity: float
+    ) -> GraphSnapshot:
+        """같은 키의 빌드가 진행 중이면 그 결과를 기다리고, 없으면 직접 빌드"""
+        while key in self._inflight:
+            inflight = self._inflight[key]
+            try:
+                snapshot = await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():  # 이 요청 자체가 취소됨
+                    raise
+                continue  # 빌드하던 요청이 취소됨 → 다시 확인 후 직접 빌드
+            if min_similarity >= snapshot.min_similarity:
+                return snapshot
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            snapshot = await self._build_snapshot(key[0], key[1], min_similarity)
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # 대기자가 없어도 경고가 남지 않도록 소비 처리
+            raise
+        else:
+            future.set_result(snapshot)
+            return snapshot
+        finally:
+            # 취소(CancelledError)로 빠져나가면 대기자가 멈추지 않도록 future도 취소
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    async def _build_snapshot(
+        self,
+        project: Optional[str],
+        top_k: int,
+        min_similarity: float
+    ) -> GraphSnapshot:
+        """그래프 전체 계산 후 캐시에 저장"""
+        self.builds += 1
+        corpus_version = get_corpus_version()
+
+        # 1. 벡터 DB에서 모든 문서 가져오기 (저장된 벡터 포함)
+        documents = await self.vector_db.aget_all_documents(
+            project=project,
+            limit=top_k,
+            include_values=True
+        )
 
         if not documents:
             logger.warning("No documents found")
-            return GraphData(nodes=[], edges=[], metadata={
-                "total_nodes": 0,
-                "total_edges": 0,
-                "avg_connections_per_node": 0.0
-            })
 
         # 2. GraphNode 변환
-        nodes = []
-        for doc in documents:
-            metadata = doc["metadata"]
-            node = GraphNode(
-                id=doc["id"],
-                label=metadata.get("summary", "")[:50],  # 라벨은 요약 50자
-                summary=metadata.get("summary", ""),
-                keywords=metadata.get("keywords", []),
-                project=metadata.get("project", ""),
-                created_at=datetime.fromisoformat(metadata.get("created_at", datetime.now().isoformat()))
-            )
-            nodes.append(node)
+        nodes = [self._to_node(doc) for doc in documents]
+
+        # 3. 엣지 계산 (벡터화된 코사인 유사도 행렬)
+        vectors = self._normalized_vectors(documents)
+        edges = self._compute_edges(documents, min_similarity, vectors) if documents else []
+
+        snapshot = GraphSnapshot(
+            project=project,
+            top_k=top_k,
+            min_similarity=min_similarity,
+            documents=documents,
+            vectors=vectors,
+            nodes=nodes,
+            edges=edges
+        )
 
-        # 3. 엣지 계산 (비동기 병렬 처리)
-        edges = await self._compute_edges(documents, min_similarity)
+        # 빌드 도중 문서가 추가/삭제되었으면 증분 갱신을 놓쳤으므로 캐시하지 않음
+        if corpus_version == get_corpus_version():
+            self._cache.set((project, top_k), snapshot)
+            logger.info(f"Graph data cached - project: {project}, top_k: {top_k}")
 
-        # 4. 메타데이터 계산
-        total_edges = len(edges)
-        avg_connections = (total_edges * 2) / len(nodes) if nodes else 0.0
+        return snapshot
 
-        metadata = {
-            "total_nodes": len(nodes),
-            "total_edges": total_edges,
-            "avg_connections_per_node": round(avg_connections, 2)
-        }
+    def add_document(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ):
+        """새 문서를 캐시된 모든 그래프에 증분 추가 (그래프당 O(N))"""
+        for key, snapshot in self._cache.items():
+            if self._add_to_snapshot(snapshot, doc_id, embedding, metadata):
+                self._cache.update_size(key)
+
+    def _add_to_snapshot(
+        self,
+        snapshot: GraphSnapshot,
+        doc_id: str,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """새 노드와 기존 노드 사이의 엣지만 계산하여 추가
+
+        프로젝트가 다르거나 노드 수가 top_k에 도달한 그래프는 건너뜁니다.
+        """
+        if doc_id in snapshot.nodes:
+            return False
+        if snapshot.project and metadata.get("project") != snapshot.project:
+            return False
+        if len(snapshot.nodes) >= snapshot.top_k:
+            return False
+
+        document = {"id": doc_id, "values": embedding, "metadata": metadata}
+        vector = self._normalized_vectors([document])
+
+        if snapshot.ids:
+            similarity = vector @ snapshot.vectors.T
+            same_project, common_keywords = self._metadata_overlap([metadata], snapshot.metadatas)
+            weights, boosts = self._edge_weights(similarity, same_project, common_keywords)
+            neighbors = np.flatnonzero(weights[0] >= snapshot.min_similarity)
+        else:
+            neighbors = np.array([], dtype=np.int64)
 
-        graph_data = GraphData(nodes=nodes, edges=edges, metadata=metadata)
+        snapshot.nodes[doc_id] = self._to_node(document)
+        snapshot.adjacency[doc_id] = set()
+        for j in neighbors.tolist():
+            source, target = sorted((doc_id, snapshot.ids[j]))
+            snapshot.add_edge(GraphEdge(
+                source=source,
+                target=target,
+                weight=round(float(weights[0, j]), 4),
+                edge_type=self._edge_type(float(boosts[0, j]))
+            ))
+
+        snapshot.ids.append(doc_id)
+        snapshot.metadatas.append(metadata)
+        snapshot.vectors = (
+            np.vstack([snapshot.vectors, vector]) if len(snapshot.vectors) else vector
+        )
+        logger.info(f"Graph cache: added node {doc_id} with {len(neighbors)} edges")
+        return True
 
-        # 캐시 저장 (프로젝트 필터 없을 때만)
-        if not project:
-            self._cache = graph_data
-            logger.info("Graph data cached")
+    def remove_document(self, doc_id: str):
+        """삭제된 문서의 노드와 엣지를 캐시된 모든 그래프에서 제거"""
+        for key, snapshot in self._cache.items():
+            if snapshot.remove_node(doc_id):
+                self._cache.update_size(key)
+                logger.info(f"Graph cache: removed node {doc_id} from {key}")
 
-        return graph_data
+    async def stream_knn_graph(
+        self,
+        project: Optional[str] = None,
+        limit: int = 10000,
+        k: int = 10,
+        min_similarity: float = 0.5
+    ) -> Iterator[str]:
+        """대규모 코퍼스용 희소 k-NN 그래프 (NDJSON 라인 스트림)
+
+        문서를 가져온 뒤, 노드/엣지를 한 줄씩 생성하는 동기 이터레이터를 반환합니다.
+        (StreamingResponse가 스레드 풀에서 순회하므로 이벤트 루프를 막지 않음)
+        """
+        logger.info(f"Building k-NN graph - project: {project}, limit: {limit}, k: {k}, min_similarity: {min_similarity}")
+
+        # 페이지 단위로 가져오면서 벡터는 바로 float32 행렬 블록으로 변환
+        # (원본 float 리스트를 코퍼스 전체만큼 쌓아두지 않음)
+        documents: List[Dict[str, Any]] = []
+        blocks: List[np.ndarray] = []
+        async for batch in self.vector_db.aiter_document_batches(
+            project=project,
+            batch_size=self.settings.graph_fetch_batch_size,
+            include_values=True
+        ):
+            batch = batch[:limit - len(documents)]
+            blocks.append(self._normalized_vectors(batch))
+            for doc in batch:
+                doc.pop("values", None)
+            documents.extend(batch)
+            if len(documents) >= limit:
+                break
+
+        vectors = (
+            np.vstack(blocks) if blocks
+            else np.zeros((0, self.settings.embedding_dimension), dtype=np.float32)
+        )
+        return self._iter_knn_graph(documents, vectors, k, min_similarity)
 
-    async def _compute_edges(
+    def _iter_knn_graph(
         self,
         documents: List[Dict[str, Any]],
+        vectors: np.ndarray,
+        k: int,
         min_similarity: float
+    ) -> Iterator[str]:
+        """k-NN 그래프 NDJSON 라인 생성
+
+        각 라인은 {"type": "node" | "edge" | "metadata", "data": {...}} 형식입니다.
+        노드마다 벡터 코사인 유사도 상위 k개 이웃을 후보로 잡고, 기존 그래프와 같은
+        하이브리드 가중치(프로젝트/키워드 부스트)가 min_similarity 이상인 엣지만 내보냅니다.
+        """
+        for doc in documents:
+            yield ndjson_line("node", self._to_node(doc).model_dump(mode="json"))
+
+        ids = [doc["id"] for doc in documents]
+        metadatas = [doc["metadata"] for doc in documents]
+        project_codes: Dict[Any, int] = {}
+        projects = np.array(
+            [project_codes.setdefault(m.get("project"), len(project_codes)) for m in metadatas],
+            dtype=np.int32
+        )
+        keywords = [set(m.get("keywords", [])) for m in metadatas]
+
+        seen = set()
+        total_edges = 0
+        for rows, cols, similarity in iter_knn_pairs(
+            vectors,
+            k,
+            max_block_bytes=get_settings().graph_knn_max_block_bytes
+        ):
+            # 양방향 중복 제거 (작은 인덱스 기준)
+            low = np.minimum(rows, cols)
+            high = np.maximum(rows, cols)
+
+            same_project = projects[rows] == projects[cols]
+            common_keywords = np.fromiter(
+                (len(keywords[i] & keywords[j]) for i, j in zip(rows.tolist(), cols.tolist())),
+                dtype=np.float32,
+                count=len(rows)
+            )
+            weights, boosts = self._edge_weights(similarity, same_project, common_keywords)
+
+            for i, j, weight, boost in zip(
+                low.tolist(), high.tolist(), weights.tolist(), boosts.tolist()
+            ):
+                if weight < min_similarity or (i, j) in seen:
+                    continue
+                seen.add((i, j))
+                source, target = sorted((ids[i], ids[j]))
+                total_edges += 1
+                yield ndjson_line("edge", {
+                    "source": source,
+                    "target": target,
+                    "weight": round(weight, 4),
+                    "edge_type": self._edge_type(boost)
+                })
+
+        logger.info(f"k-NN graph built - nodes: {len(documents)}, edges: {total_edges}")
+        yield ndjson_line("metadata", {
+            **_graph_metadata(len(documents), total_edges),
+            "k": k
+        })
+
+    def _to_node(self, doc: Dict[str, Any]) -> GraphNode:
+        """문서를 GraphNode로 변환"""
+        metadata = doc["metadata"]
+        return GraphNode(
+            id=doc["id"],
+            label=metadata.get("summary", "")[:50],  # 라벨은 요약 50자
+            summary=metadata.get("summary", ""),
+            keywords=metadata.get("keywords", []),
+            project=metadata.get("project", ""),
+            created_at=datetime.fromisoformat(metadata.get("created_at", datetime.now().isoformat()))
+        )
+
+    def _compute_edges(
+        self,
+        documents: List[Dict[str, Any]],
+        min_similarity: float,
+        vectors: Optional[np.ndarray] = None
     ) -> List[GraphEdge]:
-        """모든 문서 쌍의 엣지 계산 (비동기 병렬 처리)
+        """모든 문서 쌍의 엣지 계산
 
-        각 문서에 대해 Pinecone query로 유사 문서를 찾아 엣지 생성
+        저장된 임베딩으로 코사인 유사도 행렬을 한 번의 행렬 곱으로 구하고,
+        프로젝트/키워드 부스트를 더한 뒤 min_similarity 이상인 쌍만 마스크로 추출합니다.
         """
         logger.info(f"Computing edges for {len(documents)} documents")
 
-        # 문서 ID를 키로 하는 맵 생성
-        doc_map = {doc["id"]: doc for doc in documents}
-
-        # 엣지 저장 (중복 방지를 위해 set 사용)
-        edge_dict: Dict[Tuple[str, str], Tuple[float, str]] = {}
+        ids = [doc["id"] for doc in documents]
+        metadatas = [doc["metadata"] for doc in documents]
 
-        # 각 문서에 대해 비동기로 유사 문서 검색
-        tasks = []
-        for doc in documents:
-            task = self._find_similar_for_doc(doc, doc_map, min_similarity)
-            tasks.append(task)
+        # 1. 벡터 유사도 (N x N)
+        if vectors is None:
+            vectors = self._normalized_vectors(documents)
+        vector_similarity = vectors @ vectors.T
 
-        # 병렬 실행
-        results = await asyncio.gather(*tasks)
+        # 2. 메타데이터 부스트 (N x N)
+        same_project, common_keywords = self._metadata_overlap(metadatas, metadatas)
+        weights, boosts = self._edge_weights(vector_similarity, same_project, common_keywords)
 
-        # 결과 병합
-        for doc_edges in results:
-            for (source, target), (weight, edge_type) in doc_edges.items():
-                # 중복 방지: 항상 작은 ID가 source
-                pair = tuple(sorted([source, target]))
-                if pair not in edge_dict or edge_dict[pair][0] < weight:
-                    edge_dict[pair] = (weight, edge_type)
+        # 3. 상삼각 영역에서 min_similarity 이상인 쌍 추출 (자기 자신/중복 제외)
+        mask = np.triu(weights >= min_similarity, k=1)
+        rows, cols = np.nonzero(mask)
 
-        # GraphEdge 객체 생성
         edges = []
-        for (source, target), (weight, edge_type) in edge_dict.items():
-            edge = GraphEdge(
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            # 중복 방지: 항상 작은 ID가 source
+            source, target = sorted((ids[i], ids[j]))
+            edges.append(GraphEdge(
                 source=source,
                 target=target,
-                weight=round(weight, 4),
-                edge_type=edge_type
-            )
-            edges.append(edge)
+                weight=round(float(weights[i, j]), 4),
+                edge_type=self._edge_type(float(boosts[i, j]))
+            ))
 
         logger.info(f"Computed {len(edges)} edges")
         return edges
 
-    async def _find_similar_for_doc(
-        self,
-        doc: Dict[str, Any],
-        doc_map: Dict[str, Dict[str, Any]],
-        min_similarity: float
-    ) -> Dict[Tuple[str, str], Tuple[float, str]]:
-        """특정 문서와 유사한 문서 찾기
-
-        Pinecone에 저장된 임베딩이 없으면 스킵
-        """
-        edges = {}
-
-        # Pinecone에서 유사 문서 검색
-        # 더미 벡터로 검색 (실제로는 임베딩이 저장되어 있음)
-        # 하지만 Pinecone query는 벡터가 필요하므로, 우회 방법 사용
-
-        # 방법: 각 문서의 임베딩을 이미 Pinecone에 저장했으므로
-        # 동일한 쿼리를 다시 실행하여 유사도 확인
-        # 하지만 query_vector가 필요함 -> 문제!
-
-        # 해결책: 모든 문서 쌍을 비교 (O(N^2))
-        # 문서 수가 50-100개 수준이면 허용 가능
-        doc_id = doc["id"]
-        doc_metadata = doc["metadata"]
-
-        for other_id, other_doc in doc_map.items():
-            if doc_id == other_id:
-                continue
-
-            other_metadata = other_doc["metadata"]
-
-            # 메타데이터 기반 유사도 계산
-            # (벡터 유사도 없이 메타데이터만 사용)
-            weight, edge_type = self._calculate_edge_weight(
-                doc_metadata,
-                other_metadata,
-                vector_similarity=0.5  # 기본값 (실제 벡터 유사도 없음)
-            )
-
-            if weight >= min_similarity:
-                edges[(doc_id, other_id)] = (weight, edge_type)
+    def _normalized_vectors(self, documents: List[Dict[str, Any]]) -> np.ndarray:
+        """저장된 벡터를 L2 정규화한 float32 행렬 (벡터 없는 문서는 0 벡터)"""
+        dimension = next(
+            (len(doc["values"]) for doc in documents if doc.get("values")),
+            self.settings.embedding_dimension
+        )
+        if all(doc.get("values") for doc in documents):
+            vectors = np.array([doc["values"] for doc in documents], dtype=np.float32)
+        else:
+            vectors = np.zeros((len(documents), dimension), dtype=np.float32)
+            for i, doc in enumerate(documents):
+                if doc.get("values"):
+                    vectors[i] = doc["values"]
 
-        return edges
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.divide(vectors, norms, out=vectors, where=norms > 0)
+        return vectors
 
-    def _calculate_edge_weight(
+    def _metadata_overlap(
+        self,
+        left: List[Dict[str, Any]],
+        right: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """같은 프로젝트 여부와 공통 키워드 수 행렬 (len(left) x len(right))"""
+        # 프로젝트 이름 → 정수 코드 (object 배열 비교보다 훨씬 빠름)
+        project_codes: Dict[Any, int] = {}
+        left_projects = np.array(
+            [project_codes.setdefault(m.get("project"), len(project_codes)) for m in left],
+            dtype=np.int32
+        )
+        right_projects = np.array(
+            [project_codes.setdefault(m.get("project"), len(project_codes)) for m in right],
+            dtype=np.int32
+        )
+        same_project = left_projects[:, None] == right_projects[None, :]
+
+        # 키워드 → 열 인덱스 (양쪽 모두에 나타나는 키워드만 의미 있음)
+        left_keywords = [set(m.get("keywords", [])) for m in left]
+        right_keywords = [set(m.get("keywords", [])) for m in right]
+        shared = set().union(*left_keywords) & set().union(*right_keywords) if left and right else set()
+        vocabulary = {keyword: k for k, keyword in enumerate(shared)}
+
+        def incidence(keyword_sets: List[set]) -> np.ndarray:
+            matrix = np.zeros((len(keyword_sets), len(vocabulary)), dtype=np.float32)
+            for i, keywords in enumerate(keyword_sets):
+                for keyword in keywords:
+                    k = vocabulary.get(keyword)
+                    if k is not None:
+                        matrix[i, k] = 1.0
+            return matrix
+
+        common_keywords = incidence(left_keywords) @ incidence(right_keywords).T
+        return same_project, common_keywords
+
+    def _edge_weights(
         self,
-        doc1_metadata: Dict[str, Any],
-        doc2_metadata: Dict[str, Any],
-        vector_similarity: float
-    ) -> Tuple[float, str]:
-        """하이브리드 엣지 가중치 계산
+        vector_similarity: np.ndarray,
+        same_project: np.ndarray,
+        common_keywords: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """하이브리드 엣지 가중치 계산 (벡터화)
 
-        Args:
-            doc1_metadata: 문서1 메타데이터
-            doc2_metadata: 문서2 메타데이터
-            vector_similarity: 벡터 유사도 (0.0 ~ 1.0)
+        - 기본: 벡터 코사인 유사도 (0.0 ~ 1.0로 클리핑)
+        - 같은 프로젝트: +0.15
+        - 공통 키워드: +0.05 per keyword (최대 +0.15)
 
         Returns:
-            (가중치, 엣지 타입)
+            (최종 가중치, 메타데이터 부스트)
         """
-        base_weight = vector_similarity
-        metadata_boost = 0.0
-
-        # 1. 같은 프로젝트: +0.15
-        if doc1_metadata.get("project") == doc2_metadata.get("project"):
-            metadata_boost += 0.15
-
-        # 2. 공통 키워드: +0.05 per keyword (최대 +0.15)
-        keywords1 = set(doc1_metadata.get("keywords", []))
-        keywords2 = set(doc2_metadata.get("keywords", []))
-        common_keywords = keywords1 & keywords2
-        keyword_boost = min(len(common_keywords) * 0.05, 0.15)
-        metadata_boost += keyword_boost
-
-        # 최종 가중치
-        final_weight = min(base_weight + metadata_boost, 1.0)
-
-        # 엣지 타입 결정
-        if metadata_boost > 0.1:
-            edge_type = "hybrid"
-        elif metadata_boost > 0:
-            edge_type = "metadata"
-        else:
-            edge_type = "vector"
+        metadata_boost = same_project * np.float32(0.15)
+        metadata_boost = metadata_boost + np.minimum(common_keywords * np.float32(0.05), np.float32(0.15))
 
-        return final_weight, edge_type
+        base_weight = np.clip(vector_similarity, 0.0, 1.0)
+        final_weight = np.minimum(base_weight + metadata_boost, 1.0)
+        return final_weight, metadata_boost
 
-    def _filter_by_similarity(
-        self,
-        graph_data: GraphData,
-        min_similarity: float
-    ) -> GraphData:
-        """캐시된 그래프 데이터에서 min_similarity 필터링"""
-        filtered_edges = [
-            edge for edge in graph_data.edges
-            if edge.weight >= min_similarity
-        ]
-
-        return GraphData(
-            nodes=graph_data.nodes,
-            edges=filtered_edges,
-            metadata={
-                **graph_data.metadata,
-                "total_edges": len(filtered_edges)
-            }
-        )
+    def _edge_type(self, metadata_boost: float) -> str:
+        """엣지 타입 결정 (float32 부스트의 반올림 오차는 허용)"""
+        if metadata_boost > 0.1 + 1e-6:
+            return "hybrid"
+        elif metadata_boost > 1e-6:
+            return "metadata"
+        return "vector"
 
     def invalidate_cache(self):
-        """캐시 무효화 (문서 업데이트 시 호출)"""
-        self._cache = None
+        """캐시 무효화 (모든 키)"""
+        self._cache.clear()
         logger.info("Graph cache invalidated")
 
 
@@ -0,0 +1,418 @@
+"""
+백그라운드 작업 큐 (SQLite 영속 + asyncio 워커 풀)
+
+업로드 요청은 작업을 기록하고 바로 job id를 돌려받습니다.
+워커(ingest_workers개)가 순서대로 작업을 꺼내 실행하고 진행률/결과를 기록합니다.
+
+- 작업 payload는 SQLite에 저장되므로 대기 중인 작업이 많아도 메모리를 차지하지 않습니다.
+- 작업을 꺼낸 워커는 owner와 lease 만료 시각을 기록하고 heartbeat로 lease를 갱신합니다.
+  lease가 만료된 running 작업(프로세스가 중단된 경우)만 다시 대기시키므로,
+  같은 큐 파일을 쓰는 다른 프로세스가 실행 중인 작업을 가져가지 않습니다.
+  (max_attempts번 중단된 작업은 실패 처리)
+- 일괄 작업은 배치마다 체크포인트를 기록하고, 다시 실행되면 마지막 체크포인트부터 이어서 처리합니다.
+- 끝난 작업은 payload를 지우고 결과만 남기며, job_retention_seconds 이후 정리합니다.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+from app.services.document_service import get_document_service
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+# (완료 수, 체크포인트) 보고 함수, (payload, 보고 함수, 마지막 체크포인트) → 결과 dict
+ProgressCallback = Callable[[int, Optional[Dict[str, Any]]], Awaitable[None]]
+JobHandler = Callable[
+    [Dict[str, Any], ProgressCallback, Optional[Dict[str, Any]]],
+    Awaitable[Dict[str, Any]]
+]
+
+_COLUMNS = (
+    "id", "kind", "status", "total", "completed", "attempts",
+    "result", "error", "created_at", "started_at", "finished_at"
+)
+
+# 이전 버전 큐 파일에 없는 컬럼 (시작 시 추가)
+_ADDED_COLUMNS = {"owner": "TEXT", "lease_expires_at": "REAL", "checkpoint": "TEXT"}
+
+
+class LeaseLost(Exception):
+    """lease가 만료되어 다른 워커가 작업을 가져감 (진행률/결과를 기록하지 않음)"""
+
+
+class JobQueue:
+    """영속 작업 큐 + 워커 풀"""
+
+    def __init__(
+        self,
+        path: str,
+        handlers: Dict[str, JobHandler],
+        workers: int = 2,
+        retention_seconds: float = 7 * 24 * 3600,
+        max_attempts: int = 3,
+        lease_seconds: float = 60.0
+    ):
+        self.path = path
+        self.handlers = handlers
+        self.workers = workers
+        self.retention_seconds = retention_seconds
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        # 이 프로세스의 워커가 꺼낸 작업에 기록하는 owner
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        self._pending: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+            "payload TEXT, total INTEGER NOT NULL, completed INTEGER NOT NULL DEFAULT 0, "
+            "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+            "created_at TEXT NOT NULL, started_at TEXT, finished_at TEXT, "
+            "owner TEXT, lease_expires_at REAL, checkpoint TEXT)"
+        )
+        existing = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, column_type in _ADDED_COLUMNS.items():
+            if column not in existing:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {column_type}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)")
+        self._conn.commit()
+
+    # SQLite 기록 (동기, 공유 스레드 풀에서 호출)
+
+    def _now(self) -> str:
+        return datetime.utcnow().isoformat()
+
+    def create(self, kind: str, payload: Dict[str, Any], total: int) -> Dict[str, Any]:
+        """작업 기록 (queued)"""
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        job_id = str(uuid.uuid4())
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, total, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, kind, QUEUED, json.dumps(payload, ensure_ascii=False), total, self._now())
+            )
+            self._conn.commit()
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """작업 상태 (payload 제외, result는 dict로 변환)"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(zip(_COLUMNS, row))
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def _lease_deadline(self) -> float:
+        return time.time() + self.lease_seconds
+
+    def _claim(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """queued → running 전환 (owner/lease 기록) 후 payload와 체크포인트 반환
+
+        이미 다른 워커가 가져갔거나 끝난 작업이면 None
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, attempts = attempts + 1, "
+                "owner = ?, lease_expires_at = ? WHERE id = ? AND status = ?",
+                (RUNNING, self._now(), self.owner, self._lease_deadline(), job_id, QUEUED)
+            )
+            self._conn.commit()
+            if cursor.rowcount == 0:
+                return None
+            row = self._conn.execute(
+                "SELECT kind, payload, checkpoint FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        kind, payload, checkpoint = row
+        return {
+            "kind": kind,
+            "payload": json.loads(payload),
+            "checkpoint": json.loads(checkpoint) if checkpoint else None,
+        }
+
+    def _renew(self, job_id: str) -> bool:
+        """lease 연장 (이 워커가 더 이상 owner가 아니면 False)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND owner = ? AND status = ?",
+                (self._lease_deadline(), job_id, self.owner, RUNNING)
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _set_progress(
+        self,
+        job_id: str,
+        completed: int,
+        checkpoint: Optional[Dict[str, Any]] = None
+    ) -> bool:
+        """진행률 + 체크포인트 기록 (lease도 연장, owner가 아니면 False)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET completed = ?, checkpoint = COALESCE(?, checkpoint), lease_expires_at = ? "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (
+                    completed,
+                    json.dumps(checkpoint, ensure_ascii=False) if checkpoint is not None else None,
+                    self._lease_deadline(),
+                    job_id,
+                    self.owner,
+                    RUNNING
+                )
+            )
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _finish(
+        self,
+        job_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None
+    ) -> bool:
+        """완료 기록 (payload/체크포인트는 삭제, owner가 아니면 기록하지 않고 False)"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+                "payload = NULL, checkpoint = NULL, lease_expires_at = NULL "
+                "WHERE id = ? AND owner = ? AND status = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False) if result is not None else None,
+                    error,
+                    self._now(),
+                    job_id,
+                    self.owner,
+                    RUNNING
+                )
+            )
+            if cursor.rowcount and status == SUCCEEDED:
+                self._conn.execute("UPDATE jobs SET completed = total WHERE id = ?", (job_id,))
+            self._conn.commit()
+        return cursor.rowcount > 0
+
+    def _recover(self) -> List[str]:
+        """lease가 만료된 running 작업을 다시 대기시키고 그 작업 ID 반환
+
+        lease가 없는 running 작업(이전 버전에서 중단된 작업)도 만료된 것으로 봅니다.
+        max_attempts번 실행된 작업은 실패 처리하고, 보관 기간이 지난 끝난 작업은 삭제합니다.
+        """
+        cutoff = (datetime.utcnow() - timedelta(seconds=self.retention_seconds)).isoformat()
+        expired = "status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?)"
+        now = time.time()
+        with self._lock:
+            exhausted = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, payload = NULL, "
+                f"checkpoint = NULL, lease_expires_at = NULL WHERE {expired} AND attempts >= ?",
+                (FAILED, "Interrupted too many times", self._now(), RUNNING, now, self.max_attempts)
+            ).rowcount
+            job_ids = [
+                job_id for (job_id,) in self._conn.execute(
+                    f"SELECT id FROM jobs WHERE {expired} ORDER BY created_at", (RUNNING, now)
+                ).fetchall()
+            ]
+            self._conn.executemany(
+                f"UPDATE jobs SET status = ?, owner = NULL, lease_expires_at = NULL WHERE id = ? AND {expired}",
+                [(QUEUED, job_id, RUNNING, now) for job_id in job_ids]
+            )
+            purged = self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND finished_at < ?",
+                (SUCCEEDED, FAILED, cutoff)
+            ).rowcount
+            self._conn.commit()
+
+        if job_ids or exhausted or purged:
+            logger.info(
+                f"Job queue recovered - interrupted: {len(job_ids)}, "
+                f"failed: {exhausted}, purged: {purged}"
+            )
+        return job_ids
+
+    def _queued(self) -> List[str]:
+        """대기 중인 작업 ID (등록 순서)"""
+        with self._lock:
+            return [
+                job_id for (job_id,) in self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+                ).fetchall()
+            ]
+
+    def _release(self) -> int:
+        """이 프로세스가 실행 중이던 작업을 다시 대기시킴 (정상 종료 시 lease 만료를 기다리지 않도록)"""
+        with self._lock:
+            released = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = NULL, lease_expires_at = NULL "
+                "WHERE owner = ? AND status = ?",
+                (QUEUED, self.owner, RUNNING)
+            ).rowcount
+            self._conn.commit()
+        return released
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"workers": self.workers, **{status: count for status, count in rows}}
+
+    # 워커 풀
+
+    async def start(self):
+        """lease 만료 작업 복구 후 워커 시작 (앱 시작 시 1회)"""
+        if self._pending is not None:
+            return
+        self._pending = asyncio.Queue()
+        await run_blocking(self._recover)
+        for job_id in await run_blocking(self._queued):
+            self._pending.put_nowait(job_id)
+        self._tasks = [
+            asyncio.create_task(self._worker(number))
+            for number in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._reaper()))
+        logger.info(f"Job workers started - workers: {self.workers}, owner: {self.owner}")
+
+    async def stop(self):
+        """워커 중지 (실행 중이던 작업은 다시 대기시켜 다음 시작 시 체크포인트부터 실행)"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._pending = None
+        released = await run_blocking(self._release)
+        if released:
+            logger.info(f"Job workers stopped - released {released} running jobs")
+
+    async def _reaper(self):
+        """lease가 만료된 작업(다른 프로세스가 중단된 경우 포함)을 주기적으로 다시 대기열에 추가"""
+        while True:
+            await asyncio.sleep(self.lease_seconds)
+            try:
+                for job_id in await run_blocking(self._recover):
+                    self._pending.put_nowait(job_id)
+            except Exception as e:
+                logger.error(f"Job reaper error: {e}")
+
+    async def _heartbeat(self, job_id: str, handler: asyncio.Task):
+        """실행 중 lease 갱신 (owner를 잃으면 핸들러 취소)"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                renewed = await run_blocking(self._renew, job_id)
+            except Exception as e:  # 일시적인 SQLite 오류는 다음 주기에 다시 시도
+                logger.error(f"Job {job_id} heartbeat error: {e}")
+                continue
+            if not renewed:
+                logger.warning(f"Job {job_id} lease lost, cancelling")
+                handler.cancel()
+                return
+
+    async def submit(self, kind: str, payload: Dict[str, Any], total: int) -> Dict[str, Any]:
+        """작업 기록 후 대기열에 추가"""
+        await self.start()
+        job = await run_blocking(self.create, kind, payload, total)
+        self._pending.put_nowait(job["id"])
+        logger.info(f"Job {job['id']} queued ({kind}, {total} documents)")
+        return job
+
+    async def aget(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return await run_blocking(self.get, job_id)
+
+    async def _worker(self, number: int):
+        while True:
+            job_id = await self._pending.get()
+            try:
+                claimed = await run_blocking(self._claim, job_id)
+                if claimed is None:
+                    continue
+                await self._run(job_id, claimed["kind"], claimed["payload"], claimed["checkpoint"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker {number} error on {job_id}: {e}")
+            finally:
+                self._pending.task_done()
+
+    async def _run(
+        self,
+        job_id: str,
+        kind: str,
+        payload: Dict[str, Any],
+        checkpoint: Optional[Dict[str, Any]] = None
+    ):
+        async def report_progress(completed: int, checkpoint: Optional[Dict[str, Any]] = None):
+            if not await run_blocking(self._set_progress, job_id, completed, checkpoint):
+                raise LeaseLost(job_id)
+
+        logger.info(f"Job {job_id} started ({kind}{', resuming from checkpoint' if checkpoint else ''})")
+        handler = asyncio.create_task(self.handlers[kind](payload, report_progress, checkpoint))
+        heartbeat = asyncio.create_task(self._heartbeat(job_id, handler))
+        try:
+            result = await handler
+        except asyncio.CancelledError:
+            if heartbeat.done():  # lease를 잃어 heartbeat가 핸들러를 취소함 (워커는 계속 실행)
+                return
+            raise
+        except LeaseLost:
+            logger.warning(f"Job {job_id} lease lost, dropping progress")
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            await run_blocking(self._finish, job_id, FAILED, None, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        if await run_blocking(self._finish, job_id, SUCCEEDED, result):
+            logger.info(f"Job {job_id} succeeded")
+        else:
+            logger.warning(f"Job {job_id} finished after losing its lease, result dropped")
+
+
+async def _run_ingest(
+    payload: Dict[str, Any],
+    report_progress: ProgressCallback,
+    checkpoint: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    return await get_document_service().run_ingest_job(payload, report_progress, checkpoint)
+
+
+# 싱글톤 인스턴스
+_job_queue = None
+
+
+def get_job_queue() -> JobQueue:
+    global _job_queue
+    if _job_queue is None:
+        settings = get_settings()
+        _job_queue = JobQueue(
+            path=settings.job_queue_path,
+            handlers={"ingest": _run_ingest},
+            workers=settings.ingest_workers,
+            retention_seconds=settings.job_retention_seconds,
+            lease_seconds=settings.job_lease_seconds
+        )
+    return _job_queue
@@ -0,0 +1,232 @@
+"""
+BM25 역색인 (하이브리드 검색의 어휘 검색 부분)
+
+- 토큰화: 영문/숫자는 단어 단위, 한글/한자/가나는 글자 bigram
+  ("사과를" → "사과", "과를")이라 조사가 붙어도 어간이 매칭됩니다.
+- 필드: summary, content(원문)를 따로 색인하여 검색 범위별로 점수를 계산
+- 저장: 문서별 term frequency를 SQLite에 기록하고, 시작 시 메모리 역색인으로 복원
+
+문서 추가/삭제 시 해당 문서의 posting만 갱신합니다.
+"""
+
+from collections import Counter
+from typing import List, Dict, Any, Optional, Tuple
+import heapq
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+
+logger = logging.getLogger(__name__)
+
+_WORD = re.compile(r"[0-9a-z]+|[가-힣]+|[぀-ヿ一-鿿]+")
+
+# BM25 파라미터
+_K1 = 1.2
+_B = 0.75
+
+FIELDS = ("summary", "content")
+
+
+def tokenize(text: str) -> List[str]:
+    """BM25용 토큰화 (영문/숫자 단어 + CJK 글자 bigram)"""
+    tokens: List[str] = []
+    for word in _WORD.findall(text.lower()):
+        if word[0].isascii() or len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class _FieldIndex:
+    """한 필드의 역색인 (term → {doc_id: tf})"""
+
+    def __init__(self):
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.lengths: Dict[str, int] = {}
+        self.total_length = 0
+
+    def add(self, doc_id: str, terms: Dict[str, int]):
+        for term, tf in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = tf
+        length = sum(terms.values())
+        self.lengths[doc_id] = length
+        self.total_length += length
+
+    def remove(self, doc_id: str, terms: Dict[str, int]):
+        for term in terms:
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(doc_id, None)
+            if not posting:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(doc_id, 0)
+
+    def score(self, query_terms: List[str], scores: Dict[str, float]):
+        """query_terms의 BM25 점수를 scores에 누적"""
+        total_docs = len(self.lengths)
+        if not total_docs:
+            return
+        average_length = self.total_length / total_docs or 1.0
+
+        for term in query_terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1.0 + (total_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in posting.items():
+                norm = _K1 * (1.0 - _B + _B * self.lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (_K1 + 1.0) / (tf + norm)
+
+
+class LexicalIndex:
+    """요약/원문 BM25 색인"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._fields = {field: _FieldIndex() for field in FIELDS}
+        self._terms: Dict[str, Dict[str, Dict[str, int]]] = {}  # doc_id → field → tf
+        self._projects: Dict[str, Optional[str]] = {}
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS lexical_documents ("
+            "doc_id TEXT PRIMARY KEY, project TEXT, terms TEXT NOT NULL)"
+        )
+        self._conn.commit()
+        self._load()
+
+    def _load(self):
+        rows = self._conn.execute("SELECT doc_id, project, terms FROM lexical_documents").fetchall()
+        for doc_id, project, terms in rows:
+            self._index(doc_id, project, json.loads(terms))
+        logger.info(f"Lexical index loaded: {len(rows)} documents ({self.path})")
+
+    def _index(self, doc_id: str, project: Optional[str], terms: Dict[str, Dict[str, int]]):
+        self._unindex(doc_id)
+        for field in FIELDS:
+            self._fields[field].add(doc_id, terms.get(field, {}))
+        self._terms[doc_id] = terms
+        self._projects[doc_id] = project
+
+    def _unindex(self, doc_id: str):
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for field in FIELDS:
+            self._fields[field].remove(doc_id, terms.get(field, {}))
+        self._projects.pop(doc_id, None)
+
+    def add_documents(self, documents: List[Tuple[str, Optional[str], str, str]]):
+        """(doc_id, project, summary, full_text) 목록을 색인하고 한 트랜잭션으로 저장"""
+        rows = []
+        with self._lock:
+            for doc_id, project, summary, text in documents:
+                terms = {
+                    "summary": dict(Counter(tokenize(summary))),
+                    "content": dict(Counter(tokenize(text))),
+                }
+                self._index(doc_id, project, terms)
+                rows.append((doc_id, project, json.dumps(terms, ensure_ascii=False)))
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO lexical_documents (doc_id, project, terms) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
+
+    def remove_document(self, doc_id: str):
+        with self._lock:
+            self._unindex(doc_id)
+            self._conn.execute("DELETE FROM lexical_documents WHERE doc_id = ?", (doc_id,))
+            self._conn.commit()
+
+    def doc_ids(self) -> List[str]:
+        """색인된 문서 ID 목록"""
+        with self._lock:
+            return list(self._terms)
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        project: Optional[str] = None,
+        scope: str = "both"
+    ) -> List[Tuple[str, float]]:
+        """BM25 검색
+
+        Args:
+            query: 검색 쿼리
+            top_k: 최대 결과 개수
+            project: 프로젝트 필터
+            scope: summary/content/both (both면 두 필드 점수 합)
+
+        Returns:
+            (doc_id, score) 리스트 (점수 내림차순)
+        """
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+
+        fields = FIELDS if scope == "both" else (scope,)
+        scores: Dict[str, float] = {}
+        with self._lock:
+            for field in fields:
+                self._fields[field].score(query_terms, scores)
+            if project:
+                scores = {
+                    doc_id: score for doc_id, score in scores.items()
+                    if self._projects.get(doc_id) == project
+                }
+
+        return heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "documents": len(self._terms),
+                "terms": {field: len(index.postings) for field, index in self._fields.items()},
+            }
+
+    # 비동기 API: SQLite 기록이 있는 갱신은 공유 스레드 풀에서 실행
+
+    async def aadd_documents(self, documents: List[Tuple[str, Optional[str], str, str]]):
+        await run_blocking(self.add_documents, documents)
+
+    async def aremove_document(self, doc_id: str):
+        await run_blocking(self.remove_document, doc_id)
+
+    async def astats(self) -> Dict[str, Any]:
+        return await run_blocking(self.stats)
+
+    async def asearch(
+        self,
+        query: str,
+        top_k: int = 10,
+        project: Optional[str] = None,
+        scope: str = "both"
+    ) -> List[Tuple[str, float]]:
+        return await run_blocking(self.search, query, top_k, project, scope)
+
+
+# 싱글톤 인스턴스
+_lexical_index = None
+
+
+def get_lexical_index() -> LexicalIndex:
+    global _lexical_index
+    if _lexical_index is None:
+        _lexical_index = LexicalIndex(get_settings().lexical_index_path)
+    return _lexical_index
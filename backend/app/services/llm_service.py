@@ -1,62 +1,410 @@
 from langchain_openai import ChatOpenAI, OpenAIEmbeddings
-from langchain_cohere import CohereRerank
-from typing import List, Dict, Any, Optional
+from langchain_core.prompts import ChatPromptTemplate
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
+import asyncio
+import cohere
 import logging
 import os
+import re
+import threading
+import time
 from app.core.config import get_settings
+from app.core.cache import TTLCache
+from app.core.concurrency import run_blocking
+from app.core.http_clients import get_http_client, get_async_http_client
+from app.core.rate_limit import get_governor, estimate_tokens
+from app.services.embedding_cache import get_embedding_cache
 
 logger = logging.getLogger(__name__)
 
+HIGHLIGHT_MARKER = "핵심 포인트"
+DEFAULT_HIGHLIGHTS = ["문서 기반 답변", "관련 정보 포함", "추가 검색 가능"]
+# 답변 앞의 "1. 답변:" 라벨, 핵심 포인트 앞의 "2." 번호와 마크다운 기호 ("2. **", "## ", " **")
+_ANSWER_PREFIX = re.compile(r"^\s*(?:\d+\.\s*)?답변\s*:\s*")
+_TRAILING_NUMBER = re.compile(r"(?:(?:^|\n)[ \t]*(?:\d+\.[ \t]*)?(?:#{1,6}[ \t]*)?\**|[ \t]+\*+)[ \t]*$")
+# 스트리밍 중 아직 내보내지 않을 끝부분 (마커 앞 번호/기호일 수 있는 공백, 번호, "#", "*")
+_PENDING_TAIL = re.compile(r"\s*(?:\d+\.?[ \t]*)?(?:#{1,6}[ \t]*)?\**[ \t]*$")
+# Cohere SDK 자체 재시도 끔 (재시도는 호출 조절기에서만)
+_COHERE_REQUEST_OPTIONS = {"max_retries": 0}
+
+# 프롬프트 템플릿 (모듈 로드 시 한 번만 생성)
+_SUMMARY_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "당신은 문서 요약 전문가입니다. 핵심만 담아 간결하게 요약합니다."),
+    ("human", """다음 텍스트를 한 줄로 요약해주세요. 핵심만 간결하게 담아주세요.
+최대 {max_length}자 이내로 작성하세요.
+
+텍스트:
+{text}
+
+한 줄 요약:""")
+])
+
+_KEYWORD_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "당신은 키워드 추출 전문가입니다."),
+    ("human", """다음 텍스트에서 핵심 키워드를 추출해주세요.
+검색에 유용한 단어를 {max_keywords}개 이하로 선택하세요.
+키워드만 쉼표로 구분해서 나열하세요.
+
+텍스트:
+{text}
+
+키워드:""")
+])
+
+# 요약 + 키워드를 한 번에 (JSON 모드, 원문은 한 번만 전송)
+_ENRICHMENT_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "당신은 문서 요약과 키워드 추출 전문가입니다. 반드시 JSON 객체 하나로만 답합니다."),
+    ("human", """다음 텍스트를 분석해주세요.
+- summary: 핵심만 간결하게 담은 한 줄 요약 (최대 {max_length}자)
+- keywords: 검색에 유용한 핵심 키워드 {max_keywords}개 이하
+
+다음 형식의 JSON으로만 답하세요:
+{{"summary": "...", "keywords": ["...", "..."]}}
+
+텍스트:
+{text}""")
+])
+
+_ANSWER_PROMPT = ChatPromptTemplate.from_messages([
+    ("system", "당신은 문서 기반 답변 생성 전문가입니다. 제공된 문서만을 기반으로 정확하게 답변합니다."),
+    ("human", """사용자의 질문에 대해 제공된 문서들을 기반으로 답변을 작성해주세요.
+
+질문: {query}
+
+관련 문서들:
+{context}
+
+다음 형식으로 답변해주세요:
+1. 답변: 2-6문장으로 핵심 내용 요약
+2. 핵심 포인트: 3가지 중요한 점을 간결하게
+
+답변:""")
+])
+
+
+def _clean_highlight(line: str) -> Optional[str]:
+    """핵심 포인트 한 줄 정리 (불릿/번호/콜론 제거, 빈 줄과 제목 줄은 None)"""
+    line = line.strip()
+    if not line or line.startswith("핵심"):
+        return None
+    return line.lstrip("•-*0123456789.): ").strip() or None
+
+
+class AnswerStreamParser:
+    """스트리밍되는 답변 텍스트를 answer 조각과 highlight 이벤트로 분리
+
+    - 핵심 포인트 마커 전: 받은 텍스트를 answer 조각으로 바로 내보냄
+      (마커가 토큰 경계에서 잘리는 경우를 위해 끝 몇 글자와, 그 앞의 공백/번호/"*"는 보류)
+    - 마커 후: 줄이 완성될 때마다 highlight 이벤트 (최대 3개)
+    """
+
+    _HOLDBACK = len(HIGHLIGHT_MARKER) + 4  # 마커 앞 "\n2. " 포함
+    _PREFIX_WINDOW = 12  # "1. 답변:" 라벨 판별에 필요한 글자 수
+
+    def __init__(self, max_highlights: int = 3):
+        self.max_highlights = max_highlights
+        self.highlights: List[str] = []
+        self._buffer = ""
+        self._prefix_checked = False
+        self._in_highlights = False
+
+    def feed(self, text: str) -> List[Tuple[str, str]]:
+        self._buffer += text
+        return self._drain(final=False)
+
+    def close(self) -> List[Tuple[str, str]]:
+        events = self._drain(final=True)
+        if not self.highlights:
+            for highlight in DEFAULT_HIGHLIGHTS:
+                self.highlights.append(highlight)
+                events.append(("highlight", highlight))
+        return events
+
+    def _drain(self, final: bool) -> List[Tuple[str, str]]:
+        events: List[Tuple[str, str]] = []
+
+        if not self._in_highlights:
+            if not self._prefix_checked:
+                if len(self._buffer.lstrip()) < self._PREFIX_WINDOW and not final:
+                    return events
+                self._buffer = _ANSWER_PREFIX.sub("", self._buffer.lstrip(), count=1)
+                self._prefix_checked = True
+
+            index = self._buffer.find(HIGHLIGHT_MARKER)
+            if index < 0:
+                split = len(self._buffer) if final else len(self._buffer) - self._HOLDBACK
+                if not final and split > 0:
+                    # 마커 앞 "\n\n2. **" 같은 번호/기호가 조각 경계에서 먼저 나가지 않도록
+                    # 끝의 공백/번호/"#"/"*"도 보류 (마커가 오면 _TRAILING_NUMBER로 제거)
+                    split = _PENDING_TAIL.search(self._buffer, max(split - 32, 0), split).start()
+                if split > 0:
+                    text = self._buffer[:split]
+                    self._buffer = self._buffer[split:]
+                    if final:
+                        text = text.rstrip()
+                    if text:
+                        events.append(("answer", text))
+                return events
+
+            answer = _TRAILING_NUMBER.sub("", self._buffer[:index]).rstrip()
+            if answer:
+                events.append(("answer", answer))
+            self._buffer = self._buffer[index + len(HIGHLIGHT_MARKER):]
+            self._in_highlights = True
+
+        lines = self._buffer.split("\n")
+        self._buffer = "" if final else lines.pop()
+        for line in lines:
+            highlight = _clean_highlight(line)
+            if highlight and len(self.highlights) < self.max_highlights:
+                self.highlights.append(highlight)
+                events.append(("highlight", highlight))
+        return events
+
+
+class _Enrichment(BaseModel):
+    """요약 + 키워드 JSON 응답 스키마"""
+    summary: str = Field(..., min_length=1)
+    keywords: List[str] = Field(..., min_length=1)
+
+    @field_validator("summary")
+    @classmethod
+    def _strip_summary(cls, value: str) -> str:
+        return value.strip()
+
+    @field_validator("keywords")
+    @classmethod
+    def _clean_keywords(cls, value: List[str]) -> List[str]:
+        return list(dict.fromkeys(keyword.strip() for keyword in value if keyword.strip()))
+
 
 class LLMService:
     """LLM 서비스 (요약, 키워드 추출, 답변 생성)"""
 
     def __init__(self):
         self.settings = get_settings()
+        # 모든 OpenAI/Cohere 호출은 공급자별 호출 조절기를 거침 (재시도도 조절기에서만)
+        self.openai_governor = get_governor("openai")
+        self.cohere_governor = get_governor("cohere")
+        # OpenAI/Cohere 클라이언트는 공유 keep-alive 연결 풀 사용
         self.embeddings = OpenAIEmbeddings(
             model=self.settings.embedding_model,
-            openai_api_key=self.settings.openai_api_key
+            openai_api_key=self.settings.openai_api_key,
+            max_retries=0,
+            http_client=get_http_client(),
+            http_async_client=get_async_http_client()
         )
-        self.llm = ChatOpenAI(
-            model=self.settings.llm_model,
-            temperature=0.3,
-            openai_api_key=self.settings.openai_api_key
+        # (모델, temperature)별 ChatOpenAI, 이름별 prompt | llm 체인 (한 번 만들어 재사용)
+        self._chat_models: Dict[Tuple[str, float], ChatOpenAI] = {}
+        self._chains: Dict[str, Any] = {}
+        self._client_lock = threading.Lock()
+        self.llm = self._chat_model(0.3)
+        # Cohere SDK는 클라이언트 단위 재시도 설정이 없어 호출마다 request_options로 끔
+        self.cohere_client = cohere.Client(
+            api_key=self.settings.cohere_api_key,
+            httpx_client=get_http_client()
         )
-        self.reranker = CohereRerank(
-            model=self.settings.rerank_model,
-            cohere_api_key=self.settings.cohere_api_key
+        self.embedding_cache = get_embedding_cache()
+        # (쿼리, 문서 ID, 청크 번호) → Cohere relevance score
+        self.rerank_cache: TTLCache[float] = TTLCache(
+            max_entries=self.settings.rerank_cache_size,
+            ttl_seconds=self.settings.rerank_cache_ttl_seconds
         )
 
+    def _chat_model(self, temperature: float) -> ChatOpenAI:
+        """(모델, temperature) 설정별로 재사용하는 ChatOpenAI 클라이언트"""
+        key = (self.settings.llm_model, temperature)
+        with self._client_lock:
+            model = self._chat_models.get(key)
+            if model is None:
+                model = ChatOpenAI(
+                    model=self.settings.llm_model,
+                    temperature=temperature,
+                    openai_api_key=self.settings.openai_api_key,
+                    max_retries=0,
+                    http_client=get_http_client(),
+                    http_async_client=get_async_http_client()
+                )
+                self._chat_models[key] = model
+            return model
+
+    def _chain(self, name: str, prompt: ChatPromptTemplate, temperature: float):
+        """미리 만든 프롬프트와 공유 클라이언트로 구성한 체인 (이름별 캐시)"""
+        chain = self._chains.get(name)
+        if chain is None:
+            chain = prompt | self._chat_model(temperature)
+            self._chains[name] = chain
+        return chain
+
+    def _prompt_tokens(self, inputs: Dict[str, Any]) -> int:
+        return estimate_tokens(*(str(value) for value in inputs.values()))
+
+    def _invoke(self, chain, inputs: Dict[str, Any]):
+        """체인 호출 (OpenAI 호출 조절기 경유)"""
+        return self.openai_governor.call(lambda: chain.invoke(inputs), self._prompt_tokens(inputs))
+
+    async def _ainvoke(self, chain, inputs: Dict[str, Any]):
+        """체인 호출 (비동기, OpenAI 호출 조절기 경유)"""
+        return await self.openai_governor.acall(lambda: chain.ainvoke(inputs), self._prompt_tokens(inputs))
+
     def generate_embedding(self, text: str) -> List[float]:
-        """텍스트 임베딩 생성"""
+        """텍스트 임베딩 생성 (캐시 우선)"""
         try:
+            if self.embedding_cache is not None:
+                cached = self.embedding_cache.get(text)
+                if cached is not None:
+                    return cached
+
             logger.info(f"🔹 Embedding generation - text length: {len(text)}")
-            embedding = self.embeddings.embed_query(text)
+            embedding = self.openai_governor.call(
+                lambda: self.embeddings.embed_query(text), estimate_tokens(text)
+            )
             logger.info(f"✅ Embedding generated - dimension: {len(embedding)}")
+
+            if self.embedding_cache is not None:
+                self.embedding_cache.put(text, embedding)
             return embedding
         except Exception as e:
             logger.error(f"❌ Error generating embedding: {e}")
             raise
 
+    def generate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> List[List[float]]:
+        """여러 텍스트 임베딩을 배치로 생성 (embed_documents 1회당 batch_size개, 캐시 미스만 호출)"""
+        try:
+            batch_size = batch_size or self.settings.embedding_batch_size
+            embeddings, missing = self._cached_embeddings(texts)
+            logger.info(f"🔹 Batch embedding generation - {len(missing)}/{len(texts)} texts, batch size: {batch_size}")
+
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start:start + batch_size]
+                batch_texts = [texts[i] for i in batch]
+                batch_embeddings = self.openai_governor.call(
+                    lambda: self.embeddings.embed_documents(batch_texts), estimate_tokens(*batch_texts)
+                )
+                self._store_embeddings(texts, embeddings, batch, batch_embeddings)
+
+            logger.info(f"✅ Batch embeddings generated - count: {len(embeddings)}")
+            return embeddings
+        except Exception as e:
+            logger.error(f"❌ Error generating batch embeddings: {e}")
+            raise
+
+    async def agenerate_embedding(self, text: str) -> List[float]:
+        """텍스트 임베딩 생성 (비동기, 캐시 우선)"""
+        try:
+            if self.embedding_cache is not None:
+                cached = await self.embedding_cache.aget(text)
+                if cached is not None:
+                    return cached
+
+            logger.info(f"🔹 Embedding generation (async) - text length: {len(text)}")
+            embedding = await self.openai_governor.acall(
+                lambda: self.embeddings.aembed_query(text), estimate_tokens(text)
+            )
+            logger.info(f"✅ Embedding generated - dimension: {len(embedding)}")
+
+            if self.embedding_cache is not None:
+                await self.embedding_cache.aput(text, embedding)
+            return embedding
+        except Exception as e:
+            logger.error(f"❌ Error generating embedding: {e}")
+            raise
+
+    async def agenerate_embeddings(
+        self,
+        texts: List[str],
+        batch_size: Optional[int] = None
+    ) -> List[List[float]]:
+        """여러 텍스트 임베딩을 배치로 생성 (비동기, 캐시 미스만 호출)"""
+        try:
+            batch_size = batch_size or self.settings.embedding_batch_size
+            embeddings, missing = await self._acached_embeddings(texts)
+            logger.info(f"🔹 Batch embedding generation (async) - {len(missing)}/{len(texts)} texts, batch size: {batch_size}")
+
+            for start in range(0, len(missing), batch_size):
+                batch = missing[start:start + batch_size]
+                batch_texts = [texts[i] for i in batch]
+                batch_embeddings = await self.openai_governor.acall(
+                    lambda: self.embeddings.aembed_documents(batch_texts), estimate_tokens(*batch_texts)
+                )
+                await self._astore_embeddings(texts, embeddings, batch, batch_embeddings)
+
+            logger.info(f"✅ Batch embeddings generated - count: {len(embeddings)}")
+            return embeddings
+        except Exception as e:
+            logger.error(f"❌ Error generating batch embeddings: {e}")
+            raise
+
+    def _cached_embeddings(self, texts: List[str]):
+        """캐시 조회 결과와 캐시 미스 인덱스 목록 반환"""
+        if self.embedding_cache is None:
+            return [None] * len(texts), list(range(len(texts)))
+
+        embeddings = self.embedding_cache.get_many(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        return embeddings, missing
+
+    async def _acached_embeddings(self, texts: List[str]):
+        """캐시 조회 (비동기, 디스크 조회는 스레드 풀에서)"""
+        if self.embedding_cache is None:
+            return [None] * len(texts), list(range(len(texts)))
+
+        embeddings = await self.embedding_cache.aget_many(texts)
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        return embeddings, missing
+
+    def _store_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[Optional[List[float]]],
+        indices: List[int],
+        batch_embeddings: List[List[float]]
+    ):
+        """새로 생성한 임베딩을 결과 자리에 채우고 캐시에 저장"""
+        for i, embedding in zip(indices, batch_embeddings):
+            embeddings[i] = embedding
+        if self.embedding_cache is not None:
+            self.embedding_cache.put_many([texts[i] for i in indices], batch_embeddings)
+
+    async def _astore_embeddings(
+        self,
+        texts: List[str],
+        embeddings: List[Optional[List[float]]],
+        indices: List[int],
+        batch_embeddings: List[List[float]]
+    ):
+        """새로 생성한 임베딩 저장 (비동기, 디스크 기록은 스레드 풀에서)"""
+        for i, embedding in zip(indices, batch_embeddings):
+            embeddings[i] = embedding
+        if self.embedding_cache is not None:
+            await self.embedding_cache.aput_many([texts[i] for i in indices], batch_embeddings)
+
+    def _summary_chain(self):
+        return self._chain("summary", _SUMMARY_PROMPT, 0.3)
+
     def generate_summary(self, text: str, max_length: int = 100) -> str:
         """문서 한 줄 요약 생성"""
         try:
             logger.info(f"🔹 Summary generation - text length: {len(text)}")
-            from langchain_core.prompts import ChatPromptTemplate
-
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", "당신은 문서 요약 전문가입니다. 핵심만 담아 간결하게 요약합니다."),
-                ("human", """다음 텍스트를 한 줄로 요약해주세요. 핵심만 간결하게 담아주세요.
-최대 {max_length}자 이내로 작성하세요.
-
-텍스트:
-{text}
+            response = self._invoke(self._summary_chain(), {"text": text[:2000], "max_length": max_length})
+            summary = response.content.strip()
 
-한 줄 요약:""")
-            ])
+            logger.info(f"✅ Summary generated - length: {len(summary)}")
+            return summary
+        except Exception as e:
+            logger.error(f"❌ Error generating summary: {e}")
+            raise
 
-            chain = prompt | self.llm
-            response = chain.invoke({"text": text[:2000], "max_length": max_length})
+    async def agenerate_summary(self, text: str, max_length: int = 100) -> str:
+        """문서 한 줄 요약 생성 (비동기)"""
+        try:
+            logger.info(f"🔹 Summary generation (async) - text length: {len(text)}")
+            response = await self._ainvoke(self._summary_chain(), {"text": text[:2000], "max_length": max_length})
             summary = response.content.strip()
 
             logger.info(f"✅ Summary generated - length: {len(summary)}")
@@ -65,38 +413,159 @@ class LLMService:
             logger.error(f"❌ Error generating summary: {e}")
             raise
 
+    def _keyword_chain(self):
+        return self._chain("keyword", _KEYWORD_PROMPT, 0.2)
+
+    def _parse_keywords(self, content: str, max_keywords: int) -> List[str]:
+        keywords = [k.strip() for k in content.strip().split(",")]
+        return keywords[:max_keywords]
+
     def extract_keywords(self, text: str, max_keywords: int = 5) -> List[str]:
         """키워드 추출"""
         try:
-            from langchain_core.prompts import ChatPromptTemplate
-
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", "당신은 키워드 추출 전문가입니다."),
-                ("human", """다음 텍스트에서 핵심 키워드를 추출해주세요.
-검색에 유용한 단어를 {max_keywords}개 이하로 선택하세요.
-키워드만 쉼표로 구분해서 나열하세요.
+            response = self._invoke(self._keyword_chain(), {"text": text[:1500], "max_keywords": max_keywords})
+            return self._parse_keywords(response.content, max_keywords)
+        except Exception as e:
+            logger.error(f"Error extracting keywords: {e}")
+            raise
 
-텍스트:
-{text}
+    async def aextract_keywords(self, text: str, max_keywords: int = 5) -> List[str]:
+        """키워드 추출 (비동기)"""
+        try:
+            response = await self._ainvoke(self._keyword_chain(), {"text": text[:1500], "max_keywords": max_keywords})
+            return self._parse_keywords(response.content, max_keywords)
+        except Exception as e:
+            logger.error(f"Error extracting keywords: {e}")
+            raise
 
-키워드:""")
-            ])
+    def _enrichment_chain(self):
+        """JSON 모드로 고정한 요약 + 키워드 체인"""
+        chain = self._chains.get("enrichment")
+        if chain is None:
+            llm = self._chat_model(0.2).bind(response_format={"type": "json_object"})
+            chain = _ENRICHMENT_PROMPT | llm
+            self._chains["enrichment"] = chain
+        return chain
+
+    def _enrichment_input(self, text: str, max_length: int, max_keywords: int) -> Dict[str, Any]:
+        return {"text": text[:2000], "max_length": max_length, "max_keywords": max_keywords}
+
+    def _parse_enrichment(self, content: str, max_keywords: int) -> Tuple[str, List[str]]:
+        """JSON 응답 검증 (잘못된 JSON, 스키마 불일치, 빈 값이면 ValueError)"""
+        enrichment = _Enrichment.model_validate_json(content)
+        if not enrichment.summary or not enrichment.keywords:
+            raise ValueError("Empty summary or keywords in enrichment response")
+        return enrichment.summary, enrichment.keywords[:max_keywords]
+
+    def enrich_document(
+        self,
+        text: str,
+        max_length: int = 100,
+        max_keywords: int = 5
+    ) -> Tuple[str, List[str]]:
+        """요약 + 키워드 (ingest_enrichment_mode=combined면 LLM 호출 1회)
+
+        JSON 응답이 스키마에 맞지 않을 때만 요약/키워드 개별 호출로 다시 생성합니다.
+        호출 자체의 오류(재시도 후 실패)는 그대로 전달합니다.
+        """
+        if self.settings.ingest_enrichment_mode == "combined":
+            response = self._invoke(
+                self._enrichment_chain(), self._enrichment_input(text, max_length, max_keywords)
+            )
+            try:
+                return self._parse_enrichment(response.content, max_keywords)
+            except ValueError as e:  # JSON/스키마 오류 (pydantic ValidationError 포함)
+                logger.warning(f"Invalid enrichment response, falling back to separate calls: {e}")
+
+        return (
+            self.generate_summary(text, max_length),
+            self.extract_keywords(text, max_keywords)
+        )
 
-            keyword_llm = ChatOpenAI(
-                model=self.settings.llm_model,
-                temperature=0.2,
-                openai_api_key=self.settings.openai_api_key
+    async def aenrich_document(
+        self,
+        text: str,
+        max_length: int = 100,
+        max_keywords: int = 5
+    ) -> Tuple[str, List[str]]:
+        """요약 + 키워드 (비동기, 개별 호출 경로는 두 호출을 동시에 실행)"""
+        if self.settings.ingest_enrichment_mode == "combined":
+            response = await self._ainvoke(
+                self._enrichment_chain(), self._enrichment_input(text, max_length, max_keywords)
+            )
+            try:
+                return self._parse_enrichment(response.content, max_keywords)
+            except ValueError as e:  # JSON/스키마 오류 (pydantic ValidationError 포함)
+                logger.warning(f"Invalid enrichment response, falling back to separate calls: {e}")
+
+        summary, keywords = await asyncio.gather(
+            self.agenerate_summary(text, max_length),
+            self.aextract_keywords(text, max_keywords)
+        )
+        return summary, keywords
+
+    def _rerank_key(self, query: str, document: Dict[str, Any]) -> tuple:
+        """rerank 점수 캐시 키 (공백 정규화 쿼리, 문서 ID, 청크 번호)"""
+        return (" ".join(query.split()), document["id"], document.get("chunk_index"))
+
+    def _rerank_scores(self, query: str, documents: List[Dict[str, Any]]) -> List[float]:
+        """문서별 Cohere relevance score (캐시 우선, 캐시 미스 문서만 API 호출)
+
+        응답의 index(요청한 문서 목록 기준)로 결과를 원본 문서에 매핑합니다.
+        """
+        use_cache = self.settings.rerank_cache_enabled
+        keys = [self._rerank_key(query, doc) for doc in documents]
+        scores: List[Optional[float]] = [
+            self.rerank_cache.get(key) if use_cache else None
+            for key in keys
+        ]
+
+        missing = [i for i, score in enumerate(scores) if score is None]
+        if missing:
+            logger.info(f"Rerank - {len(missing)}/{len(documents)} documents not cached")
+            texts = [
+                f"{documents[i]['summary']}\n"
+                f"{documents[i].get('matched_chunk') or documents[i].get('preview', '')}"
+                for i in missing
+            ]
+            # 캐시되지 않은 후보 전체의 점수가 필요하므로 top_n 없이 전체 반환
+            response = self.cohere_governor.call(
+                lambda: self.cohere_client.rerank(
+                    model=self.settings.rerank_model,
+                    query=query,
+                    documents=texts,
+                    request_options=_COHERE_REQUEST_OPTIONS
+                )
             )
+            for result in response.results:
+                index = missing[result.index]
+                scores[index] = float(result.relevance_score)
+                if use_cache:
+                    self.rerank_cache.set(keys[index], scores[index])
 
-            chain = prompt | keyword_llm
-            response = chain.invoke({"text": text[:1500], "max_keywords": max_keywords})
+        # 응답에 빠진 문서는 0점 (캐시하지 않음)
+        return [score if score is not None else 0.0 for score in scores]
 
-            keywords_text = response.content.strip()
-            keywords = [k.strip() for k in keywords_text.split(",")]
-            return keywords[:max_keywords]
-        except Exception as e:
-            logger.error(f"Error extracting keywords: {e}")
-            raise
+    def _rerank_outputs(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        scores: List[float],
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """점수 순으로 상위 top_k 문서 선택 + evidence 추출"""
+        order = sorted(range(len(documents)), key=lambda i: scores[i], reverse=True)
+
+        reranked = []
+        for index in order[:top_k]:
+            original_doc = documents[index]
+            reranked.append({
+                **original_doc,
+                "rerank_score": scores[index],
+                "evidence": self._extract_evidence(query, original_doc)
+            })
+
+        return reranked
 
     def rerank_results(
         self,
@@ -106,40 +575,26 @@ class LLMService:
     ) -> List[Dict[str, Any]]:
         """Cohere Rerank로 결과 재정렬 + evidence 추출"""
         try:
-            from langchain_core.documents import Document
-
-            # Cohere rerank용 문서 준비
-            doc_texts = [
-                f"{doc['summary']}\n{doc.get('preview', '')}"
-                for doc in documents
-            ]
-
-            # LangChain Documents로 변환
-            langchain_docs = [Document(page_content=text) for text in doc_texts]
+            scores = self._rerank_scores(query, documents)
+            return self._rerank_outputs(query, documents, scores, top_k)
 
-            # Rerank 실행
-            reranked_docs = self.reranker.compress_documents(
-                documents=langchain_docs,
-                query=query
-            )
-
-            # 결과 재구성
-            reranked = []
-            for i, doc in enumerate(reranked_docs[:top_k]):
-                # 원본 문서 찾기
-                original_index = doc_texts.index(doc.page_content)
-                original_doc = documents[original_index]
-
-                # evidence 생성
-                evidence = self._extract_evidence(query, original_doc)
+        except Exception as e:
+            logger.error(f"Error reranking: {e}")
+            raise
 
-                reranked.append({
-                    **original_doc,
-                    "rerank_score": getattr(doc.metadata, 'relevance_score', 0.0),
-                    "evidence": evidence
-                })
+    async def arerank_results(
+        self,
+        query: str,
+        documents: List[Dict[str, Any]],
+        top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Cohere Rerank로 결과 재정렬 (비동기)
 
-            return reranked
+        Cohere 클라이언트는 동기 API이므로 공유 스레드 풀에서 실행합니다.
+        """
+        try:
+            scores = await run_blocking(self._rerank_scores, query, documents)
+            return self._rerank_outputs(query, documents, scores, top_k)
 
         except Exception as e:
             logger.error(f"Error reranking: {e}")
@@ -148,7 +603,8 @@ class LLMService:
     def _extract_evidence(self, query: str, document: Dict[str, Any]) -> str:
         """간단한 evidence 추출 (쿼리와 관련된 부분 찾기)"""
         summary = document.get("summary", "")
-        preview = document.get("preview", "")
+        # 청크 검색 결과면 가장 유사한 청크, 아니면 미리보기에서 찾음
+        preview = document.get("matched_chunk") or document.get("preview", "")
 
         # 쿼리 단어들
         query_words = set(query.lower().split())
@@ -164,6 +620,57 @@ class LLMService:
 
         return "문서 내용과 관련성 있음"
 
+    def _answer_context(
+        self,
+        source_documents: List[Dict[str, Any]],
+        max_docs: int
+    ) -> str:
+        """상위 문서들 컨텍스트 구성"""
+        context_parts = []
+        for i, doc in enumerate(source_documents[:max_docs], 1):
+            context_parts.append(
+                f"[문서 {i}] {doc['summary']}\n{doc.get('preview', '')[:300]}"
+            )
+
+        return "\n\n".join(context_parts)
+
+    def _answer_chain(self):
+        return self._chain("answer", _ANSWER_PROMPT, 0.5)
+
+    def _parse_answer(
+        self,
+        answer_text: str,
+        source_documents: List[Dict[str, Any]],
+        max_docs: int
+    ) -> Dict[str, Any]:
+        """답변과 핵심 포인트 분리"""
+        answer_text = answer_text.strip()
+
+        parts = answer_text.split(HIGHLIGHT_MARKER, 1)
+        main_answer = _ANSWER_PREFIX.sub("", parts[0], count=1)
+        if len(parts) > 1:
+            main_answer = _TRAILING_NUMBER.sub("", main_answer)
+        main_answer = main_answer.strip()
+
+        # 핵심 포인트 추출 (불릿 포인트 제거, 최대 3개)
+        highlights = []
+        if len(parts) > 1:
+            for line in parts[1].split("\n"):
+                clean_line = _clean_highlight(line)
+                if clean_line:
+                    highlights.append(clean_line)
+        highlights = highlights[:3]
+
+        # 기본값 설정
+        if not highlights:
+            highlights = list(DEFAULT_HIGHLIGHTS)
+
+        return {
+            "answer": main_answer,
+            "highlights": highlights,
+            "source_documents": source_documents[:max_docs]
+        }
+
     def compose_answer(
         self,
         query: str,
@@ -172,77 +679,79 @@ class LLMService:
     ) -> Dict[str, Any]:
         """검색 결과 기반 답변 생성"""
         try:
-            # 상위 문서들 컨텍스트 구성
-            context_parts = []
-            for i, doc in enumerate(source_documents[:max_docs], 1):
-                context_parts.append(
-                    f"[문서 {i}] {doc['summary']}\n{doc.get('preview', '')[:300]}"
-                )
-
-            context = "\n\n".join(context_parts)
-
-            from langchain_core.prompts import ChatPromptTemplate
-
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", "당신은 문서 기반 답변 생성 전문가입니다. 제공된 문서만을 기반으로 정확하게 답변합니다."),
-                ("human", """사용자의 질문에 대해 제공된 문서들을 기반으로 답변을 작성해주세요.
-
-질문: {query}
-
-관련 문서들:
-{context}
-
-다음 형식으로 답변해주세요:
-1. 답변: 2-6문장으로 핵심 내용 요약
-2. 핵심 포인트: 3가지 중요한 점을 간결하게
-
-답변:""")
-            ])
-
-            answer_llm = ChatOpenAI(
-                model=self.settings.llm_model,
-                temperature=0.5,
-                openai_api_key=self.settings.openai_api_key
-            )
-
-            chain = prompt | answer_llm
-            response = chain.invoke({"query": query, "context": context})
-
-            answer_text = response.content.strip()
-
-            # 답변과 핵심 포인트 분리
-            parts = answer_text.split("핵심 포인트")
-            main_answer = parts[0].replace("답변:", "").strip()
-
-            # 핵심 포인트 추출
-            highlights = []
-            if len(parts) > 1:
-                highlight_text = parts[1].strip()
-                for line in highlight_text.split("\n"):
-                    line = line.strip()
-                    if line and not line.startswith("핵심"):
-                        # 불릿 포인트 제거
-                        clean_line = line.lstrip("•-123456789. ").strip()
-                        if clean_line:
-                            highlights.append(clean_line)
-
-            # 최대 3개로 제한
-            highlights = highlights[:3]
+            context = self._answer_context(source_documents, max_docs)
+            response = self._invoke(self._answer_chain(), {"query": query, "context": context})
+            return self._parse_answer(response.content, source_documents, max_docs)
 
-            # 기본값 설정
-            if not highlights:
-                highlights = ["문서 기반 답변", "관련 정보 포함", "추가 검색 가능"]
+        except Exception as e:
+            logger.error(f"Error composing answer: {e}")
+            raise
 
-            return {
-                "answer": main_answer,
-                "highlights": highlights,
-                "source_documents": source_documents[:max_docs]
-            }
+    async def acompose_answer(
+        self,
+        query: str,
+        source_documents: List[Dict[str, Any]],
+        max_docs: int = 3
+    ) -> Dict[str, Any]:
+        """검색 결과 기반 답변 생성 (비동기)"""
+        try:
+            context = self._answer_context(source_documents, max_docs)
+            response = await self._ainvoke(self._answer_chain(), {"query": query, "context": context})
+            return self._parse_answer(response.content, source_documents, max_docs)
 
         except Exception as e:
             logger.error(f"Error composing answer: {e}")
             raise
 
+    async def astream_answer(
+        self,
+        query: str,
+        source_documents: List[Dict[str, Any]],
+        max_docs: int = 3
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """검색 결과 기반 답변 스트리밍
+
+        Yields:
+            ("answer", 텍스트 조각) → ("highlight", 핵심 포인트) → ("done", 결과)
+            done 결과는 compose_answer와 같은 dict에 metrics
+            (first_token_ms, duration_ms, chunks)가 추가됩니다.
+        """
+        context = self._answer_context(source_documents, max_docs)
+        parser = AnswerStreamParser()
+        chunks: List[str] = []
+        started = time.perf_counter()
+        first_token_ms = None
+
+        # 스트림은 일부 전송 후 재시도할 수 없으므로 속도 제한/동시 호출 수만 적용
+        inputs = {"query": query, "context": context}
+        async with self.openai_governor.aslot(self._prompt_tokens(inputs)):
+            async for chunk in self._answer_chain().astream(inputs):
+                text = chunk.content
+                if not text:
+                    continue
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - started) * 1000
+                chunks.append(text)
+                for event in parser.feed(text):
+                    yield event
+
+        for event in parser.close():
+            yield event
+
+        duration_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Answer streamed - first token: {first_token_ms or 0:.0f}ms, "
+            f"total: {duration_ms:.0f}ms, chunks: {len(chunks)}"
+        )
+
+        result = self._parse_answer("".join(chunks), source_documents, max_docs)
+        result["metrics"] = {
+            "first_token_ms": round(first_token_ms, 1) if first_token_ms is not None else None,
+            "duration_ms": round(duration_ms, 1),
+            "chunks": len(chunks),
+        }
+        yield ("done", result)
+
 
 # 싱글톤 인스턴스
 _llm_service = None
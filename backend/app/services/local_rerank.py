@@ -0,0 +1,157 @@
+"""
+API 호출 없는 로컬 Rerank (MMR + 키워드 특징)
+
+검색 단계에서 함께 받은 후보 벡터(include_values)만 사용합니다.
+- 관련도: 쿼리-후보 코사인 유사도 + keyword_weight × 쿼리 토큰의 키워드/요약 일치 비율
+- 순서: Maximal Marginal Relevance
+  (λ × 관련도 - (1 - λ) × 이미 선택된 결과와의 최대 유사도)
+
+후보 100개 기준 수 ms 이내로 끝나므로 대화형 검색의 기본 재랭킹으로 쓸 수 있습니다.
+"""
+
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+import numpy as np
+from app.core.config import get_settings
+from app.services.lexical_index import tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def mmr_order(
+    relevance: np.ndarray,
+    similarity: np.ndarray,
+    top_k: int,
+    lambda_mult: float
+) -> List[int]:
+    """MMR 선택 순서 (후보 인덱스 리스트)
+
+    Args:
+        relevance: 후보별 관련도 (n,)
+        similarity: 후보 간 코사인 유사도 (n, n)
+        top_k: 선택할 개수
+        lambda_mult: 1이면 관련도 순, 0에 가까울수록 다양성 우선
+    """
+    count = len(relevance)
+    selected: List[int] = []
+    redundancy = np.zeros(count, dtype=np.float32)
+    available = np.ones(count, dtype=bool)
+
+    for _ in range(min(top_k, count)):
+        scores = lambda_mult * relevance - (1.0 - lambda_mult) * redundancy
+        scores = np.where(available, scores, -np.inf)
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        redundancy = np.maximum(redundancy, similarity[best])
+
+    return selected
+
+
+class LocalReranker:
+    """후보 벡터 기반 로컬 Rerank"""
+
+    def __init__(self, lambda_mult: float = 0.7, keyword_weight: float = 0.1):
+        self.lambda_mult = lambda_mult
+        self.keyword_weight = keyword_weight
+
+    def rerank(
+        self,
+        query: str,
+        query_embedding: List[float],
+        documents: List[Dict[str, Any]],
+        top_k: int = 10
+    ) -> List[Dict[str, Any]]:
+        """MMR로 재정렬 + rerank_score/evidence 추가
+
+        Args:
+            query: 검색 쿼리
+            query_embedding: 쿼리 임베딩
+            documents: 검색 결과 dict 리스트 ("values"가 없으면 "score"를 유사도로 사용)
+            top_k: 반환 개수
+
+        Returns:
+            재정렬된 문서 리스트 ("values"는 제외)
+        """
+        if not documents:
+            return []
+
+        dimension = len(query_embedding)
+        vectors = np.zeros((len(documents), dimension), dtype=np.float32)
+        has_values = np.zeros(len(documents), dtype=bool)
+        for i, doc in enumerate(documents):
+            values = doc.get("values")
+            if values is not None and len(values) == dimension:
+                vectors[i] = values
+                has_values[i] = True
+
+        vectors = _normalize_rows(vectors)
+        query_vector = _normalize_rows(np.asarray([query_embedding], dtype=np.float32))[0]
+
+        cosine = vectors @ query_vector
+        fallback = np.asarray([doc.get("score", 0.0) for doc in documents], dtype=np.float32)
+        cosine = np.where(has_values, cosine, fallback)
+
+        query_terms = set(tokenize(query))
+        features = [self._keyword_features(query_terms, doc) for doc in documents]
+        overlap = np.asarray([ratio for ratio, _ in features], dtype=np.float32)
+        relevance = cosine + self.keyword_weight * overlap
+
+        order = mmr_order(relevance, vectors @ vectors.T, top_k, self.lambda_mult)
+
+        reranked = []
+        for i in order:
+            doc = {key: value for key, value in documents[i].items() if key != "values"}
+            doc["rerank_score"] = float(relevance[i])
+            doc["evidence"] = self._evidence(features[i], float(cosine[i]))
+            reranked.append(doc)
+        return reranked
+
+    def _keyword_features(
+        self,
+        query_terms: set,
+        doc: Dict[str, Any]
+    ) -> Tuple[float, List[str]]:
+        """(키워드/요약에 있는 쿼리 토큰 비율, 일치한 키워드)
+
+        쿼리 토큰(단어/글자 bigram)이 몇 개뿐이므로 후보를 토큰화하지 않고
+        소문자 텍스트에 대한 부분 문자열 검사로 계산합니다.
+        """
+        if not query_terms:
+            return 0.0, []
+        keywords = [keyword.lower() for keyword in doc.get("keywords") or []]
+        text = f"{doc.get('summary', '').lower()} {' '.join(keywords)}"
+        matched_terms = [term for term in query_terms if term in text]
+        matched = [
+            original for original, keyword in zip(doc.get("keywords") or [], keywords)
+            if any(term in keyword for term in matched_terms)
+        ]
+        return len(matched_terms) / len(query_terms), matched
+
+    def _evidence(self, features: Tuple[float, List[str]], similarity: float) -> str:
+        ratio, matched = features
+        if matched:
+            return f"키워드 일치: {', '.join(matched[:3])}"
+        if ratio > 0:
+            return "요약에 쿼리 단어 포함"
+        return f"의미 유사도 {similarity:.2f}"
+
+
+# 싱글톤 인스턴스
+_local_reranker: Optional[LocalReranker] = None
+
+
+def get_local_reranker() -> LocalReranker:
+    global _local_reranker
+    if _local_reranker is None:
+        settings = get_settings()
+        _local_reranker = LocalReranker(
+            lambda_mult=settings.local_rerank_lambda,
+            keyword_weight=settings.local_rerank_keyword_weight
+        )
+    return _local_reranker
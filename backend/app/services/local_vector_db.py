@@ -0,0 +1,518 @@
+"""
+프로세스 내 로컬 벡터 인덱스 (Pinecone 대체 백엔드)
+
+- 벡터: float32 행렬을 메모리 매핑 파일(.npy)로 저장
+- 메타데이터: SQLite (id ↔ row 매핑 포함)
+- 검색: 정규화된 행렬 곱으로 정확한(exact) 코사인 유사도 계산
+
+수십만 개 문서까지 네트워크 왕복 없이 밀리초 이하로 검색할 수 있으며,
+오프라인 벤치마크에도 사용할 수 있습니다.
+"""
+
+from typing import List, Dict, Any, NamedTuple, Optional, Iterator, Set
+import json
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+from app.core.config import get_settings
+from app.services.vector_db import VectorDBBackend
+
+logger = logging.getLogger(__name__)
+
+_INITIAL_CAPACITY = 1024
+
+
+def _match_condition(column: np.ndarray, condition: Any) -> np.ndarray:
+    """단일 필드 조건을 불리언 마스크로 변환"""
+    if not isinstance(condition, dict):
+        condition = {"$eq": condition}
+
+    mask = np.ones(len(column), dtype=bool)
+    for op, value in condition.items():
+        if op == "$eq":
+            mask &= column == value
+        elif op == "$ne":
+            mask &= column != value
+        elif op in ("$in", "$nin"):
+            values = set(value)
+            hits = np.fromiter((v in values for v in column), dtype=bool, count=len(column))
+            mask &= hits if op == "$in" else ~hits
+        elif op in ("$gt", "$gte", "$lt", "$lte"):
+            numeric = np.array(
+                [v if isinstance(v, (int, float)) else np.nan for v in column],
+                dtype=np.float64
+            )
+            with np.errstate(invalid="ignore"):
+                if op == "$gt":
+                    mask &= numeric > value
+                elif op == "$gte":
+                    mask &= numeric >= value
+                elif op == "$lt":
+                    mask &= numeric < value
+                else:
+                    mask &= numeric <= value
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return mask
+
+
+def _filter_fields(filter_dict: Optional[Dict[str, Any]]) -> Set[str]:
+    """필터가 참조하는 메타데이터 필드 ($and/$or 포함)"""
+    fields: Set[str] = set()
+    for key, condition in (filter_dict or {}).items():
+        if key in ("$and", "$or"):
+            for sub in condition:
+                fields |= _filter_fields(sub)
+        else:
+            fields.add(key)
+    return fields
+
+
+def _evaluate_filter(
+    filter_dict: Optional[Dict[str, Any]],
+    columns: Dict[str, np.ndarray],
+    active: np.ndarray
+) -> np.ndarray:
+    """Pinecone 스타일 메타데이터 필터를 행 마스크로 변환
+
+    지원: 필드 조건($eq, $ne, $in, $nin, $gt, $gte, $lt, $lte), $and, $or
+    """
+    mask = active.copy()
+    if not filter_dict:
+        return mask
+
+    for key, condition in filter_dict.items():
+        if key == "$and":
+            for sub in condition:
+                mask &= _evaluate_filter(sub, columns, active)
+        elif key == "$or":
+            any_mask = np.zeros(len(active), dtype=bool)
+            for sub in condition:
+                any_mask |= _evaluate_filter(sub, columns, active)
+            mask &= any_mask
+        else:
+            mask &= _match_condition(columns[key], condition)
+    return mask
+
+
+class _SearchView(NamedTuple):
+    """검색 시점의 행 스냅샷 (lock 밖에서 필터/점수/상위 k 계산)"""
+    vectors: np.ndarray  # (size, D) 행렬 뷰
+    norms: np.ndarray
+    active: np.ndarray
+    columns: Dict[str, np.ndarray]
+    ids: List[Optional[str]]
+    metadata: List[Optional[Dict[str, Any]]]
+
+
+class LocalVectorDBService(VectorDBBackend):
+    """로컬 NumPy 벡터 DB 서비스"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.settings = get_settings()
+        self.path = path or self.settings.local_vector_db_path
+        self.dimension = self.settings.embedding_dimension
+        self._lock = threading.RLock()
+
+        os.makedirs(self.path, exist_ok=True)
+        self._vectors_path = os.path.join(self.path, "vectors.npy")
+        self._conn = sqlite3.connect(
+            os.path.join(self.path, "metadata.db"),
+            check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS vectors ("
+            "id TEXT PRIMARY KEY, row INTEGER NOT NULL, metadata TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+        self._load()
+
+    def _load(self):
+        """디스크에서 벡터 행렬과 메타데이터 복원"""
+        rows = self._conn.execute("SELECT id, row, metadata FROM vectors").fetchall()
+        max_row = max((row for _, row, _ in rows), default=-1)
+
+        if os.path.exists(self._vectors_path):
+            self._vectors = np.lib.format.open_memmap(self._vectors_path, mode="r+")
+            if self._vectors.shape[1] != self.dimension:
+                raise ValueError(
+                    f"Local index dimension {self._vectors.shape[1]} "
+                    f"does not match embedding_dimension {self.dimension}"
+                )
+        else:
+            self._vectors = np.lib.format.open_memmap(
+                self._vectors_path,
+                mode="w+",
+                dtype=np.float32,
+                shape=(max(_INITIAL_CAPACITY, max_row + 1), self.dimension)
+            )
+
+        capacity = self._vectors.shape[0]
+        self._size = max_row + 1
+        self._ids: List[Optional[str]] = [None] * capacity
+        self._metadata: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._id_to_row: Dict[str, int] = {}
+        self._active = np.zeros(capacity, dtype=bool)
+        self._norms = np.zeros(capacity, dtype=np.float32)
+        self._columns: Dict[str, np.ndarray] = {}
+
+        for doc_id, row, metadata in rows:
+            self._ids[row] = doc_id
+            self._metadata[row] = json.loads(metadata)
+            self._id_to_row[doc_id] = row
+            self._active[row] = True
+
+        if self._size:
+            self._norms[:self._size] = np.linalg.norm(self._vectors[:self._size], axis=1)
+
+        self._free_rows = [row for row in range(self._size) if not self._active[row]]
+        logger.info(f"Local vector index loaded: {len(self._id_to_row)} vectors ({self.path})")
+
+    def _grow(self, min_capacity: int):
+        """행렬 용량을 두 배씩 늘림 (메모리 매핑 파일 재생성)"""
+        capacity = self._vectors.shape[0]
+        new_capacity = capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+
+        tmp_path = self._vectors_path + ".tmp"
+        grown = np.lib.format.open_memmap(
+            tmp_path,
+            mode="w+",
+            dtype=np.float32,
+            shape=(new_capacity, self.dimension)
+        )
+        grown[:capacity] = self._vectors
+        grown.flush()
+        del grown
+        del self._vectors
+        os.replace(tmp_path, self._vectors_path)
+        self._vectors = np.lib.format.open_memmap(self._vectors_path, mode="r+")
+
+        extra = new_capacity - capacity
+        self._ids.extend([None] * extra)
+        self._metadata.extend([None] * extra)
+        self._active = np.concatenate([self._active, np.zeros(extra, dtype=bool)])
+        self._norms = np.concatenate([self._norms, np.zeros(extra, dtype=np.float32)])
+        self._columns = {}
+        logger.info(f"Local vector index grown to {new_capacity} rows")
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        if self._size >= self._vectors.shape[0]:
+            self._grow(self._size + 1)
+        row = self._size
+        self._size += 1
+        return row
+
+    def _set_column_value(self, row: int, metadata: Optional[Dict[str, Any]]):
+        """캐시된 필터 컬럼을 한 행만 갱신"""
+        for field, column in self._columns.items():
+            column[row] = metadata.get(field) if metadata else None
+
+    def _column(self, field: str) -> np.ndarray:
+        """필터용 메타데이터 컬럼 (object 배열, 최초 사용 시 생성)"""
+        column = self._columns.get(field)
+        if column is None:
+            column = np.empty(len(self._metadata), dtype=object)
+            column[:] = [m.get(field) if m else None for m in self._metadata]
+            self._columns[field] = column
+        return column
+
+    def _filter_mask(self, filter_dict: Optional[Dict[str, Any]]) -> np.ndarray:
+        """메타데이터 필터 행 마스크 (호출자가 lock 보유)"""
+        columns = {field: self._column(field)[:self._size] for field in _filter_fields(filter_dict)}
+        return _evaluate_filter(filter_dict, columns, self._active[:self._size])
+
+    def _search_view(self, filter_dict: Optional[Dict[str, Any]]) -> _SearchView:
+        """lock 안에서는 크기와 배열/컬럼 참조만 잡아 둠
+
+        행렬 곱과 필터, 상위 k 선택은 lock 밖에서 하므로 동시 검색이 서로를 막지 않습니다.
+        기록은 행 단위로 제자리 갱신하고 _grow는 새 배열을 만들므로 뷰는 계속 유효하며,
+        스냅샷 이후 바뀐 행은 직전 또는 직후 상태 중 하나로 보입니다.
+        """
+        with self._lock:
+            size = self._size
+            return _SearchView(
+                vectors=self._vectors[:size],
+                norms=self._norms[:size].copy(),
+                active=self._active[:size].copy(),
+                columns={field: self._column(field)[:size].copy() for field in _filter_fields(filter_dict)},
+                ids=self._ids[:size],
+                metadata=self._metadata[:size]
+            )
+
+    def _document_mask(self, project: Optional[str], include_chunks: bool) -> np.ndarray:
+        """문서 순회용 행 마스크 (프로젝트 필터, 기본적으로 청크 벡터 제외)"""
+        filter_dict = None
+        if project:
+            filter_dict = {"project": {"$eq": project}}
+        mask = self._filter_mask(filter_dict)
+        if not include_chunks:
+            # 청크 벡터만 chunk_index 메타데이터를 가짐
+            mask &= ~_match_condition(self._column("chunk_index")[:self._size], {"$gte": 0})
+        return mask
+
+    @staticmethod
+    def _scores(view: _SearchView, query_embedding: List[float]) -> np.ndarray:
+        """모든 행에 대한 코사인 유사도"""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query_norm = float(np.linalg.norm(query))
+        if query_norm == 0.0:
+            return np.zeros(len(view.norms), dtype=np.float32)
+
+        dots = view.vectors @ query
+        norms = view.norms * query_norm
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(norms > 0, dots / norms, 0.0).astype(np.float32)
+
+    @staticmethod
+    def _top_k(
+        view: _SearchView,
+        scores: np.ndarray,
+        mask: np.ndarray,
+        top_k: int,
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        candidates = np.flatnonzero(mask)
+        if len(candidates) == 0 or top_k <= 0:
+            return []
+
+        candidate_scores = scores[candidates]
+        if len(candidates) > top_k:
+            part = np.argpartition(-candidate_scores, top_k - 1)[:top_k]
+            candidates = candidates[part]
+            candidate_scores = candidate_scores[part]
+        order = np.argsort(-candidate_scores, kind="stable")
+
+        results = []
+        for i in order:
+            row = candidates[i]
+            result = {
+                "id": view.ids[row],
+                "score": float(candidate_scores[i]),
+                "metadata": view.metadata[row]
+            }
+            if include_values:
+                # 검색 결과 벡터는 rerank 등 내부 계산에만 쓰이므로 list 변환 없이 float32 복사본
+                result["values"] = np.array(view.vectors[row])
+            results.append(result)
+        return results
+
+    def _write_rows(self, vectors: List[Dict[str, Any]]):
+        """벡터들을 행렬/메타데이터에 기록하고 한 트랜잭션으로 커밋"""
+        values = np.asarray([v["values"] for v in vectors], dtype=np.float32)
+        if values.ndim != 2 or values.shape[1] != self.dimension:
+            raise ValueError(
+                f"Vector dimension {values.shape[1:]} does not match {self.dimension}"
+            )
+
+        with self._lock:
+            rows = []
+            for vector in vectors:
+                row = self._id_to_row.get(vector["id"])
+                if row is None:
+                    row = self._allocate_row()
+                    self._id_to_row[vector["id"]] = row
+                rows.append(row)
+
+            rows_array = np.asarray(rows)
+            self._vectors[rows_array] = values
+            self._norms[rows_array] = np.linalg.norm(values, axis=1)
+            self._active[rows_array] = True
+
+            for row, vector in zip(rows, vectors):
+                metadata = vector.get("metadata", {})
+                self._ids[row] = vector["id"]
+                self._metadata[row] = metadata
+                self._set_column_value(row, metadata)
+
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO vectors (id, row, metadata) VALUES (?, ?, ?)",
+                [
+                    (vector["id"], row, json.dumps(vector.get("metadata", {}), ensure_ascii=False))
+                    for row, vector in zip(rows, vectors)
+                ]
+            )
+            self._conn.commit()
+            self._vectors.flush()
+
+    def upsert_document(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """문서 벡터를 로컬 인덱스에 저장"""
+        try:
+            self._write_rows([{"id": doc_id, "values": embedding, "metadata": metadata}])
+            logger.info(f"Document {doc_id} upserted successfully")
+            return True
+        except Exception as e:
+            logger.error(f"Error upserting document {doc_id}: {e}")
+            raise
+
+    def upsert_documents(self, vectors: List[Dict[str, Any]]) -> int:
+        """문서 벡터 배치를 로컬 인덱스에 저장"""
+        if not vectors:
+            return 0
+        try:
+            self._write_rows(vectors)
+            logger.info(f"{len(vectors)} documents upserted successfully")
+            return len(vectors)
+        except Exception as e:
+            logger.error(f"Error upserting {len(vectors)} documents: {e}")
+            raise
+
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        namespace: str = "",
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        """벡터 검색 (exact cosine)"""
+        try:
+            view = self._search_view(filter_dict)
+            scores = self._scores(view, query_embedding)
+            mask = _evaluate_filter(filter_dict, view.columns, view.active)
+            return self._top_k(view, scores, mask, top_k, include_values)
+        except Exception as e:
+            logger.error(f"Error searching: {e}")
+            raise
+
+    def delete_document(self, doc_id: str) -> bool:
+        """문서 삭제 (청크 벡터 포함, 행은 재사용 목록으로 반환)"""
+        try:
+            with self._lock:
+                chunk_rows = np.flatnonzero(self._filter_mask({"doc_id": {"$eq": doc_id}}))
+                ids = [doc_id] + [
+                    self._ids[row] for row in chunk_rows.tolist()
+                    if self._ids[row] != doc_id
+                ]
+                self._delete_ids(ids)
+
+            logger.info(f"Document {doc_id} deleted successfully ({len(ids) - 1} chunks)")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting document {doc_id}: {e}")
+            raise
+
+    def delete_vectors(self, ids: List[str]) -> int:
+        with self._lock:
+            return self._delete_ids(ids)
+
+    def _delete_ids(self, ids: List[str]) -> int:
+        """행 비우기 + SQLite 삭제 (호출자가 lock 보유)"""
+        deleted = 0
+        for vector_id in ids:
+            row = self._id_to_row.pop(vector_id, None)
+            if row is None:
+                continue
+            self._vectors[row] = 0.0
+            self._norms[row] = 0.0
+            self._ids[row] = None
+            self._metadata[row] = None
+            self._active[row] = False
+            self._set_column_value(row, None)
+            self._free_rows.append(row)
+            deleted += 1
+
+        self._conn.executemany(
+            "DELETE FROM vectors WHERE id = ?",
+            [(vector_id,) for vector_id in ids]
+        )
+        self._conn.commit()
+        return deleted
+
+    def _document(self, row: int, include_values: bool) -> Dict[str, Any]:
+        document = {"id": self._ids[row], "metadata": self._metadata[row]}
+        if include_values:
+            document["values"] = self._vectors[row].tolist()
+        return document
+
+    def fetch_documents(
+        self,
+        ids: List[str],
+        include_values: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """ID로 문서 조회"""
+        with self._lock:
+            return {
+                doc_id: self._document(self._id_to_row[doc_id], include_values)
+                for doc_id in ids
+                if doc_id in self._id_to_row
+            }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 통계"""
+        return {
+            "total_vector_count": len(self._id_to_row),
+            "dimension": self.dimension,
+            "namespace_count": 1 if self._id_to_row else 0,
+        }
+
+    def iter_document_batches(
+        self,
+        project: Optional[str] = None,
+        batch_size: int = 100,
+        include_values: bool = False,
+        include_chunks: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """전체 문서를 저장 순서대로 배치 순회"""
+        with self._lock:
+            rows = np.flatnonzero(self._document_mask(project, include_chunks))
+
+        for start in range(0, len(rows), batch_size):
+            with self._lock:
+                # 순회 중 삭제된 행은 건너뜀
+                batch = [
+                    self._document(row, include_values)
+                    for row in rows[start:start + batch_size].tolist()
+                    if self._active[row]
+                ]
+            if batch:
+                yield batch
+
+    def get_all_documents(
+        self,
+        project: Optional[str] = None,
+        limit: int = 200,
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        """모든 문서 조회 (프로젝트 필터 지원, 저장 순서)"""
+        try:
+            with self._lock:
+                rows = np.flatnonzero(self._document_mask(project, include_chunks=False))[:limit]
+                documents = [self._document(row, include_values) for row in rows]
+
+            logger.info(f"Retrieved {len(documents)} documents")
+            return documents
+        except Exception as e:
+            logger.error(f"Error getting all documents: {e}")
+            raise
+
+    def query_similar(
+        self,
+        doc_id: str,
+        query_vector: List[float],
+        top_k: int = 20,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """특정 문서와 유사한 문서 검색 (자기 자신 제외)"""
+        try:
+            view = self._search_view(filter_dict)
+            scores = self._scores(view, query_vector)
+            mask = _evaluate_filter(filter_dict, view.columns, view.active)
+            row = self._id_to_row.get(doc_id)
+            if row is not None and row < len(view.ids) and view.ids[row] == doc_id:
+                mask[row] = False
+            return self._top_k(view, scores, mask, top_k)
+        except Exception as e:
+            logger.error(f"Error querying similar documents: {e}")
+            raise
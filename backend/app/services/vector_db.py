@@ -1,29 +1,301 @@
-from pinecone import Pinecone, ServerlessSpec
-from typing import List, Dict, Any, Optional
+from abc import ABC, abstractmethod
+from typing import List, Dict, Any, Optional, Iterator, AsyncIterator
+import itertools
+import json
 import logging
 from app.core.config import get_settings
+from app.core.concurrency import run_blocking
+from app.core.rate_limit import get_governor
 
 logger = logging.getLogger(__name__)
 
+# 청크 벡터 ID: "{doc_id}#chunk-{index}" (문서 벡터 ID는 doc_id 그대로)
+CHUNK_ID_SEPARATOR = "#chunk-"
 
-class VectorDBService:
+
+def chunk_vector_id(doc_id: str, index: int) -> str:
+    """문서의 index번째 청크 벡터 ID"""
+    return f"{doc_id}{CHUNK_ID_SEPARATOR}{index}"
+
+
+def is_chunk_id(vector_id: str) -> bool:
+    """청크 벡터 ID인지 여부"""
+    return CHUNK_ID_SEPARATOR in vector_id
+
+
+def _estimate_vector_bytes(vector: Dict[str, Any]) -> int:
+    """upsert 요청에서 벡터 1개가 차지하는 대략적인 바이트 수"""
+    metadata_bytes = len(json.dumps(vector.get("metadata", {}), ensure_ascii=False).encode("utf-8"))
+    return metadata_bytes + len(vector["values"]) * 12 + len(vector["id"]) + 64
+
+
+def batch_vectors(
+    vectors: List[Dict[str, Any]],
+    max_count: int,
+    max_bytes: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """벡터 리스트를 개수/요청 크기 제한에 맞춰 배치로 분할
+
+    단일 벡터가 max_bytes를 넘으면 그 벡터만 담은 배치를 만듭니다.
+    """
+    batch: List[Dict[str, Any]] = []
+    batch_bytes = 0
+    for vector in vectors:
+        size = _estimate_vector_bytes(vector)
+        if batch and (len(batch) >= max_count or batch_bytes + size > max_bytes):
+            yield batch
+            batch, batch_bytes = [], 0
+        batch.append(vector)
+        batch_bytes += size
+    if batch:
+        yield batch
+
+
+class VectorDBBackend(ABC):
+    """벡터 DB 백엔드 인터페이스
+
+    서비스 레이어는 이 인터페이스만 사용하며, 실제 구현은
+    `Settings.vector_db_backend`에 따라 `get_vector_db()`가 선택합니다.
+    검색 결과는 모두 {"id", "score", "metadata"} 형태의 dict 리스트입니다.
+    """
+
+    @abstractmethod
+    def upsert_document(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        """문서 벡터 저장"""
+
+    @abstractmethod
+    def upsert_documents(self, vectors: List[Dict[str, Any]]) -> int:
+        """여러 문서 벡터를 한 번에 저장
+
+        Args:
+            vectors: {"id", "values", "metadata"} dict 리스트
+                (요청 크기 분할은 호출자가 batch_vectors로 처리)
+
+        Returns:
+            저장된 벡터 수
+        """
+
+    @abstractmethod
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        namespace: str = "",
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        """벡터 검색 (include_values면 결과에 "values" 포함: list 또는 float32 배열)"""
+
+    @abstractmethod
+    def delete_document(self, doc_id: str) -> bool:
+        """문서 삭제 (문서 벡터와 모든 청크 벡터)"""
+
+    @abstractmethod
+    def delete_vectors(self, ids: List[str]) -> int:
+        """ID로 벡터 삭제 (교체된 문서의 남는 청크 벡터 정리용)"""
+
+    @abstractmethod
+    def fetch_documents(
+        self,
+        ids: List[str],
+        include_values: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """ID로 문서 조회 ({id: {"id", "metadata"[, "values"]}}, 없는 ID는 제외)"""
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """인덱스 통계 (total_vector_count, dimension, namespace_count)"""
+
+    @abstractmethod
+    def iter_document_batches(
+        self,
+        project: Optional[str] = None,
+        batch_size: int = 100,
+        include_values: bool = False,
+        include_chunks: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """전체 문서를 배치 단위로 순회 (페이지네이션)
+
+        한 번에 batch_size개 정도만 메모리에 올리므로 코퍼스 크기와
+        무관하게 일정한 메모리로 전체를 처리할 수 있습니다.
+        기본적으로 문서 벡터만 반환하며, include_chunks면 청크 벡터도 포함합니다.
+
+        Yields:
+            {"id", "metadata"[, "values"]} dict 리스트
+        """
+
+    def iter_documents(
+        self,
+        project: Optional[str] = None,
+        batch_size: int = 100,
+        include_values: bool = False,
+        include_chunks: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """전체 문서를 하나씩 순회"""
+        for batch in self.iter_document_batches(project, batch_size, include_values, include_chunks):
+            yield from batch
+
+    def get_all_documents(
+        self,
+        project: Optional[str] = None,
+        limit: int = 200,
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        """문서 최대 limit개 조회 (프로젝트 필터 지원, include_values면 벡터 포함)"""
+        try:
+            documents = list(itertools.islice(
+                self.iter_documents(
+                    project=project,
+                    batch_size=min(limit, 100),
+                    include_values=include_values
+                ),
+                limit
+            ))
+            logger.info(f"Retrieved {len(documents)} documents")
+            return documents
+        except Exception as e:
+            logger.error(f"Error getting all documents: {e}")
+            raise
+
+    @abstractmethod
+    def query_similar(
+        self,
+        doc_id: str,
+        query_vector: List[float],
+        top_k: int = 20,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """특정 문서와 유사한 문서 검색 (자기 자신 제외)"""
+
+    # 비동기 API: 동기 구현을 공유 스레드 풀에서 실행하여 이벤트 루프를 막지 않음
+
+    async def aupsert_document(
+        self,
+        doc_id: str,
+        embedding: List[float],
+        metadata: Dict[str, Any]
+    ) -> bool:
+        return await run_blocking(self.upsert_document, doc_id, embedding, metadata)
+
+    async def aupsert_documents(self, vectors: List[Dict[str, Any]]) -> int:
+        return await run_blocking(self.upsert_documents, vectors)
+
+    async def asearch(
+        self,
+        query_embedding: List[float],
+        top_k: int = 10,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        namespace: str = "",
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        return await run_blocking(
+            self.search, query_embedding, top_k, filter_dict, namespace, include_values
+        )
+
+    async def adelete_document(self, doc_id: str) -> bool:
+        return await run_blocking(self.delete_document, doc_id)
+
+    async def adelete_vectors(self, ids: List[str]) -> int:
+        return await run_blocking(self.delete_vectors, ids)
+
+    async def afetch_documents(
+        self,
+        ids: List[str],
+        include_values: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        return await run_blocking(self.fetch_documents, ids, include_values)
+
+    async def aget_stats(self) -> Dict[str, Any]:
+        return await run_blocking(self.get_stats)
+
+    async def aget_all_documents(
+        self,
+        project: Optional[str] = None,
+        limit: int = 200,
+        include_values: bool = False
+    ) -> List[Dict[str, Any]]:
+        return await run_blocking(self.get_all_documents, project, limit, include_values)
+
+    async def aiter_document_batches(
+        self,
+        project: Optional[str] = None,
+        batch_size: int = 100,
+        include_values: bool = False,
+        include_chunks: bool = False
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """iter_document_batches의 비동기 버전 (페이지 요청마다 스레드 풀 사용)"""
+        iterator = self.iter_document_batches(project, batch_size, include_values, include_chunks)
+        while True:
+            batch = await run_blocking(next, iterator, None)
+            if batch is None:
+                break
+            yield batch
+
+    async def aquery_similar(
+        self,
+        doc_id: str,
+        query_vector: List[float],
+        top_k: int = 20,
+        filter_dict: Optional[Dict[str, Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return await run_blocking(self.query_similar, doc_id, query_vector, top_k, filter_dict)
+
+
+class VectorDBService(VectorDBBackend):
     """Pinecone 벡터 DB 서비스"""
 
     def __init__(self):
+        from pinecone import Pinecone
+        from pinecone.core.client.configuration import Configuration as OpenApiConfiguration
+
         self.settings = get_settings()
-        self.pc = Pinecone(api_key=self.settings.pinecone_api_key)
+        # urllib3 keep-alive 풀 크기를 공유 HTTP 풀 설정에 맞춤
+        # (기본값 cpu_count * 5보다 스레드 풀이 크면 연결이 버려지고 매번 새로 연결됨)
+        openapi_config = OpenApiConfiguration.get_default_copy()
+        openapi_config.connection_pool_maxsize = self.settings.http_max_keepalive_connections
+        self.pc = Pinecone(
+            api_key=self.settings.pinecone_api_key,
+            openapi_config=openapi_config
+        )
+        # 모든 Pinecone 요청은 호출 조절기를 거침 (속도 제한 + 동시 호출 수 + 재시도)
+        self.governor = get_governor("pinecone")
         self.index_name = self.settings.pinecone_index_name
         self.dimension = self.settings.embedding_dimension
         self._ensure_index()
 
+    def _call(self, func, **kwargs):
+        """Pinecone 요청 1회 (호출 조절기 경유)"""
+        return self.governor.call(lambda: func(**kwargs))
+
+    def _list_pages(self, **kwargs) -> Iterator[List[str]]:
+        """index.list ID 페이지 순회
+
+        페이지 생성기는 실패 후 이어서 재시도할 수 없으므로 페이지 요청마다 속도 제한만 적용합니다.
+        """
+        pages = self.index.list(**kwargs)
+        while True:
+            with self.governor.slot():
+                page = next(pages, None)
+            if page is None:
+                return
+            yield page
+
     def _ensure_index(self):
         """인덱스가 없으면 생성"""
         try:
-            existing_indexes = [idx.name for idx in self.pc.list_indexes()]
+            existing_indexes = [idx.name for idx in self._call(self.pc.list_indexes)]
 
             if self.index_name not in existing_indexes:
+                from pinecone import ServerlessSpec
+
                 logger.info(f"Creating Pinecone index: {self.index_name}")
-                self.pc.create_index(
+                self._call(
+                    self.pc.create_index,
                     name=self.index_name,
                     dimension=self.dimension,
                     metric="cosine",
@@ -48,7 +320,8 @@ class VectorDBService:
     ) -> bool:
         """문서 벡터를 Pinecone에 저장"""
         try:
-            self.index.upsert(
+            self._call(
+                self.index.upsert,
                 vectors=[{
                     "id": doc_id,
                     "values": embedding,
@@ -61,92 +334,153 @@ class VectorDBService:
             logger.error(f"Error upserting document {doc_id}: {e}")
             raise
 
+    def upsert_documents(self, vectors: List[Dict[str, Any]]) -> int:
+        """문서 벡터 배치를 Pinecone에 저장 (요청 1회)"""
+        try:
+            self._call(self.index.upsert, vectors=vectors)
+            logger.info(f"{len(vectors)} documents upserted successfully")
+            return len(vectors)
+        except Exception as e:
+            logger.error(f"Error upserting {len(vectors)} documents: {e}")
+            raise
+
     def search(
         self,
         query_embedding: List[float],
         top_k: int = 10,
         filter_dict: Optional[Dict[str, Any]] = None,
-        namespace: str = ""
+        namespace: str = "",
+        include_values: bool = False
     ) -> List[Dict[str, Any]]:
         """벡터 검색"""
         try:
-            results = self.index.query(
+            results = self._call(
+                self.index.query,
                 vector=query_embedding,
                 top_k=top_k,
                 filter=filter_dict,
                 namespace=namespace,
-                include_metadata=True
+                include_metadata=True,
+                include_values=include_values
             )
 
-            return [
-                {
+            matches = []
+            for match in results.matches:
+                result = {
                     "id": match.id,
                     "score": match.score,
                     "metadata": match.metadata
                 }
-                for match in results.matches
-            ]
+                if include_values:
+                    result["values"] = match.values
+                matches.append(result)
+            return matches
         except Exception as e:
             logger.error(f"Error searching: {e}")
             raise
 
     def delete_document(self, doc_id: str) -> bool:
-        """문서 삭제"""
+        """문서 삭제 (청크 벡터는 ID prefix로 list하여 함께 삭제)"""
         try:
-            self.index.delete(ids=[doc_id])
-            logger.info(f"Document {doc_id} deleted successfully")
+            ids = [doc_id]
+            for page in self._list_pages(prefix=f"{doc_id}{CHUNK_ID_SEPARATOR}"):
+                ids.extend(page)
+            self.delete_vectors(ids)
+            logger.info(f"Document {doc_id} deleted successfully ({len(ids) - 1} chunks)")
             return True
         except Exception as e:
             logger.error(f"Error deleting document {doc_id}: {e}")
             raise
 
+    def delete_vectors(self, ids: List[str]) -> int:
+        # Pinecone delete는 요청당 최대 1000개
+        for start in range(0, len(ids), 1000):
+            self._call(self.index.delete, ids=ids[start:start + 1000])
+        return len(ids)
+
+    def fetch_documents(
+        self,
+        ids: List[str],
+        include_values: bool = False
+    ) -> Dict[str, Dict[str, Any]]:
+        """ID로 문서 조회 (Pinecone fetch는 최대 1000개씩)"""
+        try:
+            documents = {}
+            for start in range(0, len(ids), 1000):
+                result = self._call(self.index.fetch, ids=ids[start:start + 1000])
+                for vector_id, vector_data in (result.vectors or {}).items():
+                    document = {
+                        "id": vector_id,
+                        "metadata": vector_data.metadata or {}
+                    }
+                    if include_values:
+                        document["values"] = vector_data.values
+                    documents[vector_id] = document
+            return documents
+        except Exception as e:
+            logger.error(f"Error fetching documents: {e}")
+            raise
+
     def get_stats(self) -> Dict[str, Any]:
-        """인덱스 통계"""
+        """인덱스 통계
+
+        Pinecone stats 객체에서 필요한 정보만 추출 (primitive types만 사용)
+        """
         try:
-            return self.index.describe_index_stats()
+            stats = self._call(self.index.describe_index_stats)
+
+            total_count = 0
+            if hasattr(stats, 'total_vector_count'):
+                total_count = int(stats.total_vector_count)
+
+            dimension = 0
+            if hasattr(stats, 'dimension'):
+                dimension = int(stats.dimension)
+
+            # namespaces는 복잡한 객체이므로 단순 카운트만 반환
+            namespace_count = 0
+            if hasattr(stats, 'namespaces') and stats.namespaces:
+                namespace_count = len(stats.namespaces)
+
+            return {
+                "total_vector_count": total_count,
+                "dimension": dimension,
+                "namespace_count": namespace_count,
+            }
         except Exception as e:
             logger.error(f"Error getting stats: {e}")
             raise
 
-    def get_all_documents(
+    def iter_document_batches(
         self,
         project: Optional[str] = None,
-        limit: int = 200
-    ) -> List[Dict[str, Any]]:
-        """모든 문서 조회 (프로젝트 필터 지원)
+        batch_size: int = 100,
+        include_values: bool = False,
+        include_chunks: bool = False
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """전체 문서를 배치 단위로 순회
 
-        Pinecone은 scan API가 없으므로 더미 벡터로 쿼리하여 모든 문서를 가져옵니다.
+        list()로 ID 페이지를 받아 fetch로 메타데이터를 가져옵니다.
+        list에는 메타데이터 필터가 없으므로 프로젝트 필터는 fetch 후 적용하고,
+        청크 벡터는 fetch 전에 ID로 걸러냅니다.
         """
         try:
-            # 더미 벡터로 쿼리 (0 벡터)
-            dummy_vector = [0.0] * self.dimension
-
-            # 필터 구성
-            filter_dict = None
-            if project:
-                filter_dict = {"project": {"$eq": project}}
-
-            # 쿼리 실행
-            results = self.index.query(
-                vector=dummy_vector,
-                top_k=limit,
-                filter=filter_dict,
-                include_metadata=True
-            )
-
-            documents = []
-            for match in results.matches:
-                doc = {
-                    "id": match.id,
-                    "metadata": match.metadata
-                }
-                documents.append(doc)
-
-            logger.info(f"Retrieved {len(documents)} documents")
-            return documents
-
+            for ids in self._list_pages(limit=batch_size):
+                if not include_chunks:
+                    ids = [vector_id for vector_id in ids if not is_chunk_id(vector_id)]
+                if not ids:
+                    continue
+                fetched = self.fetch_documents(list(ids), include_values=include_values)
+                batch = [
+                    fetched[vector_id]
+                    for vector_id in ids
+                    if vector_id in fetched
+                    and (not project or fetched[vector_id]["metadata"].get("project") == project)
+                ]
+                if batch:
+                    yield batch
         except Exception as e:
-            logger.error(f"Error getting all documents: {e}")
+            logger.error(f"Error iterating documents: {e}")
             raise
 
     def query_similar(
@@ -168,7 +502,8 @@ class VectorDBService:
             유사한 문서 리스트 (자기 자신 제외)
         """
         try:
-            results = self.index.query(
+            results = self._call(
+                self.index.query,
                 vector=query_vector,
                 top_k=top_k + 1,  # 자기 자신 포함될 수 있으므로 +1
                 filter=filter_dict,
@@ -196,8 +531,21 @@ class VectorDBService:
 _vector_db_service = None
 
 
-def get_vector_db() -> VectorDBService:
+def get_vector_db() -> VectorDBBackend:
+    """설정된 백엔드의 벡터 DB 서비스 반환
+
+    - pinecone: Pinecone Serverless (기본값)
+    - local: 프로세스 내 NumPy 인덱스 (네트워크 호출 없음)
+    """
     global _vector_db_service
     if _vector_db_service is None:
-        _vector_db_service = VectorDBService()
+        backend = get_settings().vector_db_backend
+        if backend == "pinecone":
+            _vector_db_service = VectorDBService()
+        elif backend == "local":
+            from app.services.local_vector_db import LocalVectorDBService
+            _vector_db_service = LocalVectorDBService()
+        else:
+            raise ValueError(f"Unknown vector DB backend: {backend}")
+        logger.info(f"Vector DB backend: {backend}")
     return _vector_db_service
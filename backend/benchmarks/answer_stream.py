@@ -0,0 +1,173 @@
+"""
+답변 스트리밍 벤치마크 (/api/documents/answer/stream)
+
+실제 LLM 대신 고정 지연으로 토큰을 내보내는 가짜 astream 체인을 연결하고,
+ASGI 앱을 직접 호출해 응답 본문 조각이 도착하는 시각을 잽니다.
+- TTFT: 요청 시작 → 첫 answer 이벤트 도착
+- duration: 요청 시작 → 응답 종료
+서버가 done 이벤트에 담는 metrics(first_token_ms, duration_ms)도 함께 출력합니다.
+
+실행 (backend 디렉터리에서, API 키/네트워크 불필요):
+    python -m benchmarks.answer_stream --requests 20 --first-token-delay 0.3 --token-delay 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+# 설정(get_settings)은 캐시되므로 app 모듈을 불러오기 전에 로컬 저장소와 임시 경로를 지정
+_DATA_DIR = tempfile.mkdtemp(prefix="recallmap-bench-")
+os.environ.update({
+    "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY", "bench"),
+    "COHERE_API_KEY": os.environ.get("COHERE_API_KEY", "bench"),
+    "VECTOR_DB_BACKEND": "local",
+    "LOCAL_VECTOR_DB_PATH": os.path.join(_DATA_DIR, "vector_db"),
+    "CONTENT_STORE_PATH": os.path.join(_DATA_DIR, "content.db"),
+    "LEXICAL_INDEX_PATH": os.path.join(_DATA_DIR, "lexical.db"),
+    "DEDUP_INDEX_PATH": os.path.join(_DATA_DIR, "dedup.db"),
+    "JOB_QUEUE_PATH": os.path.join(_DATA_DIR, "jobs.db"),
+})
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.main import app  # noqa: E402
+from app.services.llm_service import get_llm_service  # noqa: E402
+
+RESPONSE = (
+    "1. 답변: 하이브리드 검색은 벡터 검색과 BM25 검색을 동시에 실행한 뒤 "
+    "reciprocal rank fusion으로 순위를 결합합니다. 결합 순서는 RRF 점수로 정하고, "
+    "점수는 코사인 유사도를 유지합니다.\n\n"
+    "2. **핵심 포인트**:\n"
+    "- 벡터/BM25 동시 실행\n"
+    "- RRF 순위 결합\n"
+    "- 코사인 점수 유지\n"
+)
+
+
+class FakeAnswerChain:
+    """첫 토큰 지연 후 토큰마다 고정 지연으로 응답을 나눠 내보내는 체인"""
+
+    def __init__(self, first_token_delay: float, token_delay: float, token_chars: int):
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.token_chars = token_chars
+
+    async def astream(self, inputs):
+        await asyncio.sleep(self.first_token_delay)
+        for start in range(0, len(RESPONSE), self.token_chars):
+            yield SimpleNamespace(content=RESPONSE[start:start + self.token_chars])
+            await asyncio.sleep(self.token_delay)
+
+
+def _request_body() -> bytes:
+    results = [
+        {
+            "id": f"doc-{i}", "score": 0.9 - i * 0.1, "summary": f"요약 {i}",
+            "preview": f"미리보기 {i}", "keywords": ["검색"], "project": "bench",
+            "filename": None, "created_at": "2024-01-01T00:00:00",
+        }
+        for i in range(3)
+    ]
+    return json.dumps({"query": "하이브리드 검색은 어떻게 동작하나요?", "top_results": results}).encode("utf-8")
+
+
+async def stream_once(body: bytes) -> dict:
+    """ASGI 앱에 요청 1회 → 클라이언트 기준 TTFT/소요 시간 + 서버 metrics"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": "POST", "scheme": "http", "path": "/api/documents/answer/stream",
+        "raw_path": b"/api/documents/answer/stream", "query_string": b"format=ndjson",
+        "root_path": "", "server": ("bench", 80), "client": ("bench", 1),
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+    }
+    received = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    started = time.perf_counter()
+    first_answer_ms = None
+    buffer = b""
+    events = []
+
+    async def send(message):
+        nonlocal first_answer_ms, buffer
+        if message["type"] != "http.response.body":
+            return
+        buffer += message.get("body", b"")
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if not line.strip():
+                continue
+            event = json.loads(line)
+            if event["type"] == "answer" and first_answer_ms is None:
+                first_answer_ms = (time.perf_counter() - started) * 1000
+            events.append(event)
+
+    await app(scope, receive, send)
+    duration_ms = (time.perf_counter() - started) * 1000
+    disconnected.set()
+
+    done = next((event["data"] for event in events if event["type"] == "done"), None)
+    if done is None:
+        raise RuntimeError(f"Stream ended without done event: {events[-1:]}")
+    return {
+        "ttft_ms": first_answer_ms,
+        "duration_ms": duration_ms,
+        "server_first_token_ms": done["metrics"]["first_token_ms"],
+        "server_duration_ms": done["metrics"]["duration_ms"],
+        "answer_events": sum(1 for event in events if event["type"] == "answer"),
+    }
+
+
+def _summary(values) -> str:
+    values = sorted(values)
+    p95 = values[min(len(values) - 1, int(len(values) * 0.95))]
+    return f"median {statistics.median(values):7.1f}ms  p95 {p95:7.1f}ms"
+
+
+async def main(args):
+    get_llm_service()._answer_chain = lambda: FakeAnswerChain(
+        args.first_token_delay, args.token_delay, args.token_chars
+    )
+    body = _request_body()
+    tokens = -(-len(RESPONSE) // args.token_chars)
+    expected_ms = (args.first_token_delay + tokens * args.token_delay) * 1000
+    print(
+        f"{args.requests} requests x {args.concurrency} concurrent, {tokens} tokens "
+        f"(first token {args.first_token_delay * 1000:.0f}ms, then {args.token_delay * 1000:.0f}ms each, "
+        f"~{expected_ms:.0f}ms per answer)"
+    )
+
+    await stream_once(body)  # 워밍업 (싱글톤/체인 생성)
+    runs = []
+    for start in range(0, args.requests, args.concurrency):
+        count = min(args.concurrency, args.requests - start)
+        runs.extend(await asyncio.gather(*(stream_once(body) for _ in range(count))))
+
+    print(f"client TTFT      {_summary([run['ttft_ms'] for run in runs])}")
+    print(f"client duration  {_summary([run['duration_ms'] for run in runs])}")
+    print(f"server TTFT      {_summary([run['server_first_token_ms'] for run in runs])}")
+    print(f"server duration  {_summary([run['server_duration_ms'] for run in runs])}")
+    print(f"answer events per response: {statistics.mean(run['answer_events'] for run in runs):.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark /api/documents/answer/stream with a fake LLM stream")
+    parser.add_argument("--requests", type=int, default=20, help="총 요청 수")
+    parser.add_argument("--concurrency", type=int, default=1, help="동시 요청 수")
+    parser.add_argument("--first-token-delay", type=float, default=0.3, help="첫 토큰까지 지연 (초)")
+    parser.add_argument("--token-delay", type=float, default=0.02, help="토큰 사이 지연 (초)")
+    parser.add_argument("--token-chars", type=int, default=4, help="토큰 하나의 글자 수")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,28 @@
+"""
+테스트 공통 설정
+
+외부 API 키 없이 실행되도록 로컬 벡터 DB와 임시 데이터 경로를 사용합니다.
+설정(get_settings)은 캐시되므로 app 모듈을 불러오기 전에 환경 변수를 지정합니다.
+"""
+
+import os
+import sys
+import tempfile
+
+_DATA_DIR = tempfile.mkdtemp(prefix="recallmap-test-")
+
+os.environ.update({
+    "OPENAI_API_KEY": "test",
+    "COHERE_API_KEY": "test",
+    "VECTOR_DB_BACKEND": "local",
+    "LOCAL_VECTOR_DB_PATH": os.path.join(_DATA_DIR, "vector_db"),
+    "CONTENT_STORE_PATH": os.path.join(_DATA_DIR, "content.db"),
+    "LEXICAL_INDEX_PATH": os.path.join(_DATA_DIR, "lexical.db"),
+    "DEDUP_INDEX_PATH": os.path.join(_DATA_DIR, "dedup.db"),
+    "JOB_QUEUE_PATH": os.path.join(_DATA_DIR, "jobs.db"),
+    "EMBEDDING_CACHE_ENABLED": "false",
+    "EMBEDDING_DIMENSION": "8",
+    "TRANSFER_BATCH_SIZE": "2",
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,138 @@
+"""
+답변 스트리밍 파서 테스트
+
+토큰이 어떤 경계에서 잘려 들어와도 answer 조각을 이어 붙인 결과와
+highlight 이벤트가 한 번에 받은 경우와 같은지 확인합니다.
+"""
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+# llm_service가 불러오는 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.services.llm_service import (
+    DEFAULT_HIGHLIGHTS,
+    HIGHLIGHT_MARKER,
+    AnswerStreamParser,
+    LLMService,
+)
+
+RESPONSE = (
+    "1. 답변: 하이브리드 검색은 벡터와 BM25 순위를 결합합니다. **RRF**로 합칩니다.\n\n"
+    "2. **핵심 포인트**:\n"
+    "- 벡터 검색\n"
+    "- BM25 검색\n"
+    "- RRF 결합\n"
+    "- 네 번째 항목\n"
+)
+ANSWER = "하이브리드 검색은 벡터와 BM25 순위를 결합합니다. **RRF**로 합칩니다."
+HIGHLIGHTS = ["벡터 검색", "BM25 검색", "RRF 결합"]
+
+
+def _run(pieces):
+    parser = AnswerStreamParser()
+    events = []
+    for piece in pieces:
+        events.extend(parser.feed(piece))
+    events.extend(parser.close())
+    return events
+
+
+def _split(events):
+    answer = "".join(data for event_type, data in events if event_type == "answer")
+    highlights = [data for event_type, data in events if event_type == "highlight"]
+    return answer, highlights
+
+
+def _pieces(text: str, size: int):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 200])
+def test_any_chunking_gives_the_same_result(size):
+    assert _split(_run(_pieces(RESPONSE, size))) == (ANSWER, HIGHLIGHTS)
+
+
+def test_marker_split_across_chunks_is_not_leaked():
+    marker_start = RESPONSE.index(HIGHLIGHT_MARKER)
+    pieces = [RESPONSE[:marker_start + 2], RESPONSE[marker_start + 2:marker_start + 4], RESPONSE[marker_start + 4:]]
+
+    events = _run(pieces)
+
+    assert all(HIGHLIGHT_MARKER[:2] not in data for event_type, data in events if event_type == "answer")
+    assert _split(events) == (ANSWER, HIGHLIGHTS)
+
+
+def test_holdback_keeps_only_the_tail_before_the_marker():
+    parser = AnswerStreamParser()
+    text = "답변: " + "가" * 40
+
+    events = parser.feed(text)
+
+    # 마커가 잘려 들어올 수 있는 마지막 _HOLDBACK 글자만 보류
+    assert _split(events) == ("가" * (40 - AnswerStreamParser._HOLDBACK), [])
+    assert _split(parser.close())[0] == "가" * AnswerStreamParser._HOLDBACK
+
+
+def test_blank_lines_and_number_before_marker_are_held():
+    parser = AnswerStreamParser()
+    events = parser.feed("답변: " + "가" * 30 + "\n\n2. **")
+    events += parser.feed(HIGHLIGHT_MARKER + "\n- 하나\n")
+
+    assert _split(events) == ("가" * 30, ["하나"])
+
+
+def test_trailing_asterisks_at_chunk_boundary_are_held():
+    parser = AnswerStreamParser()
+    events = parser.feed("답변: " + "가" * 30 + "**")
+
+    assert set(_split(events)[0]) == {"가"}
+
+
+@pytest.mark.parametrize("separator", ["\n2. ", "\n2. **", "\n## ", " **", "\n\n2."])
+def test_trailing_number_before_marker_is_stripped(separator):
+    text = f"답변: 본문입니다.{separator}{HIGHLIGHT_MARKER}\n- 하나\n"
+
+    answer, highlights = _split(_run(_pieces(text, 3)))
+
+    assert answer == "본문입니다."
+    assert highlights == ["하나"]
+
+
+def test_missing_marker_falls_back_to_default_highlights():
+    answer, highlights = _split(_run(["답변: 짧은 답변입니다.  "]))
+
+    assert answer == "짧은 답변입니다."
+    assert highlights == DEFAULT_HIGHLIGHTS
+
+
+class _FakeStreamChain:
+    def __init__(self, pieces, delay: float = 0.0):
+        self.pieces = pieces
+        self.delay = delay
+
+    async def astream(self, inputs):
+        for piece in self.pieces:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(content=piece)
+
+
+def test_astream_answer_reports_ttft_and_duration():
+    service = LLMService()
+    service._answer_chain = lambda: _FakeStreamChain(_pieces(RESPONSE, 4), delay=0.005)
+    documents = [{"id": "doc-1", "summary": "요약", "preview": "미리보기", "keywords": [], "project": "p"}]
+
+    async def collect():
+        return [event async for event in service.astream_answer("질문", documents)]
+
+    events = asyncio.run(collect())
+
+    assert events[0][0] == "answer"
+    assert events[-1][0] == "done"
+    assert _split(events[:-1]) == (ANSWER, HIGHLIGHTS)
+    metrics = events[-1][1]["metrics"]
+    assert 0 < metrics["first_token_ms"] < metrics["duration_ms"]
+    assert metrics["chunks"] == len(_pieces(RESPONSE, 4))
@@ -0,0 +1,87 @@
+import pytest
+from app.core import cache as cache_module
+from app.core.cache import TTLCache, bump_corpus_version, get_corpus_version
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(cache_module.time, "monotonic", clock)
+    return clock
+
+
+def test_lru_evicts_least_recently_used():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("a", 1)
+
+    clock.now += 4.9
+    assert cache.get("a") == 1
+    clock.now += 0.2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_items_skips_expired_entries(clock):
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("old", 1)
+    clock.now += 3
+    cache.set("new", 2)
+    clock.now += 3
+
+    assert cache.items() == [("new", 2)]
+
+
+def test_max_bytes_evicts_but_keeps_newest_entry():
+    cache = TTLCache(max_entries=10, ttl_seconds=60, max_bytes=10, sizeof=len)
+    cache.set("a", "xxxx")
+    cache.set("b", "xxxx")
+    cache.set("c", "xxxx")
+
+    assert cache.get("a") is None
+    assert cache.stats()["bytes"] == 8
+
+    cache.set("big", "x" * 50)  # 상한보다 커도 마지막 항목은 유지
+    assert cache.get("big") == "x" * 50
+    assert len(cache) == 1 and cache.stats()["bytes"] == 50
+
+
+def test_update_size_recounts_in_place_changes():
+    cache = TTLCache(max_entries=10, ttl_seconds=60, max_bytes=10, sizeof=len)
+    value = ["x"]
+    cache.set("a", value)
+    cache.set("b", ["y"])
+
+    value.extend(["x"] * 9)
+    cache.update_size("a")
+
+    # update_size는 LRU 순서를 바꾸지 않으므로 커진 a가 가장 오래된 항목으로 제거됨
+    assert cache.get("a") is None
+    assert cache.get("b") == ["y"]
+    assert cache.stats()["bytes"] == 1
+
+
+def test_corpus_version_increases_monotonically():
+    before = get_corpus_version()
+
+    assert bump_corpus_version() == before + 1
+    assert get_corpus_version() == before + 1
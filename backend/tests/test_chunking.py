@@ -0,0 +1,87 @@
+import pytest
+from app.services.chunking import Chunk, _split_long, chunk_text, split_sentences
+
+
+def test_splits_on_korean_endings_and_punctuation():
+    text = "첫 문장입니다. 둘째 문장이다\n셋째 줄이에요\n끝났음\n\n새 문단! 마지막?"
+
+    assert split_sentences(text) == [
+        "첫 문장입니다.", "둘째 문장이다", "셋째 줄이에요", "끝났음", "새 문단!", "마지막?"
+    ]
+
+
+def test_korean_ending_without_newline_is_not_a_boundary():
+    assert split_sentences("그렇다 하더라도 계속된다") == ["그렇다 하더라도 계속된다"]
+
+
+def test_chunks_keep_original_separators():
+    text = "첫 문장입니다.  둘째 문장이다\n셋째 줄이에요\n\n새 문단."
+    chunks = chunk_text(text, chunk_size=100, chunk_overlap=20)
+
+    assert chunks == [Chunk(index=0, text=text)]
+
+
+def test_chunks_are_contiguous_slices_of_the_source():
+    text = "\n".join(f"{i}번째 문장입니다." for i in range(40))
+    chunks = chunk_text(text, chunk_size=60, chunk_overlap=20)
+
+    assert len(chunks) > 1
+    assert [chunk.index for chunk in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert chunk.text in text
+        assert len(chunk.text) <= 60
+    assert chunks[0].text.startswith("0번째") and chunks[-1].text.endswith("39번째 문장입니다.")
+
+
+def test_overlap_repeats_trailing_sentences_within_limit():
+    text = " ".join(f"문장{i:02d}." for i in range(20))  # 문장 7자 + 공백
+    chunks = chunk_text(text, chunk_size=31, chunk_overlap=15)
+
+    for previous, chunk in zip(chunks, chunks[1:]):
+        shared = previous.text.split()[-2:]
+        assert chunk.text.split()[:2] == shared  # 직전 청크 마지막 두 문장(15자)으로 시작
+    assert all(len(chunk.text) <= 31 for chunk in chunks)
+
+
+def test_overlap_is_capped_at_half_the_chunk_size():
+    text = " ".join(f"문장{i:02d}." for i in range(20))
+    chunks = chunk_text(text, chunk_size=31, chunk_overlap=100)
+
+    # overlap 100은 15로 줄어듦 → 위와 같은 결과
+    assert chunks == chunk_text(text, chunk_size=31, chunk_overlap=15)
+
+
+def test_split_long_covers_span_with_overlap():
+    pieces = _split_long((10, 60), chunk_size=20, chunk_overlap=5)
+
+    assert pieces == [(10, 30), (25, 45), (40, 60)]
+
+
+def test_split_long_short_tail_is_not_duplicated():
+    assert _split_long((0, 21), chunk_size=20, chunk_overlap=5) == [(0, 20), (15, 21)]
+
+
+def test_long_sentence_is_split_by_characters():
+    sentence = "가" * 50
+    chunks = chunk_text(f"짧다.\n{sentence}", chunk_size=20, chunk_overlap=5)
+
+    assert chunks[0].text == "짧다."
+    assert [len(chunk.text) for chunk in chunks[1:]] == [20, 20, 20]
+
+
+def test_blank_text_has_no_chunks():
+    assert chunk_text("  \n\n ", chunk_size=100, chunk_overlap=10) == []
+
+
+def test_single_chunk_document_uses_doc_id_only():
+    for module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+        pytest.importorskip(module)
+    from app.services.document_service import DocumentService
+
+    service = DocumentService.__new__(DocumentService)
+    metadata = {"doc_id": "doc-1", "summary": "요약", "keywords": [], "project": "p"}
+    vectors = service._build_vectors(metadata, [Chunk(index=0, text="본문")], [[1.0, 0.0]])
+
+    assert [vector["id"] for vector in vectors] == ["doc-1"]
+    assert vectors[0]["values"] == [1.0, 0.0]
+    assert metadata["chunk_count"] == 1
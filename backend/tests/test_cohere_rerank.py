@@ -0,0 +1,113 @@
+"""
+Cohere Rerank 점수 매핑/캐시 테스트
+
+응답의 result.index는 "이번에 보낸 문서 목록"(캐시 미스 문서만) 기준이므로
+원래 후보 위치로 올바르게 되돌리는지, 캐시된 문서는 다시 보내지 않는지 확인합니다.
+"""
+
+from types import SimpleNamespace
+import pytest
+
+# LLMService가 불러오는 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.services.llm_service import LLMService
+
+
+class _FakeCohere:
+    """문서 텍스트 → 점수 표로 응답하고, 결과 순서는 점수 내림차순으로 섞음"""
+
+    def __init__(self, scores, omit=()):
+        self.scores = scores
+        self.omit = set(omit)
+        self.requests = []
+
+    def rerank(self, model, query, documents, request_options=None):
+        self.requests.append(list(documents))
+        results = [
+            SimpleNamespace(index=index, relevance_score=self.scores[text])
+            for index, text in enumerate(documents)
+            if text not in self.omit
+        ]
+        results.sort(key=lambda result: result.relevance_score, reverse=True)
+        return SimpleNamespace(results=results)
+
+
+def _doc(doc_id: str, chunk_index=None):
+    doc = {"id": doc_id, "summary": f"요약 {doc_id}", "preview": f"미리보기 {doc_id}"}
+    if chunk_index is not None:
+        doc["chunk_index"] = chunk_index
+    return doc
+
+
+def _text(doc):
+    return f"{doc['summary']}\n{doc['preview']}"
+
+
+@pytest.fixture
+def service():
+    service = LLMService()
+    service.settings = service.settings.model_copy(update={"rerank_cache_enabled": True})
+    return service
+
+
+def test_result_index_maps_back_to_candidates(service):
+    documents = [_doc("a"), _doc("b"), _doc("c")]
+    service.cohere_client = _FakeCohere({_text(documents[0]): 0.1, _text(documents[1]): 0.9, _text(documents[2]): 0.5})
+
+    assert service._rerank_scores("질문", documents) == [0.1, 0.9, 0.5]
+
+    reranked = service.rerank_results("질문", documents, top_k=2)
+    assert [doc["id"] for doc in reranked] == ["b", "c"]
+    assert [doc["rerank_score"] for doc in reranked] == [0.9, 0.5]
+
+
+def test_only_uncached_documents_are_sent(service):
+    documents = [_doc("a"), _doc("b"), _doc("c")]
+    client = _FakeCohere({_text(doc): score for doc, score in zip(documents, (0.3, 0.6, 0.2))})
+    service.cohere_client = client
+    service._rerank_scores("질문", documents[:1])
+
+    # 캐시 미스 문서(b, c)만 보내고, 응답 index 0/1을 후보 위치 1/2로 매핑
+    scores = service._rerank_scores("  질문 ", documents)
+
+    assert scores == [0.3, 0.6, 0.2]
+    assert client.requests[-1] == [_text(documents[1]), _text(documents[2])]
+
+    service._rerank_scores("질문", documents)
+    assert len(client.requests) == 2  # 모두 캐시됨
+
+
+def test_cache_key_includes_query_and_chunk(service):
+    client = _FakeCohere({_text(_doc("a")): 0.4})
+    service.cohere_client = client
+
+    service._rerank_scores("질문", [_doc("a", chunk_index=0)])
+    service._rerank_scores("질문", [_doc("a", chunk_index=1)])
+    service._rerank_scores("다른 질문", [_doc("a", chunk_index=0)])
+
+    assert len(client.requests) == 3
+
+
+def test_missing_results_score_zero_and_are_not_cached(service):
+    documents = [_doc("a"), _doc("b")]
+    client = _FakeCohere({_text(documents[0]): 0.7, _text(documents[1]): 0.8}, omit={_text(documents[1])})
+    service.cohere_client = client
+
+    assert service._rerank_scores("질문", documents) == [0.7, 0.0]
+
+    client.omit.clear()
+    assert service._rerank_scores("질문", documents) == [0.7, 0.8]
+    assert client.requests[-1] == [_text(documents[1])]
+
+
+def test_cache_disabled_always_calls_cohere(service):
+    service.settings = service.settings.model_copy(update={"rerank_cache_enabled": False})
+    client = _FakeCohere({_text(_doc("a")): 0.4})
+    service.cohere_client = client
+
+    service._rerank_scores("질문", [_doc("a")])
+    service._rerank_scores("질문", [_doc("a")])
+
+    assert len(client.requests) == 2
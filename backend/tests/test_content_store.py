@@ -0,0 +1,110 @@
+import threading
+import zlib
+import pytest
+from app.services import content_store as content_store_module
+from app.services.content_store import ContentStore
+
+TEXTS = {
+    "doc-1": "한국어 원문입니다. " * 50,
+    "doc-2": "",
+    "doc-3": "emoji 🙂 and mixed 텍스트",
+}
+
+
+@pytest.fixture
+def zlib_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_store_module, "zstandard", None)
+    return ContentStore(str(tmp_path / "content.db"))
+
+
+def test_zlib_round_trip(zlib_store):
+    zlib_store.put_many(list(TEXTS.items()))
+
+    assert zlib_store.codec == "zlib"
+    assert zlib_store.get_many(list(TEXTS)) == TEXTS
+    stats = zlib_store.stats()
+    assert stats["documents"] == 3
+    assert stats["text_chars"] == sum(len(text) for text in TEXTS.values())
+    assert stats["stored_bytes"] < stats["text_chars"] * 3
+
+
+def test_get_many_skips_missing_and_duplicate_ids(zlib_store):
+    zlib_store.put("doc-1", "원문")
+
+    assert zlib_store.get_many(["doc-1", "missing", "doc-1"]) == {"doc-1": "원문"}
+    assert zlib_store.get("missing") is None
+
+
+def test_get_many_batches_past_the_variable_limit(zlib_store):
+    zlib_store.put_many([(f"doc-{i}", f"원문 {i}") for i in range(1200)])
+
+    contents = zlib_store.get_many([f"doc-{i}" for i in range(1200)])
+
+    assert len(contents) == 1200 and contents["doc-1199"] == "원문 1199"
+
+
+def test_put_overwrites_and_delete_removes(zlib_store):
+    zlib_store.put("doc-1", "이전")
+    zlib_store.put("doc-1", "이후")
+    assert zlib_store.get("doc-1") == "이후"
+
+    zlib_store.delete("doc-1")
+    assert zlib_store.get("doc-1") is None
+    assert zlib_store.stats()["documents"] == 0
+
+
+def test_zstd_rows_need_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(content_store_module, "zstandard", None)
+    store = ContentStore(str(tmp_path / "content.db"))
+    with store._lock:
+        store._conn.execute(
+            "INSERT INTO contents (doc_id, codec, data, length) VALUES (?, ?, ?, ?)",
+            ("doc-1", "zstd", b"\x28\xb5\x2f\xfd", 1)
+        )
+
+    with pytest.raises(RuntimeError):
+        store.get("doc-1")
+
+
+def test_zstd_round_trip_and_reads_zlib_rows(tmp_path):
+    pytest.importorskip("zstandard")
+    path = str(tmp_path / "content.db")
+    store = ContentStore(path)
+    store.put_many(list(TEXTS.items()))
+    # zstd 도입 전에 zlib으로 저장된 행
+    with store._lock:
+        store._conn.execute(
+            "INSERT INTO contents (doc_id, codec, data, length) VALUES (?, ?, ?, ?)",
+            ("old", "zlib", zlib.compress("예전 원문".encode("utf-8")), 5)
+        )
+        store._conn.commit()
+
+    assert store.codec == "zstd"
+    assert store.get_many([*TEXTS, "old"]) == {**TEXTS, "old": "예전 원문"}
+
+
+def test_threads_use_their_own_zstd_contexts(tmp_path):
+    pytest.importorskip("zstandard")
+    store = ContentStore(str(tmp_path / "content.db"))
+    contexts = []
+    errors = []
+
+    def worker(i: int):
+        try:
+            for j in range(20):
+                doc_id = f"doc-{i}-{j}"
+                store.put(doc_id, f"스레드 {i} 원문 {j} " * 20)
+                assert store.get(doc_id) == f"스레드 {i} 원문 {j} " * 20
+            contexts.append((store._compressor(), store._decompressor()))
+        except Exception as e:  # 스레드 예외를 메인 스레드에서 확인
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len({id(compressor) for compressor, _ in contexts}) == 8
+    assert len({id(decompressor) for _, decompressor in contexts}) == 8
@@ -0,0 +1,166 @@
+import asyncio
+import json
+from typing import AsyncIterator, List, Optional, Tuple
+import pytest
+from app.services.content_store import ContentStore
+from app.services.corpus_transfer import CorpusTransfer, ExportFormatError, encode_records
+from app.services.dedup_index import DedupIndex
+from app.services.lexical_index import LexicalIndex
+from app.services.local_vector_db import LocalVectorDBService
+from app.services.vector_db import chunk_vector_id
+
+DIMENSION = 8
+
+
+def _transfer(root) -> CorpusTransfer:
+    """임시 디렉터리의 저장소를 쓰는 CorpusTransfer"""
+    root.mkdir()
+    transfer = CorpusTransfer()
+    transfer.vector_db = LocalVectorDBService(str(root / "vector_db"))
+    transfer.content_store = ContentStore(str(root / "content.db"))
+    transfer.lexical_index = LexicalIndex(str(root / "lexical.db"))
+    transfer.dedup_index = DedupIndex(str(root / "dedup.db"))
+    return transfer
+
+
+def _vector(seed: int) -> List[float]:
+    return [float((seed * 7 + i) % 5) + 0.5 for i in range(DIMENSION)]
+
+
+def _populate(transfer: CorpusTransfer):
+    """문서 3개 (doc-0은 청크 2개) + 원문"""
+    vectors = []
+    texts = []
+    for i in range(3):
+        doc_id = f"doc-{i}"
+        chunk_count = 2 if i == 0 else 1
+        text = f"문서 {i} 원문입니다. 사과와 바나나 이야기 {i}"
+        vectors.append({
+            "id": doc_id,
+            "values": _vector(i),
+            "metadata": {"doc_id": doc_id, "project": "p", "summary": f"요약 {i}", "chunk_count": chunk_count},
+        })
+        for index in range(chunk_count if chunk_count > 1 else 0):
+            vectors.append({
+                "id": chunk_vector_id(doc_id, index),
+                "values": _vector(10 + index),
+                "metadata": {"doc_id": doc_id, "project": "p", "chunk_index": index},
+            })
+        texts.append((doc_id, text))
+    transfer.vector_db.upsert_documents(vectors)
+    transfer.content_store.put_many(texts)
+    return vectors, dict(texts)
+
+
+async def _export(transfer: CorpusTransfer) -> bytes:
+    return b"".join([encode_records(records) async for records in transfer.export_batches()])
+
+
+async def _lines(data: bytes) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    for number, line in enumerate(data.split(b"\n")):
+        if line.strip():
+            yield number, line
+
+
+def test_export_import_round_trip(tmp_path):
+    source = _transfer(tmp_path / "source")
+    target = _transfer(tmp_path / "target")
+    vectors, texts = _populate(source)
+
+    data = asyncio.run(_export(source))
+    records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+    assert records[0]["type"] == "header"
+    assert records[-1] == {"type": "done", "data": {"documents": 3, "chunks": 2}}
+
+    result = asyncio.run(target.import_lines(_lines(data)))
+
+    assert (result["documents"], result["chunks"], result["failed"]) == (3, 2, 0)
+    fetched = target.vector_db.fetch_documents([vector["id"] for vector in vectors], include_values=True)
+    for vector in vectors:
+        assert fetched[vector["id"]]["values"] == pytest.approx(vector["values"])
+        assert fetched[vector["id"]]["metadata"] == vector["metadata"]
+    assert target.content_store.get_many(list(texts)) == texts
+    assert target.lexical_index.stats()["documents"] == 3
+    signature = target.dedup_index.signature(texts["doc-1"])
+    assert target.dedup_index.find("p", signature).doc_id == "doc-1"
+
+
+def test_import_reports_bad_lines_and_keeps_the_rest(tmp_path):
+    source = _transfer(tmp_path / "source")
+    target = _transfer(tmp_path / "target")
+    _populate(source)
+    data = asyncio.run(_export(source))
+    exported_lines = data.count(b"\n")
+    broken = b'{"type": "document", "data": {"id": "x", "metadata": {}, "values": [1.0]}}'
+    data += b"not json\n" + broken + b"\n"
+
+    result = asyncio.run(target.import_lines(_lines(data)))
+
+    assert result["documents"] == 3
+    assert result["failed"] == 2
+    assert [error["line"] for error in result["errors"]] == [exported_lines, exported_lines + 1]
+
+
+def test_import_rejects_other_embedding_model(tmp_path):
+    target = _transfer(tmp_path / "target")
+    header = {"type": "header", "data": {
+        "format": "recallmap-export", "version": 1, "embedding_model": "other-model", "dimension": DIMENSION,
+    }}
+
+    with pytest.raises(ExportFormatError):
+        asyncio.run(target.import_lines(_lines(json.dumps(header).encode("utf-8"))))
+    with pytest.raises(ExportFormatError):
+        asyncio.run(target.import_lines(_lines(b'{"type": "document"}')))
+
+
+def test_backfill_moves_full_text_to_content_store(tmp_path):
+    transfer = _transfer(tmp_path / "store")
+    transfer.vector_db.upsert_documents([
+        {"id": "legacy", "values": _vector(0), "metadata": {"doc_id": "legacy", "full_text": "예전 원문"}},
+        {"id": "stored", "values": _vector(1), "metadata": {"doc_id": "stored", "full_text": "메타데이터 원문"}},
+        {"id": "current", "values": _vector(2), "metadata": {"doc_id": "current"}},
+    ])
+    transfer.content_store.put("stored", "저장소 원문")
+
+    result = asyncio.run(transfer.backfill_content_store())
+
+    assert (result["scanned"], result["migrated"]) == (3, 2)
+    fetched = transfer.vector_db.fetch_documents(["legacy", "stored", "current"], include_values=True)
+    assert all("full_text" not in document["metadata"] for document in fetched.values())
+    assert fetched["legacy"]["values"] == pytest.approx(_vector(0))
+    # 이미 원문 저장소에 있는 원문은 덮어쓰지 않음
+    assert transfer.content_store.get_many(["legacy", "stored"]) == {
+        "legacy": "예전 원문", "stored": "저장소 원문"
+    }
+
+    again = asyncio.run(transfer.backfill_content_store())
+    assert again["migrated"] == 0
+
+
+def test_rebuild_lexical_index_from_vector_db(tmp_path):
+    transfer = _transfer(tmp_path / "store")
+    _populate(transfer)
+    transfer.vector_db.upsert_documents([
+        {"id": "legacy", "values": _vector(5), "metadata": {"doc_id": "legacy", "full_text": "체리 원문"}},
+    ])
+    transfer.lexical_index.add_documents([("gone", "p", "", "삭제된 문서")])
+
+    # 색인은 있지만 비어 있지 않으므로 경고 없음
+    assert asyncio.run(transfer.check_lexical_index()) is False
+
+    result = asyncio.run(transfer.rebuild_lexical_index())
+
+    assert (result["documents"], result["removed"]) == (4, 1)
+    assert sorted(transfer.lexical_index.doc_ids()) == ["doc-0", "doc-1", "doc-2", "legacy"]
+    assert [doc_id for doc_id, _ in transfer.lexical_index.search("바나나 이야기 1")][0] == "doc-1"
+    assert [doc_id for doc_id, _ in transfer.lexical_index.search("체리")] == ["legacy"]
+
+
+def test_empty_lexical_index_is_reported(tmp_path, caplog):
+    transfer = _transfer(tmp_path / "store")
+    assert asyncio.run(transfer.check_lexical_index()) is False  # 둘 다 비어 있음
+
+    _populate(transfer)
+    with caplog.at_level("WARNING"):
+        assert asyncio.run(transfer.check_lexical_index()) is True
+    assert "rebuild-lexical" in caplog.text
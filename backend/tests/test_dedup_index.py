@@ -0,0 +1,74 @@
+import random
+import zlib
+import numpy as np
+import pytest
+from app.services import dedup_index
+from app.services.dedup_index import DedupIndex, normalize_text
+
+
+def _text(seed: int, words: int = 300) -> str:
+    generator = random.Random(seed)
+    vocabulary = ["사과", "바나나", "포도", "문서", "검색", "그래프", "노트", "apple", "vector", "index"]
+    return " ".join(generator.choice(vocabulary) + str(generator.randint(0, 50)) for _ in range(words))
+
+
+def _reference_minhash(index: DedupIndex, text: str) -> np.ndarray:
+    """shingle 집합 전체 × 순열 행렬로 계산한 MinHash (블록 계산과 비교용)"""
+    normalized = normalize_text(text)
+    shingles = {normalized[i:i + dedup_index._SHINGLE_SIZE] for i in range(len(normalized) - dedup_index._SHINGLE_SIZE + 1)}
+    hashes = np.array([zlib.crc32(shingle.encode("utf-8")) for shingle in shingles], dtype=np.uint64)
+    permuted = (np.outer(hashes, index._a) + index._b) % dedup_index._MERSENNE_PRIME & dedup_index._MAX_HASH
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+@pytest.fixture
+def index(tmp_path):
+    return DedupIndex(str(tmp_path / "dedup.db"), num_perm=64, bands=16, near_threshold=0.8)
+
+
+def test_exact_duplicate_ignores_case_and_whitespace(index):
+    index.add_many([("a", "p", index.signature("Hello   World\n문서"))])
+
+    match = index.find("p", index.signature("hello world 문서"))
+
+    assert match is not None
+    assert (match.doc_id, match.kind, match.similarity) == ("a", "exact", 1.0)
+
+
+def test_near_duplicate_found_only_in_same_project(index):
+    original = _text(1)
+    edited = original.replace("사과", "사과!", 2)
+    index.add_many([("a", "p", index.signature(original))])
+
+    match = index.find("p", index.signature(edited))
+
+    assert match is not None and match.kind == "near" and match.doc_id == "a"
+    assert match.similarity >= 0.8
+    assert index.find("q", index.signature(edited)) is None
+    assert index.find("p", index.signature(edited), exact_only=True) is None
+
+
+def test_unrelated_text_is_not_a_duplicate(index):
+    index.add_many([("a", "p", index.signature(_text(1)))])
+
+    assert index.find("p", index.signature(_text(2))) is None
+
+
+def test_blockwise_signature_matches_full_matrix(index):
+    # shingle 수가 _HASH_BLOCK보다 많아 여러 블록으로 나뉘는 텍스트
+    text = _text(3, words=6000)
+    assert len(text) > 2 * dedup_index._HASH_BLOCK
+
+    assert np.array_equal(index.signature(text).minhash, _reference_minhash(index, text))
+
+
+def test_signatures_survive_reload_and_remove(index):
+    signature = index.signature(_text(4))
+    index.add_many([("a", "p", signature)])
+
+    reloaded = DedupIndex(index.path, num_perm=64, bands=16, near_threshold=0.8)
+    assert reloaded.find("p", signature).doc_id == "a"
+
+    reloaded.remove("a")
+    assert reloaded.find("p", signature) is None
+    assert DedupIndex(index.path).stats()["documents"] == 0
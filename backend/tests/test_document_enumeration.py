@@ -0,0 +1,109 @@
+"""
+전체 문서 순회(페이지네이션) 테스트
+
+Pinecone 백엔드는 list 페이지 + fetch 배치로 문서를 순회하므로,
+가짜 인덱스로 200개 상한이 없는지, 청크/프로젝트 필터가 맞는지 확인합니다.
+"""
+
+from types import SimpleNamespace
+import pytest
+from app.core.rate_limit import get_governor
+from app.services.local_vector_db import LocalVectorDBService
+from app.services.vector_db import VectorDBService, chunk_vector_id
+
+DIMENSION = 8
+
+
+class _FakeIndex:
+    """index.list / index.fetch만 흉내 내는 Pinecone 인덱스"""
+
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.fetch_sizes = []
+
+    def list(self, limit=100):
+        ids = list(self.vectors)
+        for start in range(0, len(ids), limit):
+            yield ids[start:start + limit]
+
+    def fetch(self, ids):
+        self.fetch_sizes.append(len(ids))
+        return SimpleNamespace(vectors={
+            vector_id: SimpleNamespace(
+                values=self.vectors[vector_id]["values"],
+                metadata=self.vectors[vector_id]["metadata"]
+            )
+            for vector_id in ids
+            if vector_id in self.vectors
+        })
+
+
+def _vectors(count: int):
+    vectors = {}
+    for i in range(count):
+        doc_id = f"doc-{i}"
+        metadata = {"doc_id": doc_id, "project": "a" if i % 2 else "b"}
+        vectors[doc_id] = {"values": [float(i)] * DIMENSION, "metadata": metadata}
+        vectors[chunk_vector_id(doc_id, 0)] = {"values": [0.0] * DIMENSION, "metadata": metadata}
+    return vectors
+
+
+@pytest.fixture
+def index():
+    return _FakeIndex(_vectors(250))
+
+
+@pytest.fixture
+def pinecone(index):
+    # __init__은 Pinecone 클라이언트를 만들므로 건너뛰고 인덱스만 연결
+    service = VectorDBService.__new__(VectorDBService)
+    service.index = index
+    service.governor = get_governor("pinecone")
+    return service
+
+
+def test_get_all_documents_is_not_capped_at_200(pinecone):
+    documents = pinecone.get_all_documents(limit=1000)
+
+    assert [doc["id"] for doc in documents] == [f"doc-{i}" for i in range(250)]
+    assert all("values" not in doc for doc in documents)
+
+
+def test_batches_skip_chunks_and_filter_by_project(pinecone, index):
+    batches = list(pinecone.iter_document_batches(project="a", batch_size=40, include_values=True))
+
+    ids = [doc["id"] for batch in batches for doc in batch]
+    assert ids == [f"doc-{i}" for i in range(1, 250, 2)]
+    assert all(len(doc["values"]) == DIMENSION for batch in batches for doc in batch)
+    # 청크 ID는 fetch 전에 걸러지므로 fetch 크기는 페이지의 문서 벡터 수 이하
+    assert max(index.fetch_sizes) <= 40
+
+
+def test_include_chunks_yields_chunk_vectors(pinecone):
+    ids = [doc["id"] for doc in pinecone.iter_documents(batch_size=100, include_chunks=True)]
+
+    assert len(ids) == 500
+    assert chunk_vector_id("doc-0", 0) in ids
+
+
+def test_get_all_documents_respects_limit(pinecone, index):
+    documents = pinecone.get_all_documents(limit=30)
+
+    assert len(documents) == 30
+    assert index.fetch_sizes[0] <= 30
+
+
+def test_local_batches_skip_rows_deleted_during_iteration(tmp_path):
+    vector_db = LocalVectorDBService(str(tmp_path / "vectors"))
+    vector_db.upsert_documents([
+        {"id": f"doc-{i}", "values": [1.0] * DIMENSION, "metadata": {"doc_id": f"doc-{i}"}}
+        for i in range(6)
+    ])
+
+    ids = []
+    for batch in vector_db.iter_document_batches(batch_size=2):
+        ids.extend(doc["id"] for doc in batch)
+        if len(ids) == 2:
+            vector_db.delete_document("doc-3")
+
+    assert ids == ["doc-0", "doc-1", "doc-2", "doc-4", "doc-5"]
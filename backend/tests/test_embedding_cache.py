@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from app.services.embedding_cache import EmbeddingCache
+
+
+def _cache(tmp_path, memory_size=2, disk_size=100, model="m"):
+    return EmbeddingCache(model, 3, memory_size=memory_size, disk_size=disk_size, path=str(tmp_path / "cache.db"))
+
+
+def test_memory_lru_evicts_least_recently_used(tmp_path):
+    cache = EmbeddingCache("m", 3, memory_size=2, disk_size=0)
+    cache.put_many(["a", "b"], [[1, 1, 1], [2, 2, 2]])
+    cache.get("a")  # a가 최근 사용
+    cache.put("c", [3, 3, 3])
+
+    assert cache.get_many(["a", "b", "c"]) == [[1, 1, 1], None, [3, 3, 3]]
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"], stats["memory_evictions"]) == (3, 1, 1)
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    _cache(tmp_path).put_many(["a", "b"], [[1, 2, 3], [4, 5, 6]])
+
+    reopened = _cache(tmp_path)
+
+    assert reopened.get_many(["a", "b", "x"]) == [[1.0, 2.0, 3.0], [4.0, 5.0, 6.0], None]
+    assert reopened.stats()["disk_hits"] == 2
+    assert reopened.get("a") == [1.0, 2.0, 3.0]
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_model_change_does_not_reuse_entries(tmp_path):
+    _cache(tmp_path).put("a", [1, 2, 3])
+
+    assert _cache(tmp_path, model="other").get("a") is None
+
+
+def test_get_many_reads_disk_in_one_batch(tmp_path):
+    texts = [f"text-{i}" for i in range(20)]
+    _cache(tmp_path).put_many(texts, [[i, i, i] for i in range(20)])
+    cache = _cache(tmp_path)
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+
+    embeddings = cache.get_many(texts + ["missing"])
+
+    assert embeddings[:20] == [[float(i)] * 3 for i in range(20)]
+    assert embeddings[20] is None
+    assert sum(statement.startswith("SELECT") for statement in statements) == 1
+    assert sum(statement.startswith("UPDATE") for statement in statements) == 20  # executemany 1회
+    assert sum(statement == "COMMIT" for statement in statements) == 1
+
+
+def test_disk_eviction_drops_least_recently_accessed(tmp_path):
+    cache = _cache(tmp_path, memory_size=1, disk_size=10)
+    cache.put_many([f"old-{i}" for i in range(5)], [[i, i, i] for i in range(5)])
+    cache.put_many([f"new-{i}" for i in range(5)], [[i, i, i] for i in range(5)])
+    cache.get_many([f"old-{i}" for i in range(5)])  # 접근 시각 갱신
+
+    cache.put("extra", [9, 9, 9])
+
+    reopened = _cache(tmp_path, memory_size=1, disk_size=10)
+    assert reopened.stats()["disk_entries"] <= 10
+    assert cache.stats()["disk_evictions"] == 2
+    assert all(embedding is not None for embedding in reopened.get_many([f"old-{i}" for i in range(5)]))
+    assert reopened.get_many([f"new-{i}" for i in range(5)]).count(None) == 2
+
+
+def test_async_api_matches_sync_api(tmp_path):
+    cache = _cache(tmp_path)
+
+    async def run():
+        await cache.aput_many(["a", "b"], [[1, 2, 3], [4, 5, 6]])
+        await cache.aput("c", [7, 8, 9])
+        return await cache.aget_many(["a", "c", "x"]), await cache.aget("b")
+
+    many, single = asyncio.run(run())
+
+    assert many == [[1.0, 2.0, 3.0], [7, 8, 9], None]
+    assert single == [4.0, 5.0, 6.0]
+    assert _cache(tmp_path).get("c") == [7.0, 8.0, 9.0]
@@ -0,0 +1,99 @@
+"""
+요약 + 키워드 한 번 호출(JSON) 테스트
+
+JSON 응답이 깨졌거나 스키마에 맞지 않으면 요약/키워드 개별 호출로 다시 만들고,
+호출 자체의 오류는 개별 호출로 넘어가지 않고 그대로 전달하는지 확인합니다.
+"""
+
+import asyncio
+from types import SimpleNamespace
+import pytest
+
+# LLMService가 불러오는 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.services.llm_service import LLMService
+
+
+class _FakeChain:
+    """고정 응답(또는 예외)을 돌려주는 체인"""
+
+    def __init__(self, content=None, error=None):
+        self.content = content
+        self.error = error
+        self.calls = 0
+
+    def _respond(self):
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(content=self.content)
+
+    def invoke(self, inputs):
+        return self._respond()
+
+    async def ainvoke(self, inputs):
+        return self._respond()
+
+
+@pytest.fixture
+def service():
+    service = LLMService()
+    service.settings = service.settings.model_copy(update={"ingest_enrichment_mode": "combined"})
+    service._chains["summary"] = _FakeChain("개별 요약")
+    service._chains["keyword"] = _FakeChain("개별, 키워드")
+    return service
+
+
+def _enrich(service, content=None, error=None, use_async=False):
+    service._chains["enrichment"] = _FakeChain(content, error)
+    if use_async:
+        return asyncio.run(service.aenrich_document("원문", max_keywords=3))
+    return service.enrich_document("원문", max_keywords=3)
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_valid_json_uses_a_single_call(service, use_async):
+    content = '{"summary": " 요약 ", "keywords": ["a", " b ", "a", "", "c", "d"]}'
+
+    result = _enrich(service, content, use_async=use_async)
+
+    assert result == ("요약", ["a", "b", "c"])
+    assert service._chains["summary"].calls == service._chains["keyword"].calls == 0
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+@pytest.mark.parametrize("content", [
+    "요약: 이건 JSON이 아님",                          # 잘못된 JSON
+    '{"summary": "요약"',                              # 잘린 JSON
+    '{"summary": "요약"}',                             # keywords 없음
+    '{"keywords": ["a"]}',                             # summary 없음
+    '{"summary": "요약", "keywords": "a, b"}',         # keywords가 문자열
+    '{"summary": "요약", "keywords": [1, 2]}',         # keywords 항목이 숫자
+    '{"summary": "   ", "keywords": ["a"]}',           # 공백뿐인 요약
+    '{"summary": "요약", "keywords": [" ", ""]}',      # 빈 키워드
+])
+def test_invalid_response_falls_back_to_separate_calls(service, content, use_async):
+    result = _enrich(service, content, use_async=use_async)
+
+    assert result == ("개별 요약", ["개별", "키워드"])
+    assert service._chains["enrichment"].calls == 1
+    assert service._chains["summary"].calls == service._chains["keyword"].calls == 1
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_call_error_is_raised_without_fallback(service, use_async):
+    with pytest.raises(RuntimeError, match="quota"):
+        _enrich(service, error=RuntimeError("quota exceeded"), use_async=use_async)
+
+    assert service._chains["summary"].calls == service._chains["keyword"].calls == 0
+
+
+def test_separate_mode_skips_the_combined_call(service):
+    service.settings = service.settings.model_copy(update={"ingest_enrichment_mode": "separate"})
+
+    result = _enrich(service, '{"summary": "요약", "keywords": ["a"]}')
+
+    assert result == ("개별 요약", ["개별", "키워드"])
+    assert service._chains["enrichment"].calls == 0
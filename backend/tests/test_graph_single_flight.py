@@ -0,0 +1,91 @@
+import asyncio
+from types import SimpleNamespace
+import pytest
+from app.services.graph_service import GraphService
+
+KEY = (None, 50)
+
+
+@pytest.fixture
+def service():
+    service = GraphService()
+    return service
+
+
+def _slow_build(service, builds, delay=0.05):
+    async def build(project, top_k, min_similarity):
+        builds.append((project, top_k))
+        await asyncio.sleep(delay)
+        return SimpleNamespace(min_similarity=min_similarity)
+    service._build_snapshot = build
+
+
+def test_concurrent_requests_share_one_build(service):
+    builds = []
+    _slow_build(service, builds)
+
+    async def run():
+        return await asyncio.gather(*(service._build_single_flight(KEY, 0.5) for _ in range(5)))
+
+    snapshots = asyncio.run(run())
+
+    assert len(builds) == 1
+    assert all(snapshot is snapshots[0] for snapshot in snapshots)
+    assert service._inflight == {}
+
+
+def test_follower_rebuilds_when_leader_is_cancelled(service):
+    builds = []
+    _slow_build(service, builds)
+
+    async def run():
+        leader = asyncio.create_task(service._build_single_flight(KEY, 0.5))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(service._build_single_flight(KEY, 0.5))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await asyncio.wait_for(follower, timeout=1.0)
+
+    snapshot = asyncio.run(run())
+
+    assert snapshot.min_similarity == 0.5
+    assert len(builds) == 2
+    assert service._inflight == {}
+
+
+def test_cancelled_follower_does_not_cancel_the_build(service):
+    builds = []
+    _slow_build(service, builds)
+
+    async def run():
+        leader = asyncio.create_task(service._build_single_flight(KEY, 0.5))
+        await asyncio.sleep(0.01)
+        follower = asyncio.create_task(service._build_single_flight(KEY, 0.5))
+        await asyncio.sleep(0.01)
+        follower.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await follower
+        return await leader
+
+    assert asyncio.run(run()).min_similarity == 0.5
+    assert len(builds) == 1
+
+
+def test_build_error_reaches_followers(service):
+    async def failing_build(project, top_k, min_similarity):
+        await asyncio.sleep(0.02)
+        raise RuntimeError("vector db down")
+    service._build_snapshot = failing_build
+
+    async def run():
+        return await asyncio.gather(
+            *(service._build_single_flight(KEY, 0.5) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert service._inflight == {}
@@ -0,0 +1,98 @@
+"""
+캐시 그래프 증분 갱신 테스트
+
+문서 추가/삭제를 캐시된 GraphSnapshot에 증분 반영한 결과가
+같은 코퍼스로 처음부터 다시 만든 그래프와 같은지 확인합니다.
+"""
+
+import asyncio
+import pytest
+from app.services.graph_service import GraphService
+from app.services.local_vector_db import LocalVectorDBService
+
+DIMENSION = 8
+MIN_SIMILARITY = 0.3
+
+
+def _document(i: int, project: str = "p"):
+    values = [0.0] * DIMENSION
+    values[i % DIMENSION] = 1.0
+    values[(i + 1) % DIMENSION] = 0.5
+    return {
+        "id": f"doc-{i}",
+        "values": values,
+        "metadata": {
+            "doc_id": f"doc-{i}", "summary": f"요약 {i}", "keywords": [f"k{i % 3}"],
+            "project": project, "created_at": "2024-01-01T00:00:00",
+        },
+    }
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = GraphService()
+    service.vector_db = LocalVectorDBService(str(tmp_path / "vectors"))
+    service.vector_db.upsert_documents([_document(i) for i in range(5)])
+    return service
+
+
+def _build(service: GraphService, project=None, top_k=50):
+    return asyncio.run(service._build_snapshot(project, top_k, MIN_SIMILARITY))
+
+
+def _edge_set(snapshot):
+    return {(e.source, e.target, e.weight, e.edge_type) for e in snapshot.edges.values()}
+
+
+def test_added_document_matches_full_rebuild(service):
+    cached = _build(service)
+    document = _document(5)
+    service.vector_db.upsert_documents([document])
+    service.add_document(document["id"], document["values"], document["metadata"])
+
+    rebuilt = _build(service)
+
+    assert cached.ids == rebuilt.ids
+    assert set(cached.nodes) == set(rebuilt.nodes)
+    assert _edge_set(cached) == _edge_set(rebuilt)
+    assert cached.vectors.shape == (6, DIMENSION)
+    assert service._cache.stats()["bytes"] == cached.nbytes()
+
+
+def test_removed_document_drops_node_edges_and_row(service):
+    cached = _build(service)
+    neighbors = set(cached.adjacency["doc-2"])
+    assert neighbors  # 제거할 노드에 엣지가 있어야 의미 있는 테스트
+
+    service.vector_db.delete_document("doc-2")
+    service.remove_document("doc-2")
+
+    rebuilt = _build(service)
+    assert "doc-2" not in cached.nodes and "doc-2" not in cached.adjacency
+    assert all("doc-2" not in key for key in cached.edges)
+    assert all("doc-2" not in cached.adjacency[neighbor] for neighbor in neighbors)
+    assert cached.ids == rebuilt.ids
+    assert cached.vectors.shape == (4, DIMENSION)
+    assert _edge_set(cached) == _edge_set(rebuilt)
+
+
+def test_add_skips_other_projects_and_full_graphs(service):
+    project_graph = _build(service, project="p")
+    full_graph = _build(service, top_k=5)
+
+    other = _document(6, project="other")
+    service.add_document(other["id"], other["values"], other["metadata"])
+    assert "doc-6" not in project_graph.nodes
+    assert "doc-6" not in full_graph.nodes
+
+    same = _document(7)
+    service.add_document(same["id"], same["values"], same["metadata"])
+    assert "doc-7" in project_graph.nodes
+    assert "doc-7" not in full_graph.nodes  # top_k(5)에 도달한 그래프는 건너뜀
+
+
+def test_remove_unknown_node_is_noop(service):
+    snapshot = _build(service)
+
+    assert snapshot.remove_node("missing") is False
+    assert len(snapshot.nodes) == 5
@@ -0,0 +1,69 @@
+"""
+하이브리드 검색 결합(RRF) 테스트
+
+벡터/BM25 순위가 reciprocal rank fusion으로 합쳐지는 순서와,
+BM25에서만 찾은 문서의 score(코사인 유사도) 계산을 확인합니다.
+"""
+
+import asyncio
+import pytest
+
+# DocumentService가 불러오는 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.services.document_service import DocumentService
+from app.services.local_vector_db import LocalVectorDBService
+
+DIMENSION = 8
+
+
+def _values(i: int):
+    values = [0.0] * DIMENSION
+    values[i] = 1.0
+    return values
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = DocumentService()
+    service.vector_db = LocalVectorDBService(str(tmp_path / "vectors"))
+    service.vector_db.upsert_documents([
+        {"id": f"doc-{i}", "values": _values(i), "metadata": {"doc_id": f"doc-{i}"}}
+        for i in range(4)
+    ])
+    return service
+
+
+def _vector_result(i: int, score: float):
+    return {"id": f"doc-{i}", "score": score, "metadata": {"doc_id": f"doc-{i}"}}
+
+
+def _fuse(service, vector_results, lexical_hits, query):
+    return asyncio.run(service._fuse_results(vector_results, lexical_hits, query))
+
+
+def test_documents_in_both_lists_rank_first(service):
+    rrf_k = service.settings.rrf_k
+    vector_results = [_vector_result(0, 0.9), _vector_result(1, 0.8), _vector_result(2, 0.7)]
+    lexical_hits = [("doc-2", 5.0), ("doc-1", 3.0)]
+
+    fused = _fuse(service, vector_results, lexical_hits, _values(0))
+
+    assert [result["id"] for result in fused] == ["doc-2", "doc-1", "doc-0"]
+    assert fused[0]["fusion_score"] == pytest.approx(1 / (rrf_k + 3) + 1 / (rrf_k + 1))
+    assert fused[2]["fusion_score"] == pytest.approx(1 / (rrf_k + 1))
+    # score는 RRF가 아니라 벡터 검색의 코사인 유사도
+    assert [result["score"] for result in fused] == [0.7, 0.8, 0.9]
+
+
+def test_lexical_only_hits_get_cosine_score_from_stored_vector(service):
+    query = [1.0, 1.0] + [0.0] * (DIMENSION - 2)
+
+    fused = _fuse(service, [_vector_result(0, 0.7)], [("doc-1", 2.0), ("missing", 1.0)], query)
+
+    # doc-0과 doc-1은 같은 순위(1위) → 같은 RRF 점수, 색인에만 남은 문서는 제외
+    assert {result["id"] for result in fused} == {"doc-0", "doc-1"}
+    lexical_only = next(result for result in fused if result["id"] == "doc-1")
+    assert lexical_only["score"] == pytest.approx(2 ** -0.5)
+    assert lexical_only["fusion_score"] == fused[0]["fusion_score"]
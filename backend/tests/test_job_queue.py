@@ -0,0 +1,269 @@
+"""
+작업 큐 lease / 복구 / 체크포인트 테스트
+
+같은 큐 파일을 여는 JobQueue 두 개로 프로세스 두 개를 흉내 내고,
+lease 만료 시각은 job_queue 모듈의 시계를 바꿔 조절합니다.
+"""
+
+import asyncio
+import sqlite3
+from types import SimpleNamespace
+import pytest
+
+# job_queue가 불러오는 document_service의 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.services import job_queue
+from app.services.job_queue import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue
+
+LEASE = 30.0
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(job_queue, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+async def _noop(payload, report_progress, checkpoint=None):
+    return {}
+
+
+def _queue(path, handlers=None, **kwargs) -> JobQueue:
+    return JobQueue(str(path), handlers or {"ingest": _noop}, workers=1, lease_seconds=LEASE, **kwargs)
+
+
+def _row(queue: JobQueue, job_id: str):
+    return queue._conn.execute(
+        "SELECT status, owner, lease_expires_at, attempts, checkpoint FROM jobs WHERE id = ?", (job_id,)
+    ).fetchone()
+
+
+def test_claim_records_owner_and_lease(tmp_path, clock):
+    first = _queue(tmp_path / "jobs.db")
+    second = _queue(tmp_path / "jobs.db")
+    job = first.create("ingest", {"documents": []}, total=0)
+
+    claimed = first._claim(job["id"])
+
+    assert claimed == {"kind": "ingest", "payload": {"documents": []}, "checkpoint": None}
+    status, owner, lease, attempts, _ = _row(first, job["id"])
+    assert (status, owner, lease, attempts) == (RUNNING, first.owner, clock.now + LEASE, 1)
+    assert second._claim(job["id"]) is None
+    assert first.owner != second.owner
+
+
+def test_recover_only_requeues_expired_leases(tmp_path, clock):
+    worker = _queue(tmp_path / "jobs.db")
+    other = _queue(tmp_path / "jobs.db")
+    job = worker.create("ingest", {}, total=0)
+    worker._claim(job["id"])
+
+    clock.now += LEASE - 1
+    assert other._recover() == []
+    assert worker._renew(job["id"])  # heartbeat → lease 연장
+
+    clock.now += LEASE - 1
+    assert other._recover() == []
+
+    clock.now += 2
+    assert other._recover() == [job["id"]]
+    assert _row(other, job["id"])[:3] == (QUEUED, None, None)
+
+    # 작업을 잃은 워커는 진행률/결과를 기록하지 못함
+    assert not worker._renew(job["id"])
+    assert not worker._set_progress(job["id"], 1)
+    assert not worker._finish(job["id"], SUCCEEDED, {})
+    assert other.get(job["id"])["status"] == QUEUED
+
+
+def test_legacy_running_jobs_without_lease_are_recovered(tmp_path, clock):
+    path = tmp_path / "jobs.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE jobs (id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, "
+        "payload TEXT, total INTEGER NOT NULL, completed INTEGER NOT NULL DEFAULT 0, "
+        "attempts INTEGER NOT NULL DEFAULT 0, result TEXT, error TEXT, "
+        "created_at TEXT NOT NULL, started_at TEXT, finished_at TEXT)"
+    )
+    conn.execute(
+        "INSERT INTO jobs (id, kind, status, payload, total, attempts, created_at) "
+        "VALUES ('old', 'ingest', 'running', '{}', 0, 1, '2024-01-01T00:00:00')"
+    )
+    conn.commit()
+    conn.close()
+
+    queue = _queue(path)
+
+    assert queue._recover() == ["old"]
+    assert queue._claim("old")["checkpoint"] is None
+
+
+def test_retry_exhaustion_fails_the_job(tmp_path, clock):
+    queue = _queue(tmp_path / "jobs.db", max_attempts=2)
+    job = queue.create("ingest", {}, total=0)
+
+    for _ in range(2):
+        assert queue._claim(job["id"]) is not None
+        clock.now += LEASE + 1
+        requeued = queue._recover()
+
+    assert requeued == []
+    failed = queue.get(job["id"])
+    assert (failed["status"], failed["attempts"], failed["error"]) == (FAILED, 2, "Interrupted too many times")
+    assert _row(queue, job["id"])[2] is None
+
+
+def test_progress_checkpoint_survives_recovery(tmp_path, clock):
+    worker = _queue(tmp_path / "jobs.db")
+    other = _queue(tmp_path / "jobs.db")
+    job = worker.create("ingest", {"documents": []}, total=100)
+    worker._claim(job["id"])
+
+    assert worker._set_progress(job["id"], 50, {"offset": 50, "items": [{"index": 0}]})
+    assert worker._set_progress(job["id"], 60)  # 체크포인트 없는 보고는 이전 체크포인트 유지
+
+    clock.now += LEASE + 1
+    other._recover()
+    claimed = other._claim(job["id"])
+
+    assert claimed["checkpoint"] == {"offset": 50, "items": [{"index": 0}]}
+    assert other.get(job["id"])["completed"] == 60
+    assert other._finish(job["id"], SUCCEEDED, {"ok": True})
+    assert _row(other, job["id"])[4] is None
+
+
+def test_stopped_worker_resumes_from_checkpoint(tmp_path):
+    calls = []
+    started = asyncio.Event()
+
+    async def batches(payload, report_progress, checkpoint=None):
+        offset = (checkpoint or {}).get("offset", 0)
+        done = list((checkpoint or {}).get("items", []))
+        calls.append(offset)
+        for start in range(offset, payload["total"], 2):
+            done.extend(range(start, start + 2))
+            await report_progress(start + 2, {"offset": start + 2, "items": done})
+            if len(calls) == 1 and start == 2:
+                started.set()
+                await asyncio.sleep(60)  # 첫 실행은 두 번째 배치 후 멈춤 (stop으로 중단)
+        return {"items": done}
+
+    path = tmp_path / "jobs.db"
+
+    async def run():
+        first = _queue(path, {"ingest": batches})
+        job = await first.submit("ingest", {"total": 8}, total=8)
+        await asyncio.wait_for(started.wait(), timeout=5)
+        await first.stop()
+        assert first.get(job["id"])["status"] == QUEUED
+
+        second = _queue(path, {"ingest": batches})
+        await second.start()
+        await asyncio.wait_for(second._pending.join(), timeout=5)
+        await second.stop()
+        return second.get(job["id"])
+
+    job = asyncio.run(run())
+
+    assert calls == [0, 4]
+    assert job["status"] == SUCCEEDED
+    assert job["result"] == {"items": list(range(8))}
+    assert job["attempts"] == 2
+
+
+def test_heartbeat_keeps_long_jobs_from_being_recovered(tmp_path):
+    async def slow(payload, report_progress, checkpoint=None):
+        await asyncio.sleep(0.5)
+        return {"done": True}
+
+    path = tmp_path / "jobs.db"
+
+    async def run():
+        worker = JobQueue(str(path), {"ingest": slow}, workers=1, lease_seconds=0.2)
+        other = JobQueue(str(path), {"ingest": slow}, workers=1, lease_seconds=0.2)
+        job = await worker.submit("ingest", {}, total=1)
+        await asyncio.sleep(0.35)  # lease보다 오래 실행 중
+        assert other._recover() == []
+        await asyncio.wait_for(worker._pending.join(), timeout=5)
+        await worker.stop()
+        return worker.get(job["id"])
+
+    job = asyncio.run(run())
+
+    assert (job["status"], job["attempts"], job["result"]) == (SUCCEEDED, 1, {"done": True})
+
+
+def test_job_that_lost_its_lease_is_not_finished(tmp_path):
+    async def slow(payload, report_progress, checkpoint=None):
+        await asyncio.sleep(0.3)
+        return {"done": True}
+
+    async def run():
+        queue = JobQueue(str(tmp_path / "jobs.db"), {"ingest": slow}, workers=1, lease_seconds=0.1)
+        job = await queue.submit("ingest", {}, total=1)
+        await asyncio.sleep(0.02)
+        # 다른 프로세스가 작업을 가져간 상황
+        queue._conn.execute("UPDATE jobs SET owner = 'other' WHERE id = ?", (job["id"],))
+        queue._conn.commit()
+        await asyncio.wait_for(queue._pending.join(), timeout=5)
+        await queue.stop()
+        return queue.get(job["id"])
+
+    job = asyncio.run(run())
+
+    assert job["status"] == RUNNING and job["result"] is None
+
+
+def test_ingest_job_resumes_from_checkpoint_offset(monkeypatch):
+    from app.schemas.document import BatchIngestItem, BatchIngestResponse
+    from app.services import document_service
+    from app.services.document_service import DocumentService
+
+    monkeypatch.setattr(document_service, "_JOB_PROGRESS_BATCH", 2)
+    service = DocumentService.__new__(DocumentService)
+    ingested = []
+
+    async def ingest_documents(batch):
+        ingested.append([request.filename for request in batch])
+        return BatchIngestResponse(
+            results=[BatchIngestItem(index=i, filename=request.filename, success=False, error="x")
+                     for i, request in enumerate(batch)],
+            succeeded=0,
+            failed=len(batch)
+        )
+
+    service.ingest_documents = ingest_documents
+    payload = {
+        "documents": [{"text": f"본문 {i}", "project": "p", "filename": f"{i}.txt"} for i in range(5)],
+        "positions": [1, 2, 3, 4, 5],
+        "errors": [{"index": 0, "filename": "bad.pdf", "success": False, "error": "형식 오류"}],
+    }
+    checkpoint = {
+        "offset": 2,
+        "items": [
+            {"index": 1, "filename": "0.txt", "success": False, "error": "x"},
+            {"index": 2, "filename": "1.txt", "success": False, "error": "x"},
+        ],
+    }
+    reports = []
+
+    async def report_progress(completed, checkpoint=None):
+        reports.append((completed, checkpoint["offset"], len(checkpoint["items"])))
+
+    result = asyncio.run(service.run_ingest_job(payload, report_progress, checkpoint))
+
+    assert ingested == [["2.txt", "3.txt"], ["4.txt"]]
+    assert reports == [(4, 4, 4), (5, 5, 5)]
+    assert [item["index"] for item in result["results"]] == [0, 1, 2, 3, 4, 5]
+    assert [item["filename"] for item in result["results"]] == ["bad.pdf", "0.txt", "1.txt", "2.txt", "3.txt", "4.txt"]
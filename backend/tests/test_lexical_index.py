@@ -0,0 +1,73 @@
+from app.services.lexical_index import LexicalIndex, tokenize
+
+
+def test_cjk_text_is_tokenized_into_bigrams():
+    assert tokenize("사과를 먹었다") == ["사과", "과를", "먹었", "었다"]
+    assert tokenize("東京タワー") == ["東京", "京タ", "タワ", "ワー"]
+
+
+def test_latin_words_and_single_cjk_characters_stay_whole():
+    assert tokenize("Vector DB 2024, 꽃 index") == ["vector", "db", "2024", "꽃", "index"]
+
+
+def test_particles_still_match_the_stem(tmp_path):
+    index = LexicalIndex(str(tmp_path / "lexical.db"))
+    index.add_documents([("doc-1", "p", "", "사과를 좋아한다"), ("doc-2", "p", "", "바나나 이야기")])
+
+    assert [doc_id for doc_id, _ in index.search("사과")] == ["doc-1"]
+
+
+def test_bm25_prefers_higher_tf_and_rarer_terms(tmp_path):
+    index = LexicalIndex(str(tmp_path / "lexical.db"))
+    index.add_documents([
+        ("many", "p", "", "apple apple apple banana"),
+        ("once", "p", "", "apple banana cherry grape"),
+        ("rare", "p", "", "banana kiwi"),
+        ("none", "p", "", "banana melon"),
+    ])
+
+    ranked = [doc_id for doc_id, _ in index.search("apple")]
+    assert ranked == ["many", "once"]
+    # 모든 문서에 있는 banana보다 드문 kiwi가 더 큰 점수
+    scores = dict(index.search("banana kiwi"))
+    assert max(scores, key=scores.get) == "rare"
+
+
+def test_scope_and_project_filters(tmp_path):
+    index = LexicalIndex(str(tmp_path / "lexical.db"))
+    index.add_documents([
+        ("summary-hit", "a", "graph search", "unrelated"),
+        ("content-hit", "b", "unrelated", "graph search"),
+    ])
+
+    assert [doc_id for doc_id, _ in index.search("graph", scope="summary")] == ["summary-hit"]
+    assert [doc_id for doc_id, _ in index.search("graph", scope="content")] == ["content-hit"]
+    assert [doc_id for doc_id, _ in index.search("graph", project="b")] == ["content-hit"]
+    assert len(index.search("graph")) == 2
+
+
+def test_reindex_and_remove_update_postings(tmp_path):
+    index = LexicalIndex(str(tmp_path / "lexical.db"))
+    index.add_documents([("doc-1", "p", "", "old words")])
+    index.add_documents([("doc-1", "p", "", "new words")])
+
+    assert index.search("old") == []
+    assert [doc_id for doc_id, _ in index.search("new")] == ["doc-1"]
+
+    index.remove_document("doc-1")
+    assert index.search("words") == []
+    assert index.stats() == {"documents": 0, "terms": {"summary": 0, "content": 0}}
+
+
+def test_index_is_restored_from_sqlite(tmp_path):
+    path = str(tmp_path / "lexical.db")
+    index = LexicalIndex(path)
+    index.add_documents([("doc-1", "p", "요약", "하이브리드 검색"), ("doc-2", "q", "", "벡터 검색")])
+    index.remove_document("doc-2")
+    expected = index.search("검색")
+
+    reloaded = LexicalIndex(path)
+
+    assert reloaded.doc_ids() == ["doc-1"]
+    assert reloaded.search("검색") == expected
+    assert reloaded.stats() == index.stats()
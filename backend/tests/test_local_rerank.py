@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from app.core.config import get_settings
+from app.services.local_rerank import LocalReranker, get_local_reranker, mmr_order
+
+QUERY = [1.0, 0.0, 0.0]
+
+
+def _doc(doc_id: str, values, summary: str = "", keywords=None, score: float = 0.0):
+    doc = {"id": doc_id, "summary": summary, "keywords": keywords or [], "score": score}
+    if values is not None:
+        doc["values"] = values
+    return doc
+
+
+# a와 a-copy는 거의 같은 문서, b는 관련도가 조금 낮지만 다른 방향
+DOCUMENTS = [
+    _doc("a", [0.9, 0.1, 0.0]),
+    _doc("a-copy", [0.9, 0.12, 0.0]),
+    _doc("b", [0.8, 0.0, 0.6]),
+]
+
+
+def _ids(documents):
+    return [doc["id"] for doc in documents]
+
+
+def test_lambda_one_orders_by_relevance():
+    reranked = LocalReranker(lambda_mult=1.0, keyword_weight=0.0).rerank("q", QUERY, DOCUMENTS)
+
+    assert _ids(reranked) == ["a", "a-copy", "b"]
+
+
+def test_lower_lambda_skips_near_duplicates():
+    reranked = LocalReranker(lambda_mult=0.5, keyword_weight=0.0).rerank("q", QUERY, DOCUMENTS)
+
+    assert _ids(reranked) == ["a", "b", "a-copy"]
+
+
+def test_reranker_uses_configured_lambda():
+    settings = get_settings()
+    reranker = get_local_reranker()
+
+    assert reranker.lambda_mult == settings.local_rerank_lambda
+    assert reranker.keyword_weight == settings.local_rerank_keyword_weight
+
+
+def test_mmr_order_first_pick_is_most_relevant():
+    relevance = np.array([0.2, 0.9, 0.5], dtype=np.float32)
+    similarity = np.eye(3, dtype=np.float32)
+
+    assert mmr_order(relevance, similarity, top_k=2, lambda_mult=0.3) == [1, 2]
+    assert mmr_order(relevance, similarity, top_k=10, lambda_mult=0.3) == [1, 2, 0]
+
+
+def test_keyword_match_boosts_relevance_and_sets_evidence():
+    documents = [
+        _doc("plain", [1.0, 0.0, 0.0]),
+        _doc("tagged", [0.95, 0.05, 0.0], keywords=["Graph", "기타"]),
+    ]
+    reranked = LocalReranker(lambda_mult=1.0, keyword_weight=0.1).rerank("graph", QUERY, documents)
+
+    assert _ids(reranked) == ["tagged", "plain"]
+    assert reranked[0]["evidence"] == "키워드 일치: Graph"
+    assert reranked[1]["evidence"] == "의미 유사도 1.00"
+    assert reranked[0]["rerank_score"] == pytest.approx(0.9986 + 0.1, abs=1e-3)
+    assert all("values" not in doc for doc in reranked)
+
+
+def test_documents_without_values_fall_back_to_search_score():
+    documents = [_doc("vector", [0.5, 0.5, 0.0]), _doc("no-vector", None, score=0.95)]
+
+    reranked = LocalReranker(lambda_mult=1.0, keyword_weight=0.0).rerank("q", QUERY, documents)
+
+    assert _ids(reranked) == ["no-vector", "vector"]
+    assert reranked[0]["rerank_score"] == pytest.approx(0.95)
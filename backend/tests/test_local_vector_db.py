@@ -0,0 +1,112 @@
+import numpy as np
+import pytest
+from app.services import local_vector_db
+from app.services.local_vector_db import LocalVectorDBService
+from app.services.vector_db import chunk_vector_id
+
+DIMENSION = 8
+
+
+def _vector(*hot: int):
+    values = [0.0] * DIMENSION
+    for index in hot:
+        values[index] = 1.0
+    return values
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = LocalVectorDBService(str(tmp_path / "vectors"))
+    db.upsert_documents([
+        {"id": "a", "values": _vector(0), "metadata": {"doc_id": "a", "project": "p", "year": 2020, "tag": "x"}},
+        {"id": "b", "values": _vector(0, 1), "metadata": {"doc_id": "b", "project": "p", "year": 2023, "tag": "y"}},
+        {"id": "c", "values": _vector(1), "metadata": {"doc_id": "c", "project": "q", "year": 2024, "tag": "z"}},
+    ])
+    return db
+
+
+def _ids(results):
+    return sorted(result["id"] for result in results)
+
+
+@pytest.mark.parametrize("filter_dict, expected", [
+    ({"project": {"$eq": "p"}}, ["a", "b"]),
+    ({"project": "q"}, ["c"]),
+    ({"project": {"$ne": "p"}}, ["c"]),
+    ({"tag": {"$in": ["x", "z"]}}, ["a", "c"]),
+    ({"tag": {"$nin": ["x", "z"]}}, ["b"]),
+    ({"year": {"$gt": 2020}}, ["b", "c"]),
+    ({"year": {"$lte": 2023}}, ["a", "b"]),
+    ({"$and": [{"project": "p"}, {"year": {"$gte": 2021}}]}, ["b"]),
+    ({"$or": [{"tag": "x"}, {"year": {"$gt": 2023}}]}, ["a", "c"]),
+])
+def test_search_applies_metadata_filters(db, filter_dict, expected):
+    assert _ids(db.search(_vector(0, 1), top_k=10, filter_dict=filter_dict)) == expected
+
+
+def test_search_orders_by_cosine_similarity(db):
+    results = db.search(_vector(0), top_k=2, include_values=True)
+
+    assert [result["id"] for result in results] == ["a", "b"]
+    assert results[0]["score"] == pytest.approx(1.0)
+    assert results[1]["score"] == pytest.approx(1 / np.sqrt(2))
+    assert np.array_equal(results[0]["values"], np.asarray(_vector(0), dtype=np.float32))
+
+
+def test_unknown_filter_operator_is_rejected(db):
+    with pytest.raises(ValueError):
+        db.search(_vector(0), filter_dict={"year": {"$regex": "20"}})
+
+
+def test_delete_document_frees_chunk_rows_for_reuse(db):
+    db.upsert_documents([
+        {"id": "d", "values": _vector(2), "metadata": {"doc_id": "d", "project": "p", "chunk_count": 2}},
+        {"id": chunk_vector_id("d", 0), "values": _vector(2, 3), "metadata": {"doc_id": "d", "chunk_index": 0}},
+        {"id": chunk_vector_id("d", 1), "values": _vector(3), "metadata": {"doc_id": "d", "chunk_index": 1}},
+    ])
+    size = db._size
+    freed_rows = {db._id_to_row[vector_id] for vector_id in ("d", chunk_vector_id("d", 0), chunk_vector_id("d", 1))}
+
+    db.delete_document("d")
+
+    assert db.get_stats()["total_vector_count"] == 3
+    assert db.fetch_documents(["d", chunk_vector_id("d", 0)]) == {}
+    assert all(result["id"] in ("a", "b", "c") for result in db.search(_vector(2, 3), top_k=10))
+
+    db.upsert_documents([
+        {"id": f"new-{i}", "values": _vector(4 + i), "metadata": {"doc_id": f"new-{i}"}}
+        for i in range(3)
+    ])
+    assert db._size == size
+    assert {db._id_to_row[f"new-{i}"] for i in range(3)} == freed_rows
+    assert db.search(_vector(5), top_k=1)[0]["id"] == "new-1"
+
+
+def test_reload_restores_vectors_metadata_and_free_rows(db):
+    db.delete_document("b")
+    before = db.search(_vector(0, 1), top_k=10)
+
+    reloaded = LocalVectorDBService(db.path)
+
+    assert reloaded.search(_vector(0, 1), top_k=10) == before
+    assert reloaded.fetch_documents(["c"])["c"]["metadata"]["project"] == "q"
+    assert reloaded._free_rows == [1]  # b의 행
+    reloaded.upsert_documents([{"id": "e", "values": _vector(6), "metadata": {}}])
+    assert reloaded._id_to_row["e"] == 1
+
+
+def test_search_view_survives_growth(tmp_path):
+    db = LocalVectorDBService(str(tmp_path / "vectors"))
+    db.upsert_documents([{"id": "first", "values": _vector(0), "metadata": {}}])
+    view = db._search_view(None)
+
+    count = local_vector_db._INITIAL_CAPACITY + 10
+    db.upsert_documents([
+        {"id": f"doc-{i}", "values": _vector(i % DIMENSION, (i + 1) % DIMENSION), "metadata": {}}
+        for i in range(count)
+    ])
+
+    assert db._vectors.shape[0] > local_vector_db._INITIAL_CAPACITY
+    assert view.ids == ["first"]
+    assert LocalVectorDBService._scores(view, _vector(0))[0] == pytest.approx(1.0)
+    assert LocalVectorDBService(db.path).get_stats()["total_vector_count"] == count + 1
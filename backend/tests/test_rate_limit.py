@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.core.rate_limit import ConcurrencyLimit, ProviderGovernor, TokenBucket
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class _Tracker:
+    """동시에 실행 중인 호출 수의 최댓값 기록"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+
+    def leave(self):
+        with self._lock:
+            self.active -= 1
+
+
+def test_sync_and_async_calls_share_one_cap():
+    governor = ProviderGovernor("test", max_concurrency=3)
+    tracker = _Tracker()
+
+    def sync_call():
+        with governor.slot():
+            tracker.enter()
+            time.sleep(0.02)
+            tracker.leave()
+
+    async def async_call():
+        async with governor.aslot():
+            tracker.enter()
+            await asyncio.sleep(0.02)
+            tracker.leave()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *(loop.run_in_executor(None, sync_call) for _ in range(8)),
+            *(async_call() for _ in range(8))
+        )
+
+    asyncio.run(run())
+
+    assert tracker.peak == 3
+    assert governor.stats()["calls"] == 16
+
+
+def test_cancelled_waiter_releases_its_slot():
+    limit = ConcurrencyLimit(1)
+
+    async def run():
+        await limit.aacquire()
+        waiter = asyncio.create_task(limit.aacquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limit.release()
+        await asyncio.wait_for(limit.aacquire(), timeout=1.0)
+        limit.release()
+
+    asyncio.run(run())
+
+    assert limit._active == 0 and not limit._waiters
+
+
+def test_retries_rate_limited_call_after_retry_after():
+    governor = ProviderGovernor("test", max_retries=3, backoff_base=0.001)
+    attempts = []
+
+    def flaky():
+        attempts.append(time.monotonic())
+        if len(attempts) < 3:
+            raise _StatusError(429, {"retry-after-ms": "20"})
+        return "ok"
+
+    assert governor.call(flaky) == "ok"
+    assert len(attempts) == 3
+    assert attempts[1] - attempts[0] >= 0.015
+    stats = governor.stats()
+    assert stats["retries"] == 2 and stats["rate_limited"] == 2
+    assert stats["rate_factor"] < 1.0
+
+
+def test_non_retryable_error_is_raised_immediately():
+    governor = ProviderGovernor("test", max_retries=3, backoff_base=0.001)
+    attempts = []
+
+    async def bad_request():
+        attempts.append(1)
+        raise _StatusError(400)
+
+    with pytest.raises(_StatusError):
+        asyncio.run(governor.acall(bad_request))
+    assert len(attempts) == 1
+    assert governor.stats()["failures"] == 1
+
+
+def test_token_bucket_reserves_wait_time():
+    bucket = TokenBucket(per_minute=60, burst_seconds=1.0)  # 초당 1개, 최대 1개
+
+    assert bucket.reserve(1) == 0.0
+    assert bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert bucket.reserve(1) == pytest.approx(2.0, abs=0.05)
@@ -0,0 +1,80 @@
+"""
+검색 결과 캐시 테스트
+
+같은 질의(공백/대소문자만 다른 경우 포함)는 임베딩/벡터 검색 없이 캐시에서 응답하고,
+코퍼스 버전이 올라가면(문서 추가/삭제) 캐시를 쓰지 않는지 확인합니다.
+"""
+
+import asyncio
+import pytest
+
+# DocumentService가 불러오는 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.core.cache import bump_corpus_version
+from app.schemas.document import SearchRequest
+from app.services import llm_service
+from app.services.document_service import DocumentService
+from app.services.lexical_index import LexicalIndex
+from app.services.local_vector_db import LocalVectorDBService
+
+DIMENSION = 8
+
+
+class _CountingEmbedder:
+    embedding_cache = None
+
+    def __init__(self):
+        self.calls = 0
+
+    async def agenerate_embedding(self, text: str):
+        self.calls += 1
+        return [1.0] + [0.0] * (DIMENSION - 1)
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    embedder = _CountingEmbedder()
+    monkeypatch.setattr(llm_service, "_llm_service", embedder)
+    return embedder
+
+
+@pytest.fixture
+def service(tmp_path, embedder):
+    service = DocumentService()
+    service.vector_db = LocalVectorDBService(str(tmp_path / "vectors"))
+    service.lexical_index = LexicalIndex(str(tmp_path / "lexical.db"))
+    service.vector_db.upsert_documents([
+        {
+            "id": "doc-1",
+            "values": [1.0] + [0.0] * (DIMENSION - 1),
+            "metadata": {
+                "doc_id": "doc-1", "summary": "요약", "preview": "미리보기",
+                "keywords": [], "project": "p", "created_at": "2024-01-01T00:00:00",
+            },
+        }
+    ])
+    return service
+
+
+def _search(service: DocumentService, query: str):
+    request = SearchRequest(query=query, use_rerank=False, top_k=5)
+    return asyncio.run(service.search_documents(request))
+
+
+def test_normalized_query_hits_cache(service, embedder):
+    first = _search(service, "벡터  검색")
+    second = _search(service, "  벡터 검색 ")
+
+    assert embedder.calls == 1
+    assert second.query == "  벡터 검색 "  # 응답 질의는 요청 그대로
+    assert [r.id for r in second.results] == [r.id for r in first.results] == ["doc-1"]
+
+
+def test_corpus_version_bump_invalidates_cache(service, embedder):
+    _search(service, "벡터 검색")
+    bump_corpus_version()
+    _search(service, "벡터 검색")
+
+    assert embedder.calls == 2
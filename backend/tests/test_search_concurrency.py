@@ -0,0 +1,92 @@
+"""
+동시 검색 처리량 테스트
+
+벡터 DB(동기, 스레드 풀에서 실행)와 임베딩(비동기)에 고정 지연을 넣고
+동시 요청 수 N = 1, 4, 16에서 전체 소요 시간을 잽니다.
+run_blocking 실행기와 비동기 클라이언트가 실제로 겹쳐 실행되면
+소요 시간이 N에 비례하지 않고 거의 일정해야 합니다.
+"""
+
+import asyncio
+import logging
+import time
+import pytest
+
+# DocumentService가 불러오는 LLM SDK가 없으면 건너뜀
+for _module in ("httpx", "cohere", "langchain_core", "langchain_openai"):
+    pytest.importorskip(_module)
+
+from app.schemas.document import SearchRequest
+from app.services import llm_service
+from app.services.document_service import DocumentService
+from app.services.lexical_index import LexicalIndex
+from app.services.local_vector_db import LocalVectorDBService
+
+DIMENSION = 8
+LATENCY = 0.05  # 임베딩 / 벡터 검색 호출당 지연 (초)
+
+logger = logging.getLogger(__name__)
+
+
+class _SlowEmbedder:
+    embedding_cache = None
+
+    async def agenerate_embedding(self, text: str):
+        await asyncio.sleep(LATENCY)
+        return [1.0] + [0.0] * (DIMENSION - 1)
+
+
+class _SlowVectorDB(LocalVectorDBService):
+    """동기 검색에 네트워크 왕복만큼의 지연을 넣은 로컬 벡터 DB"""
+
+    def search(self, *args, **kwargs):
+        time.sleep(LATENCY)
+        return super().search(*args, **kwargs)
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    monkeypatch.setattr(llm_service, "_llm_service", _SlowEmbedder())
+    service = DocumentService()
+    service.vector_db = _SlowVectorDB(str(tmp_path / "vectors"))
+    service.lexical_index = LexicalIndex(str(tmp_path / "lexical.db"))
+    service.vector_db.upsert_documents([
+        {
+            "id": f"doc-{i}",
+            "values": [1.0, float(i)] + [0.0] * (DIMENSION - 2),
+            "metadata": {
+                "doc_id": f"doc-{i}", "summary": f"요약 {i}", "preview": f"미리보기 {i}",
+                "keywords": [], "project": "p", "created_at": "2024-01-01T00:00:00",
+            },
+        }
+        for i in range(20)
+    ])
+    return service
+
+
+def _wall_time(service: DocumentService, concurrency: int, round_id: str) -> float:
+    async def run():
+        requests = [
+            # 쿼리마다 달라 검색 캐시에 걸리지 않음
+            SearchRequest(query=f"질문 {round_id}-{i}", use_rerank=False, top_k=5)
+            for i in range(concurrency)
+        ]
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(service.search_documents(request) for request in requests))
+        elapsed = time.perf_counter() - started
+        assert all(len(response.results) == 5 for response in responses)
+        return elapsed
+
+    return asyncio.run(run())
+
+
+def test_search_throughput_scales_with_concurrency(service):
+    _wall_time(service, 1, "warmup")  # 스레드 풀/색인 준비
+    timings = {n: _wall_time(service, n, str(n)) for n in (1, 4, 16)}
+    for n, elapsed in timings.items():
+        logger.info(f"concurrency {n}: {elapsed * 1000:.0f}ms, {n / elapsed:.1f} req/s")
+
+    # 직렬 실행이면 16배가 걸림. 겹쳐 실행되면 N이 16배가 돼도 소요 시간은 몇 배 이내
+    assert timings[4] < 2 * timings[1]
+    assert timings[16] < 4 * timings[1]
+    assert 16 / timings[16] > 4 * (1 / timings[1])
@@ -48,8 +48,9 @@ export default function UploadFormBackend({ onSuccess }: UploadFormBackendProps)
   const handleFileChange = (e: React.ChangeEvent<HTMLInputElement>) => {
     const file = e.target.files?.[0];
     if (file) {
-      if (!file.name.endsWith('.txt')) {
-        alert('txt 파일만 업로드 가능합니다.');
+      const name = file.name.toLowerCase();
+      if (!['.txt', '.md', '.markdown'].some((extension) => name.endsWith(extension))) {
+        alert('txt, md, markdown 파일만 업로드 가능합니다.');
         return;
       }
       setSelectedFile(file);
@@ -139,7 +140,7 @@ export default function UploadFormBackend({ onSuccess }: UploadFormBackendProps)
             <label className="block text-sm font-medium text-gray-700 mb-2">파일 선택</label>
             <input
               type="file"
-              accept=".txt"
+              accept=".txt,.md,.markdown"
               onChange={handleFileChange}
               className="w-full px-4 py-3 border border-gray-200 rounded-lg focus:ring-2 focus:ring-nova-500 focus:border-transparent"
             />